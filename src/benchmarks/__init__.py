@@ -0,0 +1,3 @@
+"""
+Бенчмарки горячих путей игрового движка
+"""
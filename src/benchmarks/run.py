@@ -0,0 +1,404 @@
+"""
+Микробенчмарки движка и сравнение с сохраненным эталоном
+
+Каждый бенчмарк измеряется сериями: число повторов в серии
+подбирается автоматически (timeit.Timer.autorange), а из серий
+получается выборка времен одной операции. С эталоном выборки
+сравниваются U-критерием Манна-Уитни; изменение считается значимым,
+если p < ALPHA и медиана сдвинулась больше чем на THRESHOLD.
+
+Эталон зависит от машины и в репозиторий не входит (.gitignore): его
+сохраняют на той же машине, на которой потом сравнивают. На общих или
+шумных машинах стоит поднять --threshold.
+
+Запуск (из каталога src):
+    python -m benchmarks.run                     # сравнение с эталоном
+    python -m benchmarks.run --save-baseline     # сохранить новый эталон
+    python -m benchmarks.run --report report.json --only board_shoot
+    python -m benchmarks.run --profiles          # стоимость стратегий ИИ
+
+Профили стратегий (время на ход и память на партию в strategies.py)
+берутся из --profiles: время - медиана бенчмарков strategy_<имя>,
+память - пик tracemalloc за отдельную партию, чтобы трассировка не
+искажала время.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import timeit
+import tracemalloc
+
+from game.bitboard import BitBoard
+from game.board import Board, SmartAI
+from game.cells import Ship
+from game.game_logic import GameLogic
+from game.simulation import play_game
+from game.strategies import STRATEGIES, create_ai
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Уровень значимости и наименьшее относительное изменение медианы
+ALPHA = 0.01
+THRESHOLD = 0.05
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Регистрация функции подготовки бенчмарка под именем name"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+@benchmark("board_can_place_ship")
+def bench_can_place_ship(board_class=Board):
+    """Проверка размещения всех позиций четырехпалубника на заполненном поле"""
+    random.seed(1)
+    board = board_class()
+    board.auto_place_ships()
+    ships = [Ship(4, x, y, horizontal) for y in range(10) for x in range(10)
+             for horizontal in (True, False)]
+
+    def run():
+        for ship in ships:
+            board.can_place_ship(ship)
+    return run, len(ships)
+
+
+@benchmark("board_place_ship")
+def bench_place_ship(board_class=Board):
+    """Установка и снятие корабля"""
+    board = board_class()
+    ship = Ship(3, 4, 4, True)
+
+    def run():
+        board.place_ship(ship)
+        board.remove_ship(ship)
+    return run, 1
+
+
+@benchmark("board_auto_place_ships")
+def bench_auto_place_ships(board_class=Board):
+    """Случайная расстановка стандартного флота"""
+    def run():
+        random.seed(2)
+        board_class().auto_place_ships()
+    return run, 1
+
+
+@benchmark("board_shoot")
+def bench_shoot(board_class=Board):
+    """Выстрел в каждую клетку поля с последующим откатом"""
+    random.seed(3)
+    board = board_class()
+    board.auto_place_ships()
+    cells = [(x, y) for y in range(10) for x in range(10)]
+
+    def run():
+        for x, y in cells:
+            board.shoot(x, y)
+        for x, y in reversed(cells):
+            board.unshoot(x, y)
+    return run, len(cells)
+
+
+@benchmark("bitboard_can_place_ship")
+def bench_bitboard_can_place_ship():
+    """board_can_place_ship на BitBoard"""
+    return bench_can_place_ship(BitBoard)
+
+
+@benchmark("bitboard_place_ship")
+def bench_bitboard_place_ship():
+    """board_place_ship на BitBoard"""
+    return bench_place_ship(BitBoard)
+
+
+@benchmark("bitboard_auto_place_ships")
+def bench_bitboard_auto_place_ships():
+    """board_auto_place_ships на BitBoard"""
+    return bench_auto_place_ships(BitBoard)
+
+
+@benchmark("bitboard_shoot")
+def bench_bitboard_shoot():
+    """board_shoot на BitBoard"""
+    return bench_shoot(BitBoard)
+
+
+@benchmark("smart_ai_move")
+def bench_smart_ai_move():
+    """Ход SmartAI: get_next_shot и register_shot до конца партии"""
+    random.seed(4)
+    board = Board()
+    board.auto_place_ships()
+    results = {(x, y): "miss" for y in range(10) for x in range(10)}
+    for ship in board.ships:
+        for cell in ship.cells:
+            results[cell] = "hit"
+
+    def run():
+        ai = SmartAI(board)
+        for _ in range(100):
+            x, y = ai.get_next_shot()
+            ai.register_shot(x, y, results[(x, y)])
+    return run, 100
+
+
+@benchmark("game_logic_check_game_over")
+def bench_check_game_over():
+    """Проверка окончания игры в середине партии"""
+    random.seed(5)
+    logic = GameLogic()
+    logic.auto_place_all_ships()
+    logic.start_battle()
+
+    def run():
+        logic.check_game_over()
+    return run, 1
+
+
+@benchmark("headless_game")
+def bench_headless_game(board_class=Board):
+    """Полная партия SmartAI против SmartAI без интерфейса (всегда одна и та же)"""
+    def run():
+        random.seed(6)
+        play_game("smart", "smart", board_class=board_class)
+    return run, 1
+
+
+@benchmark("headless_game_bitboard")
+def bench_headless_game_bitboard():
+    """headless_game на BitBoard"""
+    return bench_headless_game(BitBoard)
+
+
+def play_strategy(name, board):
+    """
+    Партия стратегии против готового поля до потопления флота
+
+    Returns:
+        int: Число ходов
+    """
+    ai = create_ai(name, board, rng=random.Random(7))
+    shots = []
+    try:
+        while any(not ship.is_destroyed() for ship in board.ships):
+            x, y = ai.get_next_shot()
+            result = board.shoot(x, y)
+            shots.append((x, y))
+            sunk_cells = board.get_ship_at(x, y).cells if result == "destroyed" else None
+            ai.register_shot(x, y, result, sunk_cells)
+    finally:
+        for x, y in reversed(shots):
+            board.unshoot(x, y)
+        if hasattr(ai, "close"):
+            ai.close()
+    return len(shots)
+
+
+def bench_strategy(name):
+    """Ход стратегии name: полная партия против одного и того же флота"""
+    board = Board(rng=random.Random(8))
+    board.auto_place_ships()
+    moves = play_strategy(name, board)
+
+    def run():
+        play_strategy(name, board)
+    return run, moves
+
+
+for _name in STRATEGIES:
+    benchmark(f"strategy_{_name}")(lambda name=_name: bench_strategy(name))
+
+
+def strategy_memory(name):
+    """
+    Пик памяти за партию стратегии, КБ
+
+    Измеряется отдельно от времени: tracemalloc замедляет выделения
+    памяти в несколько раз.
+    """
+    board = Board(rng=random.Random(8))
+    board.auto_place_ships()
+    tracemalloc.start()
+    try:
+        play_strategy(name, board)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def profiles(repeat):
+    """
+    Измеренные профили стратегий для register_strategy
+
+    Returns:
+        dict: Для каждой стратегии время на ход (мкс) и память на партию (КБ)
+    """
+    measured = {}
+    for name in STRATEGIES:
+        samples = measure(f"strategy_{name}", repeat)
+        measured[name] = {"cost": statistics.median(samples) * 1e6,
+                          "memory": strategy_memory(name)}
+    return measured
+
+
+def measure(name, repeat):
+    """
+    Выборка времен одной операции бенчмарка
+
+    Args:
+        name (str): Имя бенчмарка
+        repeat (int): Число серий
+
+    Returns:
+        list: Время одной операции в секундах для каждой серии
+    """
+    run, operations = BENCHMARKS[name]()
+    timer = timeit.Timer(run)
+    number, _ = timer.autorange()
+    return [t / (number * operations) for t in timer.repeat(repeat, number)]
+
+
+def mann_whitney(first, second):
+    """
+    Двусторонний U-критерий Манна-Уитни (нормальное приближение)
+
+    Returns:
+        float: p-значение
+    """
+    values = sorted([(v, 0) for v in first] + [(v, 1) for v in second])
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(values):
+        j = i
+        while j + 1 < len(values) and values[j + 1][0] == values[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        i = j + 1
+
+    n1, n2 = len(first), len(second)
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, values) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    mean = n1 * n2 / 2
+    sigma = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+    if sigma == 0:
+        return 1.0
+    z = (u - mean) / sigma
+    return math.erfc(abs(z) / math.sqrt(2))
+
+
+def compare(samples, baseline, alpha=ALPHA, threshold=THRESHOLD):
+    """
+    Сравнение выборки с эталоном
+
+    Returns:
+        dict: Изменение медианы, p-значение и вердикт
+              ("faster", "slower", "same" или "new" без эталона)
+    """
+    if not baseline:
+        return {"verdict": "new"}
+    median = statistics.median(samples)
+    base = statistics.median(baseline)
+    change = (median - base) / base
+    p_value = mann_whitney(samples, baseline)
+    verdict = "same"
+    if p_value < alpha and abs(change) > threshold:
+        verdict = "slower" if change > 0 else "faster"
+    return {"change": change, "p_value": p_value, "verdict": verdict}
+
+
+def run_suite(names, repeat, baseline, alpha=ALPHA, threshold=THRESHOLD):
+    """
+    Прогон бенчмарков
+
+    Returns:
+        dict: Отчет: окружение и для каждого бенчмарка статистика, выборка и сравнение
+    """
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": {},
+    }
+    for name in names:
+        samples = measure(name, repeat)
+        report["benchmarks"][name] = {
+            "median": statistics.median(samples),
+            "mean": statistics.mean(samples),
+            "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            "min": min(samples),
+            "samples": samples,
+            "comparison": compare(samples, baseline.get(name), alpha, threshold),
+        }
+    return report
+
+
+def main(argv=None):
+    """Запуск бенчмарков из командной строки"""
+    parser = argparse.ArgumentParser(description="Бенчмарки движка Морского боя")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), default=None)
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--alpha", type=float, default=ALPHA)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="Наименьшее значимое относительное изменение медианы")
+    parser.add_argument("--report", default=None, help="Путь для отчета в JSON")
+    parser.add_argument("--profiles", action="store_true",
+                        help="Измерить время на ход и память стратегий ИИ")
+    args = parser.parse_args(argv)
+
+    if args.profiles:
+        for name, profile in profiles(args.repeat).items():
+            strategy = STRATEGIES[name]
+            print(f"{name:>14}: {profile['cost']:10.0f} мкс/ход (заявлено {strategy.cost}), "
+                  f"{profile['memory']:8.0f} КБ (заявлено {strategy.memory})")
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    names = args.only or list(BENCHMARKS)
+    report = run_suite(names, args.repeat, baseline, args.alpha, args.threshold)
+
+    for name, stats in report["benchmarks"].items():
+        comparison = stats["comparison"]
+        line = f"{name:>28}: {stats['median'] * 1e6:10.2f} мкс"
+        if comparison["verdict"] != "new":
+            line += (f"  {comparison['change']:+7.1%}  p={comparison['p_value']:.3f}"
+                     f"  {comparison['verdict']}")
+        print(line)
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        baseline.update({name: stats["samples"] for name, stats in report["benchmarks"].items()})
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Эталон сохранен: {args.baseline}")
+
+    if not baseline and not args.save_baseline:
+        print(f"Эталона нет ({args.baseline}): сохраните его ключом --save-baseline")
+
+    regressions = [name for name, stats in report["benchmarks"].items()
+                   if stats["comparison"]["verdict"] == "slower"]
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+ИИ с ограничением времени на ход
+
+Ход строится постепенно и в любой момент есть готовый ответ:
+    1. если времени почти нет - выстрел эвристики SmartAI;
+    2. иначе точный подсчет позиций (DensityAI);
+    3. оставшееся время - порции выборок Монте-Карло, которые
+       уточняют карту вероятности, пока следующая порция успевает
+       уложиться в срок.
+Длительность шагов оценивается по предыдущим ходам, поэтому шаг,
+который заведомо не успеет, не начинается. Порция выборок не
+прерывается, поэтому ее размер берется по остатку времени с запасом,
+а выборки заканчиваются раньше срока (DEADLINE_MARGIN).
+"""
+
+import random
+import time
+
+from .board import SmartAI
+from .masks import board_masks, counter_add, counter_argmax, mask_cells
+from .montecarlo import MonteCarloAI, sample_heat
+
+# Доля времени хода, оставляемая в запас: выборки заканчиваются раньше срока
+DEADLINE_MARGIN = 0.1
+
+# Наибольшая доля оставшегося времени на одну порцию выборок
+CHUNK_SHARE = 0.25
+
+
+class AnytimeAI(MonteCarloAI):
+    """ИИ, возвращающий лучший найденный ход к заданному сроку"""
+
+    def __init__(self, board, budget=0.05, chunk=50, min_samples=200, max_samples=5000,
+                 cache=None, rng=random):
+        """
+        Инициализация ИИ
+
+        Args:
+            board (Board): Игровое поле противника или правила партии (Rules)
+            budget (float): Время на ход по умолчанию, в секундах
+            chunk (int): Число выборок в одной порции
+            min_samples (int): Сколько принятых выборок нужно, чтобы
+                предпочесть их точному подсчету позиций
+            max_samples (int): Наибольшее число выборок за ход
+            cache (DecisionCache): Общий кэш для подсчета позиций (необязательно)
+            rng: Источник случайных чисел (модуль random или random.Random)
+        """
+        super().__init__(board, samples=max_samples, cache=cache, rng=rng)
+        self.budget = budget
+        self.chunk = chunk
+        self.min_samples = min_samples
+        self.smart = SmartAI(self.rules, rng=rng)
+        # Оценки длительности в секундах: подсчета позиций (наибольшая из
+        # недавних) и одной выборки (скользящее среднее; None - еще не измерено)
+        self.density_cost = 0.0
+        self.sample_cost = None
+        self.last_stats = {}
+
+    def get_next_shot(self, budget=None):
+        """
+        Получить координаты следующего выстрела
+
+        Args:
+            budget (float): Время на этот ход в секундах (по умолчанию self.budget)
+
+        Returns:
+            tuple: Координаты (x, y)
+        """
+        start = time.perf_counter()
+        budget = self.budget if budget is None else budget
+        deadline = start + budget * (1 - DEADLINE_MARGIN)
+
+        full = board_masks(self.size)[0]
+        unknown = full & ~(self.miss_mask | self.hit_mask | self.sunk_mask | self.blocked_mask)
+        if not unknown:
+            unknown = full & ~(self.miss_mask | self.hit_mask | self.sunk_mask)
+
+        # Шаг 1: на подсчет позиций времени не хватает
+        if start + self.density_cost > deadline:
+            self.last_stats = {"source": "smart", "samples": 0,
+                               "elapsed": time.perf_counter() - start}
+            return self.smart.get_next_shot()
+
+        # Шаг 2: точный подсчет позиций
+        best = self.best_cells(unknown)
+        now = time.perf_counter()
+        self.density_cost = max(now - start, self.density_cost * 0.9)
+        source = "density"
+
+        # Шаг 3: уточнение выборками. Если к сроку не набрать min_samples,
+        # выборки не начинаются; порция рассчитана на CHUNK_SHARE остатка
+        # времени, а пока стоимость выборки не измерена, пробуется одна выборка
+        planes = []
+        accepted = 0
+        drawn = 0
+        args = (self.size, self.remaining_sizes(), self.blocked_mask, self.hit_mask,
+                self.rules.allow_touching)
+        enough_time = (self.sample_cost is None
+                       or deadline - now >= self.min_samples * self.sample_cost)
+        if not enough_time:
+            # Без выборок оценка не обновляется; если ее завысило случайное
+            # замедление, она постепенно снижается, и выборки пробуются снова
+            self.sample_cost *= 0.9
+        while enough_time and drawn < self.samples:
+            if self.sample_cost is None:
+                chunk = 1
+            else:
+                chunk = min(self.chunk, self.samples - drawn,
+                            int((deadline - now) * CHUNK_SHARE / self.sample_cost))
+            if chunk <= 0:
+                break
+
+            part, count = sample_heat(*args, chunk, self.rng.getrandbits(64))
+            for level, plane in enumerate(part):
+                counter_add(planes, plane, 1 << level)
+            accepted += count
+            drawn += chunk
+
+            finished = time.perf_counter()
+            cost = (finished - now) / chunk
+            if self.sample_cost is None:
+                self.sample_cost = cost
+            else:
+                self.sample_cost += (cost - self.sample_cost) * 0.2
+            now = finished
+
+        self.last_accepted = accepted
+        if accepted >= self.min_samples:
+            sampled = counter_argmax(planes, unknown)
+            if sampled:
+                best = sampled
+                source = "montecarlo"
+
+        self.last_stats = {"source": source, "samples": drawn,
+                           "elapsed": time.perf_counter() - start}
+        if not best:
+            best = unknown
+        return self.rng.choice(mask_cells(best, self.size))
+
+    def register_shot(self, x, y, result, sunk_cells=None):
+        """
+        Зарегистрировать результат выстрела
+
+        Args:
+            x (int): X координата
+            y (int): Y координата
+            result (str): Результат выстрела ("miss", "hit", "destroyed")
+            sunk_cells (list): Клетки потопленного корабля, если известны
+        """
+        super().register_shot(x, y, result, sunk_cells)
+        self.smart.register_shot(x, y, result, sunk_cells)
+
+    def get_state(self):
+        """Компактное состояние ИИ для отката хода"""
+        return (super().get_state(), self.smart.get_state())
+
+    def set_state(self, state):
+        """Восстановление состояния, полученного get_state"""
+        own, smart = state
+        super().set_state(own)
+        self.smart.set_state(smart)
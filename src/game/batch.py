@@ -0,0 +1,271 @@
+"""
+Пакетная симуляция: K партий одновременно на битовых масках
+
+Для оценки стратегий не нужны объекты Board, Ship и таблица grid:
+маски всех K партий упакованы в одно длинное целое - партия g занимает
+блок из STRIDE бит начиная с бита g * STRIDE (клетки поля и нулевой
+защитный хвост). Промахи, попадания, потопленные и запрещенные клетки
+всех партий хранятся пятью такими числами, а корабли - числом на
+каждый номер корабля во флоте. Поэтому клетки-кандидаты, случайный
+выбор клетки, результат выстрела, потопление, зона вокруг корабля и
+окончание партии вычисляются несколькими операциями над длинными
+целыми сразу для всего пакета; цикла по партиям в ходе нет.
+
+Проверка "блок не пуст" для всех партий сразу делается переносом:
+к маске прибавляется в каждом блоке 2^(N*N) - 1, и перенос в защитный
+бит блока появляется только у непустых блоков. Сдвиг маски на строку
+выходит за клетки блока не дальше его хвоста, поэтому соседей и зоны
+вокруг кораблей тоже можно сдвигать во всем пакете сразу.
+
+Пакетная стратегия повторяет логику CheckerboardAI ("checkerboard")
+для одной стороны: ИИ стреляет по случайному флоту, пока не потопит
+его целиком. DensityAI в пакетной форме нет: подсчет позиций идет по
+маскам отдельной партии и в пакете не ускоряется.
+
+Ускорение ограничено: каждая операция над пакетом стоит времени,
+пропорционального K, а на ход приходится около сотни таких операций.
+Поэтому пакет быстрее отдельных партий CheckerboardAI в несколько раз,
+а не на порядки. Расстановка флотов остается циклом по партиям
+(generate_fleet) и занимает около трети времени пакета.
+"""
+
+import random
+
+from .masks import board_masks, popcount
+from .placement import generate_fleet, get_placement_table
+from .rules import DEFAULT_RULES
+
+BATCH_STRATEGIES = ("checkerboard",)
+
+
+def block_stride(size):
+    """
+    Длина блока одной партии в битах
+
+    Клетки поля плюс хвост не короче строки: сдвиг на строку вверх
+    попадает в хвост, а не в соседнюю партию. Длина кратна 8, чтобы
+    блок партии был срезом байтов упакованного числа.
+    """
+    return (size * size + size + 7) // 8 * 8
+
+
+class BatchGames:
+    """Пакет партий одной стратегии против случайных флотов"""
+
+    def __init__(self, count, strategy="checkerboard", rules=None, rng=random):
+        """
+        Инициализация пакета: расстановка флота в каждой партии
+
+        Args:
+            count (int): Число партий K
+            strategy (str): Стратегия из BATCH_STRATEGIES
+            rules (Rules): Правила партии (по умолчанию стандартные)
+            rng: Источник случайных чисел (модуль random или random.Random)
+        """
+        if strategy not in BATCH_STRATEGIES:
+            raise ValueError(f"Стратегия {strategy} не поддерживает пакетный режим")
+
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.size = self.rules.size
+        self.strategy = strategy
+        self.rng = rng
+        self.count = count
+        self.cells = self.size * self.size
+        self.stride = block_stride(self.size)
+        self.block_bytes = self.stride // 8
+        table = get_placement_table(self.size)
+
+        # Во всех партиях одинаковое число кораблей: j-е корабли всех
+        # партий хранятся одной упакованной маской
+        ship_blocks = [bytearray(count * self.block_bytes)
+                       for _ in range(self.rules.total_ships)]
+        for game in range(count):
+            ships = generate_fleet(self.size, self.rules.fleet, rng=rng,
+                                   allow_touching=self.rules.allow_touching)
+            if ships is None:
+                raise RuntimeError("Не удалось расставить флот")
+            start = game * self.block_bytes
+            for number, ship in enumerate(ships):
+                mask = table.get_for_ship(ship).mask
+                ship_blocks[number][start:start + self.block_bytes] = self.to_block(mask)
+        self.ship_masks = [int.from_bytes(block, "little") for block in ship_blocks]
+        self.fleet_mask = 0
+        for mask in self.ship_masks:
+            self.fleet_mask |= mask
+
+        # Служебные маски поля, повторенные в каждом блоке
+        full, not_left, not_right = board_masks(self.size)
+        parity = 0
+        for y in range(self.size):
+            for x in range(self.size):
+                if (x + y) % 2 == 0:
+                    parity |= 1 << (y * self.size + x)
+        self.full = self.replicate(full)
+        self.not_left = self.replicate(not_left)
+        self.not_right = self.replicate(not_right)
+        self.parity_mask = self.replicate(parity)
+        self.ones = self.replicate(1)
+
+        self.miss_mask = 0
+        self.hit_mask = 0
+        self.sunk_mask = 0
+        self.blocked_mask = 0
+        self.active_flags = self.ones
+        self.active_count = count
+
+    def to_block(self, mask):
+        """Байты блока одной партии"""
+        return mask.to_bytes(self.block_bytes, "little")
+
+    def replicate(self, mask):
+        """Маска поля, повторенная во всех блоках пакета"""
+        return int.from_bytes(self.to_block(mask) * self.count, "little")
+
+    def nonempty(self, packed):
+        """
+        Флаги непустых блоков
+
+        Args:
+            packed (int): Упакованная маска без битов вне клеток поля
+
+        Returns:
+            int: Бит g * STRIDE установлен, если в блоке партии g есть клетки
+        """
+        return (packed + self.full) >> self.cells & self.ones
+
+    def expand(self, flags):
+        """Флаги блоков (как у nonempty) в маску всех клеток этих блоков"""
+        return (flags << self.cells) - flags
+
+    def around(self, packed):
+        """Соседи клеток по стороне во всех партиях"""
+        size = self.size
+        return (packed << size | packed >> size
+                | (packed << 1) & self.not_left | (packed >> 1) & self.not_right) & self.full
+
+    def halo(self, packed):
+        """Клетки вместе с соседями (окрестность 3x3) во всех партиях"""
+        row = packed | (packed << 1) & self.not_left | (packed >> 1) & self.not_right
+        return (row | row << self.size | row >> self.size) & self.full
+
+    def split(self, packed):
+        """
+        Маски клеток всех партий из упакованной маски
+
+        Returns:
+            list: Маска партии g на месте g
+        """
+        data = packed.to_bytes(self.count * self.block_bytes, "little")
+        block_bytes = self.block_bytes
+        return [int.from_bytes(data[start:start + block_bytes], "little")
+                for start in range(0, len(data), block_bytes)]
+
+    def candidates(self, unknown):
+        """
+        Клетки-кандидаты на выстрел во всех партиях сразу (checkerboard)
+
+        Соседи попаданий, если такие есть среди неизвестных клеток,
+        иначе неизвестные клетки одного цвета, иначе все неизвестные.
+        """
+        around = self.around(self.hit_mask) & unknown
+        hunt = self.expand(self.active_flags & ~self.nonempty(around))
+        parity = unknown & self.parity_mask
+        parity |= self.expand(~self.nonempty(parity) & self.ones) & unknown
+        return around | hunt & parity
+
+    def pick_blocks(self, packed):
+        """
+        Случайная клетка маски в каждом блоке, сразу для всего пакета
+
+        Каждой клетке приписывается ранг из независимых случайных битов,
+        и в блоке остается клетка с наибольшим рангом - это равновероятный
+        выбор. Ранги сравниваются по одному биту: в блоках, где у части
+        оставшихся клеток очередной бит равен 1, остаются только они.
+        Биты берутся, пока хотя бы в одном блоке больше одной клетки.
+
+        Returns:
+            int: Упакованная маска - по одной клетке в каждом непустом блоке
+        """
+        bits = self.count * self.stride
+        getrandbits = self.rng.getrandbits
+        while True:
+            # Младший бит каждого непустого блока вычитается без заема
+            # из соседнего блока, поэтому остаток - все клетки кроме младшей
+            lowest = self.nonempty(packed)
+            if not packed & (packed - lowest):
+                return packed
+            ones = packed & getrandbits(bits)
+            packed = ones | packed & ~self.expand(self.nonempty(ones))
+
+    def step(self):
+        """
+        Один выстрел в каждой незаконченной партии
+
+        Returns:
+            int: Число партий, оставшихся незаконченными
+        """
+        active = self.expand(self.active_flags)
+        shot = self.miss_mask | self.hit_mask | self.sunk_mask
+        unknown = active & ~(shot | self.blocked_mask)
+        # Партии, где все клетки запрещены, стреляют по любым нестрелянным
+        unknown |= self.expand(self.active_flags & ~self.nonempty(unknown)) & ~shot
+
+        shots = self.pick_blocks(self.candidates(unknown))
+
+        misses = shots & ~self.fleet_mask
+        self.miss_mask |= misses
+        self.blocked_mask |= misses
+        self.hit_mask |= shots & self.fleet_mask
+
+        # Корабль потоплен, если целых палуб не осталось. Клетки уже
+        # потопленных кораблей убраны из попаданий, поэтому флаг получают
+        # только корабли, добитые этим выстрелом
+        sunk = 0
+        for ship in self.ship_masks:
+            flags = self.active_flags & ~self.nonempty(ship & ~self.hit_mask)
+            if flags:
+                sunk |= self.expand(flags) & ship
+        if sunk:
+            self.hit_mask &= ~sunk
+            self.sunk_mask |= sunk
+            self.blocked_mask |= sunk if self.rules.allow_touching else self.halo(sunk)
+
+            # Партия окончена, когда у нее не осталось непотопленных клеток
+            finished = self.active_flags & ~self.nonempty(self.fleet_mask & ~self.sunk_mask)
+            if finished:
+                self.active_flags &= ~finished
+                self.active_count -= popcount(finished)
+
+        return self.active_count
+
+    def shot_counts(self):
+        """Число выстрелов в каждой партии"""
+        return [bin(mask).count("1")
+                for mask in self.split(self.miss_mask | self.hit_mask | self.sunk_mask)]
+
+    def run(self):
+        """
+        Доиграть все партии пакета
+
+        Returns:
+            list: Число выстрелов до потопления всего флота по партиям
+        """
+        while self.step():
+            pass
+        return self.shot_counts()
+
+
+def run_batch(count, strategy="checkerboard", rules=None, seed=None):
+    """
+    Сыграть пакет партий
+
+    Args:
+        count (int): Число партий
+        strategy (str): Стратегия из BATCH_STRATEGIES
+        rules (Rules): Правила партии
+        seed (int): Зерно генератора (None - случайное)
+
+    Returns:
+        list: Число выстрелов до потопления всего флота по партиям
+    """
+    return BatchGames(count, strategy, rules, random.Random(seed)).run()
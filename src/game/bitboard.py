@@ -0,0 +1,222 @@
+"""
+Битовое представление игрового поля
+
+Клетка (x, y) поля размера N соответствует биту с номером y * N + x.
+Корабли, попадания, промахи, уничтоженные клетки и запретная зона
+вокруг кораблей хранятся как целые числа, поэтому проверки размещения
+и обработка выстрела сводятся к нескольким операциям AND/OR/сдвиг.
+"""
+
+import random
+
+from .board import Board
+from .cells import DESTROYED, EMPTY, HIT, MISS, SHIP
+from .masks import mask_cells
+from .placement import generate_fleet
+
+
+class BitBoard(Board):
+    """
+    Игровое поле на битовых масках
+
+    Совместимо с Board по интерфейсу: ships, get_ship_at и строки
+    результата shoot() те же. Таблица grid и множество shots не ведутся
+    при каждом выстреле, а собираются по маскам при первом обращении
+    после изменения поля (для интерфейса и наблюдения), поэтому изменять
+    их снаружи бессмысленно.
+    """
+
+    def __init__(self, size=10, rules=None, rng=random):
+        """
+        Инициализация игрового поля
+
+        Args:
+            size (int): Размер поля (по умолчанию 10)
+            rules (Rules): Правила игры; если заданы, размер берется из них
+            rng: Источник случайных чисел для расстановки (модуль random или random.Random)
+        """
+        self.ship_mask = 0
+        self.hit_mask = 0
+        self.miss_mask = 0
+        self.destroyed_mask = 0
+        self.forbidden_mask = 0
+        self._ship_placements = {}
+        super().__init__(size, rules, rng)
+
+    @property
+    def grid(self):
+        """Состояния клеток (grid[y][x]), собранные по маскам"""
+        if self._grid is None:
+            size = self.size
+            grid = [[EMPTY] * size for _ in range(size)]
+            for mask, state in ((self.ship_mask, SHIP), (self.miss_mask, MISS),
+                                (self.hit_mask, HIT), (self.destroyed_mask, DESTROYED)):
+                for x, y in mask_cells(mask, size):
+                    grid[y][x] = state
+            self._grid = grid
+        return self._grid
+
+    @grid.setter
+    def grid(self, grid):
+        self._grid = grid
+
+    @property
+    def shots(self):
+        """Множество клеток, по которым стреляли, собранное по маскам"""
+        if self._shots is None:
+            self._shots = set(mask_cells(self.miss_mask | self.hit_mask, self.size))
+        return self._shots
+
+    @shots.setter
+    def shots(self, shots):
+        self._shots = shots
+
+    def is_free(self, placement):
+        """
+        Проверка, что клетки позиции и соседние с ними клетки свободны
+
+        Args:
+            placement (Placement): Позиция из таблицы позиций
+
+        Returns:
+            bool: True если корабль в этой позиции никого не касается
+        """
+        if self.rules.allow_touching:
+            return not placement.mask & self.ship_mask
+        return not placement.mask & self.forbidden_mask
+
+    def place_ship(self, ship, ignore_ships=False):
+        """
+        Размещение корабля на поле
+
+        Args:
+            ship (Ship): Корабль для размещения
+            ignore_ships (bool): Игнорировать проверку на другие корабли
+
+        Returns:
+            bool: True если корабль размещен
+        """
+        placement = self.placements.get_for_ship(ship)
+        if placement is None or not (ignore_ships or self.is_free(placement)):
+            return False
+
+        self.ship_mask |= placement.mask
+        self.forbidden_mask |= placement.halo
+        self._grid = None
+        if not ignore_ships:
+            self.ships.append(ship)
+            self._ship_placements[ship] = placement
+            for cell in placement.cells:
+                self.ship_index[cell] = ship
+        return True
+
+    def remove_ship(self, ship):
+        """
+        Удаление корабля с поля
+
+        Запретная зона меняется только в пределах зоны удаляемого
+        корабля: ее клетки остаются запретными, если входят в зону
+        другого корабля.
+
+        Args:
+            ship (Ship): Корабль для удаления
+        """
+        placement = self.placements.get_for_ship(ship)
+        mask = placement.mask
+        self.ship_mask &= ~mask
+        self.hit_mask &= ~mask
+        self.destroyed_mask &= ~mask
+        self._grid = self._shots = None
+        for cell in placement.cells:
+            if self.ship_index.get(cell) is ship:
+                del self.ship_index[cell]
+        if ship in self.ships:
+            self.ships.remove(ship)
+            del self._ship_placements[ship]
+
+        halo = placement.halo
+        forbidden = self.forbidden_mask & ~halo
+        for other in self._ship_placements.values():
+            if other.halo & halo:
+                forbidden |= other.halo & halo
+        self.forbidden_mask = forbidden
+
+    def auto_place_ships(self):
+        """
+        Автоматическая расстановка всех кораблей
+
+        То же, что Board.auto_place_ships, но занятые клетки берутся
+        готовыми из масок поля.
+
+        Returns:
+            bool: True если все корабли размещены
+        """
+        occupied = self.ship_mask if self.rules.allow_touching else self.forbidden_mask
+        ships = generate_fleet(self.size, self.rules.fleet, blocked=occupied, rng=self.rng,
+                               allow_touching=self.rules.allow_touching)
+        if ships is None:
+            return False
+
+        for ship in ships:
+            self.place_ship(ship)
+        return True
+
+    def shoot(self, x, y):
+        """
+        Выстрел по полю
+
+        Args:
+            x (int): X координата
+            y (int): Y координата
+
+        Returns:
+            str: Результат выстрела
+        """
+        bit = 1 << (y * self.size + x)
+        if (self.miss_mask | self.hit_mask) & bit:
+            return "already_shot"
+        self._grid = self._shots = None
+
+        if not self.ship_mask & bit:
+            self.miss_mask |= bit
+            return "miss"
+
+        self.hit_mask |= bit
+        ship = self.ship_index.get((x, y))
+        if ship is not None:
+            ship.hit(x, y)
+            # Корабль потоплен, если все его клетки есть в маске попаданий
+            ship_mask = self._ship_placements[ship].mask
+            if not ship_mask & ~self.hit_mask:
+                self.destroyed_mask |= ship_mask
+                return "destroyed"
+        return "hit"
+
+    def unshoot(self, x, y):
+        """
+        Отмена выстрела: обратное действие к shoot
+
+        Args:
+            x (int): X координата
+            y (int): Y координата
+
+        Returns:
+            bool: True если выстрел был и отменен
+        """
+        bit = 1 << (y * self.size + x)
+        if not (self.miss_mask | self.hit_mask) & bit:
+            return False
+        self._grid = self._shots = None
+
+        self.miss_mask &= ~bit
+        self.hit_mask &= ~bit
+        ship = self.ship_index.get((x, y))
+        if ship is not None:
+            if ship.is_destroyed():
+                self.destroyed_mask &= ~self._ship_placements[ship].mask
+            ship.unhit(x, y)
+        return True
+
+
+# Реализации поля по именам для параметров командной строки
+BOARD_CLASSES = {"board": Board, "bitboard": BitBoard}
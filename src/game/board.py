@@ -2,24 +2,56 @@
 Классы Board и SmartAI для игровой логики
 """
 
+import heapq
 import random
-from .cells import Cell, Ship
+from .cells import DESTROYED, EMPTY, HIT, MISS, SHIP
+from .masks import halo_mask, mask_cells, neighbour_masks, popcount
+from .observation import Observation
+from .opening import get_opening
+from .placement import generate_fleet, get_placement_table
+from .rules import Rules
 
 
 class Board:
     """Класс для представления игрового поля"""
 
-    def __init__(self, size=10):
+    def __init__(self, size=10, rules=None, rng=random):
         """
         Инициализация игрового поля
 
         Args:
             size (int): Размер поля (по умолчанию 10)
+            rules (Rules): Правила игры; если заданы, размер берется из них
+            rng: Источник случайных чисел для расстановки (модуль random или random.Random)
         """
+        if rules is None:
+            try:
+                rules = Rules(size)
+            except ValueError as error:
+                raise ValueError(f"{error}. Для поля {size}x{size} передайте правила "
+                                 f"с меньшим флотом: Board(rules=Rules({size}, fleet))") from error
+        self.rules = rules
+        size = rules.size
         self.size = size
-        self.grid = [[Cell.EMPTY for _ in range(size)] for _ in range(size)]
+        self.grid = [[EMPTY] * size for _ in range(size)]
         self.ships = []
         self.shots = set()
+        self.ship_index = {}
+        self.placements = get_placement_table(size)
+        self.rng = rng
+
+    def get_ship_at(self, x, y):
+        """
+        Корабль, занимающий клетку
+
+        Args:
+            x (int): X координата
+            y (int): Y координата
+
+        Returns:
+            Ship: Корабль или None, если клетка свободна
+        """
+        return self.ship_index.get((x, y))
 
     def can_place_ship(self, ship, ignore_ships=False):
         """
@@ -32,19 +64,49 @@ class Board:
         Returns:
             bool: True если можно разместить
         """
-        for x, y in ship.cells:
-            if not (0 <= x < self.size and 0 <= y < self.size):
-                return False
+        placement = self.placements.get_for_ship(ship)
+        if placement is None:
+            return False
+        if ignore_ships:
+            return True
+        return self.is_free(placement)
+
+    def is_free(self, placement):
+        """
+        Проверка, что клетки позиции и соседние с ними клетки свободны
 
-            # Проверка соседних клеток
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    nx, ny = x + dx, y + dy
-                    if 0 <= nx < self.size and 0 <= ny < self.size:
-                        if not ignore_ships and self.grid[ny][nx] == Cell.SHIP:
-                            return False
+        Args:
+            placement (Placement): Позиция из таблицы позиций
+
+        Returns:
+            bool: True если корабль в этой позиции никого не касается
+        """
+        cells = placement.cells if self.rules.allow_touching else placement.halo_cells
+        grid = self.grid
+        for x, y in cells:
+            if grid[y][x] == SHIP:
+                return False
         return True
 
+    def preview_ship(self, size, x, y, horizontal):
+        """
+        Пробное размещение корабля без изменения и копирования поля
+
+        Args:
+            size (int): Размер корабля
+            x (int): X координата начала
+            y (int): Y координата начала
+            horizontal (bool): True если горизонтальный
+
+        Returns:
+            tuple: (Placement или None если корабль выходит за поле,
+                    True если корабль можно поставить)
+        """
+        placement = self.placements.get(size, x, y, horizontal)
+        if placement is None:
+            return None, False
+        return placement, self.is_free(placement)
+
     def place_ship(self, ship, ignore_ships=False):
         """
         Размещение корабля на поле
@@ -58,9 +120,11 @@ class Board:
         """
         if self.can_place_ship(ship, ignore_ships):
             for x, y in ship.cells:
-                self.grid[y][x] = Cell.SHIP
+                self.grid[y][x] = SHIP
             if not ignore_ships:
                 self.ships.append(ship)
+                for cell in ship.cells:
+                    self.ship_index[cell] = ship
             return True
         return False
 
@@ -72,7 +136,9 @@ class Board:
             ship (Ship): Корабль для удаления
         """
         for x, y in ship.cells:
-            self.grid[y][x] = Cell.EMPTY
+            self.grid[y][x] = EMPTY
+            if self.ship_index.get((x, y)) is ship:
+                del self.ship_index[(x, y)]
         if ship in self.ships:
             self.ships.remove(ship)
 
@@ -80,33 +146,27 @@ class Board:
         """
         Автоматическая расстановка всех кораблей
 
+        Позиции выбираются только из допустимых, с откатом при тупике и
+        ограниченным числом шагов (см. placement.generate_fleet). Если
+        расстановка не найдена за отведенные шаги, выбрасывается PlacementError.
+
         Returns:
-            bool: True если все корабли размещены
+            bool: True если все корабли размещены, False если уже
+                  поставленные корабли не оставляют места для остальных
         """
-        ships_config = [(4, 1), (3, 2), (2, 3), (1, 4)]
-
-        for size, count in ships_config:
-            for _ in range(count):
-                placed = False
-                attempts = 0
-
-                while not placed and attempts < 500:
-                    x = random.randint(0, self.size - 1)
-                    y = random.randint(0, self.size - 1)
-                    horizontal = random.choice([True, False])
-
-                    # Проверка выхода за границы
-                    if horizontal and x + size > self.size:
-                        continue
-                    if not horizontal and y + size > self.size:
-                        continue
-
-                    ship = Ship(size, x, y, horizontal)
-                    placed = self.place_ship(ship)
-                    attempts += 1
-
-                if not placed:
-                    return False
+        occupied = 0
+        for x, y in self.ship_index:
+            occupied |= 1 << (y * self.size + x)
+        if not self.rules.allow_touching:
+            occupied = halo_mask(occupied, self.size)
+
+        ships = generate_fleet(self.size, self.rules.fleet, blocked=occupied, rng=self.rng,
+                               allow_touching=self.rules.allow_touching)
+        if ships is None:
+            return False
+
+        for ship in ships:
+            self.place_ship(ship)
         return True
 
     def shoot(self, x, y):
@@ -125,42 +185,113 @@ class Board:
 
         self.shots.add((x, y))
 
-        if self.grid[y][x] == Cell.SHIP:
-            self.grid[y][x] = Cell.HIT
+        if self.grid[y][x] == SHIP:
+            self.grid[y][x] = HIT
 
             # Поиск корабля и обновление его здоровья
-            for ship in self.ships:
-                if (x, y) in ship.cells:
-                    ship.health -= 1
-                    if ship.is_destroyed():
-                        # Помечаем весь корабль как уничтоженный
-                        for sx, sy in ship.cells:
-                            self.grid[sy][sx] = Cell.DESTROYED
-                        return "destroyed"
-                    return "hit"
+            ship = self.ship_index.get((x, y))
+            if ship is not None:
+                ship.hit(x, y)
+                if ship.is_destroyed():
+                    # Помечаем весь корабль как уничтоженный
+                    for sx, sy in ship.cells:
+                        self.grid[sy][sx] = DESTROYED
+                    return "destroyed"
             return "hit"
         else:
-            self.grid[y][x] = Cell.MISS
+            self.grid[y][x] = MISS
             return "miss"
 
+    def unshoot(self, x, y):
+        """
+        Отмена выстрела: обратное действие к shoot
+
+        Args:
+            x (int): X координата
+            y (int): Y координата
+
+        Returns:
+            bool: True если выстрел был и отменен
+        """
+        if (x, y) not in self.shots:
+            return False
+
+        self.shots.discard((x, y))
+        ship = self.ship_index.get((x, y))
+        if ship is None:
+            self.grid[y][x] = EMPTY
+            return True
+
+        was_destroyed = ship.is_destroyed()
+        ship.unhit(x, y)
+        if was_destroyed:
+            # Корабль снова только подбит: возвращаем состояние палуб
+            for sx, sy in ship.cells:
+                self.grid[sy][sx] = HIT if (sx, sy) in self.shots else SHIP
+        self.grid[y][x] = SHIP
+        return True
+
 
 class SmartAI:
     """Умный ИИ для компьютера"""
 
-    def __init__(self, board):
+    def __init__(self, board, opening=True, cache=None, rng=random):
         """
         Инициализация ИИ
 
+        ИИ не хранит поле противника: из него берутся только правила,
+        а дальше ИИ видит лишь свое наблюдение (observation.Observation).
+
         Args:
-            board (Board): Игровое поле противника
+            board (Board): Игровое поле противника или правила партии (Rules)
+            opening (bool): Брать выстрелы из дебютной книги до первого попадания
+            cache (DecisionCache): Общий кэш решений режима охоты (необязательно)
+            rng: Источник случайных чисел (модуль random или random.Random)
         """
-        self.board = board
+        self.rules = getattr(board, "rules", board)
+        self.size = self.rules.size
+        self.observation = Observation(self.size)
         self.shots = set()
+        self.shot_mask = 0
         self.last_hit = None
         self.hit_direction = None
         self.hits_to_follow = []
         self.directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
         self.mode = "hunt"
+        self.cache = cache
+        self.rng = rng
+
+        # Пока действует книга, приоритеты клеток не нужны и не строятся
+        self.opening = get_opening("smart", self.size) if opening else None
+        self.opening_position = 0 if self.opening else None
+        self.priority = None
+        self.heap = None
+        if self.opening_position is None:
+            self.build_priorities()
+
+    def build_priorities(self):
+        """
+        Построение приоритетов всех клеток и кучи для режима охоты
+
+        Дальше приоритеты меняются только у соседей новых выстрелов,
+        а куча хранит устаревшие записи до момента, когда они окажутся наверху.
+        """
+        self.priority = [self.calculate_priority(index % self.size, index // self.size)
+                         for index in range(self.size * self.size)]
+
+        self.heap = [(-priority, index) for index, priority in enumerate(self.priority)
+                     if not self.shot_mask >> index & 1]
+        heapq.heapify(self.heap)
+
+    def adjust_priorities(self, mask, delta):
+        """Изменение приоритета клеток маски с записью в кучу"""
+        if self.priority is None:
+            return
+        for x, y in mask_cells(mask, self.size):
+            index = y * self.size + x
+            self.priority[index] += delta
+            if not self.shot_mask >> index & 1:
+                heapq.heappush(self.heap, (-self.priority[index], index))
 
     def get_next_shot(self):
         """Получить координаты следующего выстрела"""
@@ -211,17 +342,18 @@ class SmartAI:
     def check_line_for_hits(self, x, y, dx, dy):
         """Проверить линию на наличие попаданий"""
         hits_in_line = 0
+        hits = self.observation.hit_mask | self.observation.sunk_mask
 
         nx, ny = x + dx, y + dy
-        while 0 <= nx < 10 and 0 <= ny < 10:
-            if (nx, ny) in self.shots and self.board.grid[ny][nx] in [Cell.HIT, Cell.DESTROYED]:
+        while 0 <= nx < self.size and 0 <= ny < self.size:
+            if hits >> (ny * self.size + nx) & 1:
                 hits_in_line += 1
             nx += dx
             ny += dy
 
         nx, ny = x - dx, y - dy
-        while 0 <= nx < 10 and 0 <= ny < 10:
-            if (nx, ny) in self.shots and self.board.grid[ny][nx] in [Cell.HIT, Cell.DESTROYED]:
+        while 0 <= nx < self.size and 0 <= ny < self.size:
+            if hits >> (ny * self.size + nx) & 1:
                 hits_in_line += 1
             nx -= dx
             ny -= dy
@@ -230,29 +362,42 @@ class SmartAI:
 
     def hunt_mode_shot(self):
         """Стратегическая стрельба в режиме охоты"""
-        priority_cells = []
-
-        for y in range(10):
-            for x in range(10):
-                if self.is_valid_shot(x, y):
-                    priority = self.calculate_priority(x, y)
-                    priority_cells.append((priority, (x, y)))
-
-        # Сортировка по приоритету
-        priority_cells.sort(reverse=True, key=lambda x: x[0])
-
-        if priority_cells:
-            return priority_cells[0][1]
+        position = self.opening_position
+        if position is not None and position < len(self.opening):
+            index = self.opening[position]
+            return (index % self.size, index // self.size)
+        if self.priority is None:
+            self.build_priorities()
+
+        # Выстрел охоты зависит только от наблюдения и исключенных клеток
+        key = None
+        if self.cache is not None:
+            key = ("smart", self.rules.key(), self.shot_mask, self.observation.key())
+            index = self.cache.get(key)
+            if index is not None:
+                return (index % self.size, index // self.size)
+
+        # Вершина кучи - клетка с наибольшим приоритетом; при равенстве
+        # выбирается первая в порядке обхода строк, как при сортировке
+        heap = self.heap
+        while heap:
+            priority, index = heap[0]
+            if self.shot_mask >> index & 1 or -priority != self.priority[index]:
+                heapq.heappop(heap)
+                continue
+            if key is not None:
+                self.cache.put(key, index)
+            return (index % self.size, index // self.size)
 
         # Резервный случайный выстрел
         while True:
-            x = random.randint(0, 9)
-            y = random.randint(0, 9)
+            x = self.rng.randint(0, self.size - 1)
+            y = self.rng.randint(0, self.size - 1)
             if (x, y) not in self.shots:
                 return (x, y)
 
-    def calculate_priority(self, x, y):
-        """Рассчитать приоритет клетки для выстрела"""
+    def base_priority(self, x, y):
+        """Часть приоритета клетки, не зависящая от выстрелов"""
         priority = 0
 
         # Предпочтение клеткам с четной суммой координат
@@ -260,44 +405,131 @@ class SmartAI:
             priority += 10
 
         # Предпочтение центру поля
-        distance_from_center = abs(x - 4.5) + abs(y - 4.5)
-        priority += max(0, 9 - distance_from_center)
+        center = (self.size - 1) / 2
+        distance_from_center = abs(x - center) + abs(y - center)
+        priority += max(0, self.size - 1 - distance_from_center)
 
         # Штраф за края поля
-        if x == 0 or x == 9 or y == 0 or y == 9:
+        last = self.size - 1
+        if x == 0 or x == last or y == 0 or y == last:
             priority -= 5
 
-        # Штраф за промахи рядом
-        misses_around = 0
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < 10 and 0 <= ny < 10:
-                if (nx, ny) in self.shots and self.board.grid[ny][nx] == Cell.MISS:
-                    misses_around += 1
-
-        priority -= misses_around * 3
+        return priority
 
-        # Бонус за попадания рядом
-        hits_around = 0
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0),
-                       (1, 1), (1, -1), (-1, 1), (-1, -1)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < 10 and 0 <= ny < 10:
-                if (nx, ny) in self.shots and self.board.grid[ny][nx] in [Cell.HIT, Cell.DESTROYED]:
-                    hits_around += 1
+    def calculate_priority(self, x, y):
+        """Рассчитать приоритет клетки для выстрела"""
+        priority = self.base_priority(x, y)
 
-        priority += hits_around * 15
+        # Штраф за промахи по сторонам и бонус за попадания вокруг
+        sides, ring = neighbour_masks(self.size)
+        index = y * self.size + x
+        observation = self.observation
+        misses_around = popcount(sides[index] & observation.miss_mask)
+        hits_around = popcount(ring[index] & (observation.hit_mask | observation.sunk_mask))
 
-        return priority
+        return priority - misses_around * 3 + hits_around * 15
 
     def is_valid_shot(self, x, y):
         """Проверить, можно ли стрелять в клетку"""
-        return (0 <= x < 10 and 0 <= y < 10 and
+        return (0 <= x < self.size and 0 <= y < self.size and
                 (x, y) not in self.shots)
 
-    def register_shot(self, x, y, result):
-        """Зарегистрировать результат выстрела"""
+    def get_state(self):
+        """
+        Компактное состояние ИИ для отката хода
+
+        Множество выстрелов хранится как маска, а наблюдение - в
+        сериализованном виде, поэтому состояние не требует копирования.
+
+        Returns:
+            tuple: Состояние для set_state
+        """
+        return (self.shot_mask, self.observation.to_bytes(), self.mode, self.last_hit,
+                self.hit_direction, tuple(self.hits_to_follow), self.opening_position)
+
+    def set_state(self, state):
+        """
+        Восстановление состояния, полученного get_state
+
+        Приоритеты не строятся заново: меняются только соседи клеток,
+        которые отличаются в двух наблюдениях, поэтому откат хода стоит
+        столько же, сколько сам ход.
+
+        Args:
+            state (tuple): Состояние ИИ
+        """
+        (shot_mask, observation, self.mode, self.last_hit,
+         self.hit_direction, hits_to_follow, self.opening_position) = state
+        old = self.observation
+        self.observation = Observation.from_bytes(observation)
+        self.hits_to_follow = list(hits_to_follow)
+
+        # Применяем к множеству выстрелов только разницу масок
+        size = self.size
+        changed = self.shot_mask ^ shot_mask
+        while changed:
+            low = changed & -changed
+            index = low.bit_length() - 1
+            if shot_mask & low:
+                self.shots.add((index % size, index // size))
+            else:
+                self.shots.discard((index % size, index // size))
+            changed ^= low
+        freed = self.shot_mask & ~shot_mask
+        self.shot_mask = shot_mask
+        if self.priority is None:
+            return
+
+        # Те же поправки, что в register_shot, по разнице наблюдений
+        sides, ring = neighbour_masks(size)
+        new = self.observation
+        for x, y in mask_cells(old.miss_mask ^ new.miss_mask, size):
+            index = y * size + x
+            self.adjust_priorities(sides[index], -3 if new.miss_mask >> index & 1 else 3)
+        old_hits = old.hit_mask | old.sunk_mask
+        new_hits = new.hit_mask | new.sunk_mask
+        for x, y in mask_cells(old_hits ^ new_hits, size):
+            index = y * size + x
+            self.adjust_priorities(ring[index], 15 if new_hits >> index & 1 else -15)
+
+        # Снова доступные клетки могли уйти из кучи, пока были выстрелами
+        for x, y in mask_cells(freed, size):
+            index = y * size + x
+            heapq.heappush(self.heap, (-self.priority[index], index))
+
+    def register_shot(self, x, y, result, sunk_cells=None):
+        """
+        Зарегистрировать результат выстрела
+
+        Args:
+            x (int): X координата
+            y (int): Y координата
+            result (str): Результат выстрела ("miss", "hit", "destroyed")
+            sunk_cells (list): Клетки потопленного корабля, если известны
+        """
+        index = y * self.size + x
         self.shots.add((x, y))
+        self.shot_mask |= 1 << index
+        sunk = self.observation.record(x, y, result, sunk_cells)
+
+        # Промах снижает приоритет соседей по стороне, попадание повышает всех соседей
+        sides, ring = neighbour_masks(self.size)
+        if result == "miss":
+            self.adjust_priorities(sides[index], -3)
+        elif result in ["hit", "destroyed"]:
+            self.adjust_priorities(ring[index], 15)
+
+        # Книга действует, пока выстрелы идут по ней и все они - промахи
+        position = self.opening_position
+        if position is not None:
+            if (result == "miss" and position < len(self.opening)
+                    and self.opening[position] == index):
+                self.opening_position += 1
+            else:
+                self.opening_position = None
+                # Приоритеты строятся по наблюдению, уже включающему этот выстрел
+                if self.priority is None:
+                    self.build_priorities()
 
         if result in ["hit", "destroyed"]:
             self.mode = "target"
@@ -311,7 +543,7 @@ class SmartAI:
                 self.last_hit = None
                 self.hit_direction = None
                 self.hits_to_follow = []
-                self.mark_around_destroyed(x, y)
+                self.mark_around_destroyed(sunk)
         else:
             if self.mode == "target" and self.hits_to_follow:
                 if (x, y) in self.hits_to_follow:
@@ -330,23 +562,19 @@ class SmartAI:
             if self.is_valid_shot(nx, ny):
                 self.hits_to_follow.append((nx, ny))
 
-        random.shuffle(self.hits_to_follow)
+        self.rng.shuffle(self.hits_to_follow)
 
-    def mark_around_destroyed(self, x, y):
-        """Пометить клетки вокруг уничтоженного корабля"""
-        destroyed_ship = None
-        for ship in self.board.ships:
-            if ship.is_destroyed() and (x, y) in ship.cells:
-                destroyed_ship = ship
-                break
+    def mark_around_destroyed(self, ship):
+        """
+        Пометить клетки вокруг уничтоженного корабля
 
-        if not destroyed_ship:
+        Args:
+            ship (int): Маска клеток потопленного корабля
+        """
+        # Если корабли могут касаться, соседние клетки не исключаются
+        if self.rules.allow_touching:
             return
 
-        for sx, sy in destroyed_ship.cells:
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    nx, ny = sx + dx, sy + dy
-                    if 0 <= nx < 10 and 0 <= ny < 10:
-                        if (nx, ny) not in self.shots:
-                            self.shots.add((nx, ny))
\ No newline at end of file
+        around = halo_mask(ship, self.size) & ~self.shot_mask
+        self.shot_mask |= around
+        self.shots.update(mask_cells(around, self.size))
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+Кэш решений ИИ с вытеснением давно не использованных записей (LRU)
+
+В симуляциях и на сервере с множеством партий ИИ часто оказывается в
+одинаковом состоянии (тот же рисунок промахов и попаданий, тот же
+остаток флота). Ключ записи - кортеж из имени стратегии, правил и
+битовых масок наблюдения, значение - принятое решение. Кэш можно
+сохранить на диск и загрузить при следующем запуске.
+"""
+
+import os
+import pickle
+from collections import OrderedDict
+
+
+class DecisionCache:
+    """Ограниченный по размеру кэш решений ИИ"""
+
+    def __init__(self, capacity=100000):
+        """
+        Инициализация кэша
+
+        Args:
+            capacity (int): Наибольшее число записей
+        """
+        if capacity < 1:
+            raise ValueError("Размер кэша должен быть положительным")
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Решение для состояния
+
+        Args:
+            key (tuple): Ключ состояния
+
+        Returns:
+            Сохраненное решение или None
+        """
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Сохранение решения с вытеснением самой старой записи
+
+        Args:
+            key (tuple): Ключ состояния
+            value: Решение (не None)
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Удаление всех записей и сброс счетчиков"""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Счетчики использования кэша
+
+        Returns:
+            dict: Число попаданий, промахов, записей и доля попаданий
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.entries),
+            "capacity": self.capacity,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def save(self, path):
+        """
+        Сохранение записей на диск (от старых к новым)
+
+        Args:
+            path (str): Путь к файлу кэша
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            pickle.dump(list(self.entries.items()), f)
+
+    def load(self, path):
+        """
+        Прогрев кэша записями, сохраненными методом save
+
+        Загруженные записи считаются более старыми, чем уже имеющиеся.
+
+        Args:
+            path (str): Путь к файлу кэша
+
+        Returns:
+            int: Число загруженных записей (0, если файла нет)
+        """
+        if not os.path.exists(path):
+            return 0
+        with open(path, "rb") as f:
+            items = pickle.load(f)
+
+        current = self.entries
+        self.entries = OrderedDict(items[-self.capacity:])
+        for key, value in current.items():
+            self.put(key, value)
+        return min(len(items), self.capacity)
@@ -2,11 +2,11 @@
 Определение классов Cell и Ship
 """
 
-import random
+from enum import IntEnum
 
 
-class Cell:
-    """Класс для представления состояния клетки"""
+class Cell(IntEnum):
+    """Состояние клетки (значения совместимы с прежними целыми константами)"""
     EMPTY = 0
     SHIP = 1
     MISS = 2
@@ -14,8 +14,25 @@ class Cell:
     DESTROYED = 4
 
 
+# Те же состояния простыми целыми: сравнение и запись в сетку в горячих
+# циклах обходятся без обращения к атрибутам перечисления
+EMPTY = int(Cell.EMPTY)
+SHIP = int(Cell.SHIP)
+MISS = int(Cell.MISS)
+HIT = int(Cell.HIT)
+DESTROYED = int(Cell.DESTROYED)
+
+
 class Ship:
-    """Класс для представления корабля"""
+    """
+    Класс для представления корабля
+
+    Хранит только начало, размер, ориентацию и маску подбитых палуб
+    (бит i - палуба i от начала корабля). Список клеток и здоровье
+    вычисляются по требованию, положение корабля после создания не меняется.
+    """
+
+    __slots__ = ("_size", "_x", "_y", "_horizontal", "_hits")
 
     def __init__(self, size, x, y, horizontal):
         """
@@ -27,23 +44,104 @@ class Ship:
             y (int): Y координата начала
             horizontal (bool): True если горизонтальный
         """
-        self.size = size
-        self.x = x
-        self.y = y
-        self.horizontal = horizontal
-        self.health = size
-        self.cells = []
-        self.update_cells()
-
-    def update_cells(self):
-        """Обновление списка клеток, занимаемых кораблем"""
-        self.cells = []
-        for i in range(self.size):
-            if self.horizontal:
-                self.cells.append((self.x + i, self.y))
-            else:
-                self.cells.append((self.x, self.y + i))
+        self._size = size
+        self._x = x
+        self._y = y
+        self._horizontal = bool(horizontal)
+        self._hits = 0
+
+    @property
+    def size(self):
+        """Размер корабля"""
+        return self._size
+
+    @property
+    def x(self):
+        """X координата начала"""
+        return self._x
+
+    @property
+    def y(self):
+        """Y координата начала"""
+        return self._y
+
+    @property
+    def horizontal(self):
+        """True если корабль горизонтальный"""
+        return self._horizontal
+
+    @property
+    def hits(self):
+        """Маска подбитых палуб"""
+        return self._hits
+
+    @property
+    def cells(self):
+        """Список клеток, занимаемых кораблем"""
+        if self._horizontal:
+            return [(self._x + i, self._y) for i in range(self._size)]
+        return [(self._x, self._y + i) for i in range(self._size)]
+
+    @property
+    def health(self):
+        """Количество целых палуб"""
+        return self._size - bin(self._hits).count("1")
+
+    def deck(self, x, y):
+        """
+        Номер палубы в клетке
+
+        Args:
+            x (int): X координата
+            y (int): Y координата
+
+        Returns:
+            int: Номер палубы от начала корабля или None, если клетка не его
+        """
+        if self._horizontal:
+            index = x - self._x
+            on_line = y == self._y
+        else:
+            index = y - self._y
+            on_line = x == self._x
+        if on_line and 0 <= index < self._size:
+            return index
+        return None
+
+    def hit(self, x, y):
+        """
+        Отметить попадание в клетку корабля
+
+        Args:
+            x (int): X координата
+            y (int): Y координата
+
+        Returns:
+            bool: True если палуба была цела
+        """
+        index = self.deck(x, y)
+        if index is None or self._hits >> index & 1:
+            return False
+        self._hits |= 1 << index
+        return True
+
+    def unhit(self, x, y):
+        """
+        Отменить попадание в клетку корабля
+
+        Args:
+            x (int): X координата
+            y (int): Y координата
+
+        Returns:
+            bool: True если палуба была подбита
+        """
+        index = self.deck(x, y)
+        if index is None or not self._hits >> index & 1:
+            return False
+        self._hits &= ~(1 << index)
+        return True
 
     def is_destroyed(self):
         """Проверка, уничтожен ли корабль"""
-        return self.health <= 0
\ No newline at end of file
+        return self._hits == (1 << self._size) - 1
\ No newline at end of file
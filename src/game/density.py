@@ -0,0 +1,358 @@
+"""
+ИИ на основе плотности допустимых позиций кораблей
+
+На каждом ходе для каждого оставшегося корабля перечисляются все его
+позиции, совместимые с уже известными промахами, попаданиями и
+потопленными кораблями, и для каждой неизвестной клетки считается,
+сколько позиций ее покрывают. Выстрел делается в клетку с наибольшим
+числом. Подсчет выполняется битовыми масками: множество допустимых
+якорей получается сдвигами маски свободных клеток, а счетчики по всем
+клеткам сразу хранятся как битовые плоскости.
+"""
+
+import heapq
+import random
+
+from .masks import board_masks, counter_add, counter_argmax, counter_values, halo_mask, mask_cells
+from .placement import free_anchors, get_placement_table
+
+
+def count_positions(size, remaining, blocked, hits=0):
+    """
+    Побитовый счетчик допустимых позиций оставшихся кораблей по клеткам
+
+    Args:
+        size (int): Размер поля
+        remaining (dict): Оставшиеся корабли: размер -> количество
+        blocked (int): Маска клеток, где кораблей быть не может
+        hits (int): Если не 0, учитываются только позиции, задевающие эти клетки
+
+    Returns:
+        list: Побитовый счетчик (см. masks.counter_add)
+    """
+    planes = []
+    for ship_size, count in remaining.items():
+        if count <= 0:
+            continue
+
+        horizontal, vertical = free_anchors(size, ship_size, blocked)
+        if ship_size == 1:
+            vertical = 0
+
+        if hits:
+            cover_horizontal = 0
+            cover_vertical = 0
+            for i in range(ship_size):
+                cover_horizontal |= hits >> i
+                cover_vertical |= hits >> (i * size)
+            horizontal &= cover_horizontal
+            vertical &= cover_vertical
+
+        # Каждая палуба позиции добавляет единицу в свою клетку
+        for i in range(ship_size):
+            if horizontal:
+                counter_add(planes, horizontal << i, count)
+            if vertical:
+                counter_add(planes, vertical << (i * size), count)
+    return planes
+
+
+class PlacementCounts:
+    """
+    Поклеточные счетчики допустимых позиций, обновляемые по разнице
+
+    Хранит множество еще допустимых позиций каждого размера и число
+    покрывающих каждую клетку позиций. Новая запрещенная клетка снимает
+    только проходящие через нее позиции, поэтому стоимость хода
+    пропорциональна числу затронутых позиций, а не размеру поля.
+    Клетка с максимумом ищется по куче с ленивым удалением устаревших записей.
+    """
+
+    def __init__(self, size, remaining, blocked=0):
+        """
+        Инициализация счетчиков
+
+        Args:
+            size (int): Размер поля
+            remaining (dict): Оставшиеся корабли: размер -> количество
+            blocked (int): Маска клеток, где кораблей быть не может
+        """
+        self.size = size
+        self.table = get_placement_table(size)
+        self.remaining = dict(remaining)
+        self.counts = [0] * (size * size)
+        self.cover = {}
+        self.valid = {}
+
+        for ship_size in self.remaining:
+            cover = [0] * (size * size)
+            valid = set()
+            for number, placement in enumerate(self.table.placements(ship_size)):
+                # Одиночный корабль учитывается один раз, а не в двух ориентациях
+                if ship_size == 1 and not placement.horizontal:
+                    continue
+                if placement.mask & blocked:
+                    continue
+                valid.add(number)
+                for x, y in placement.cells:
+                    cover[y * size + x] += 1
+            self.cover[ship_size] = cover
+            self.valid[ship_size] = valid
+
+            count = self.remaining[ship_size]
+            for index, value in enumerate(cover):
+                self.counts[index] += value * count
+
+        self.heap = [(-value, index) for index, value in enumerate(self.counts)]
+        heapq.heapify(self.heap)
+
+    def _change(self, index, delta):
+        """Изменение счетчика клетки с записью нового значения в кучу"""
+        self.counts[index] += delta
+        heapq.heappush(self.heap, (-self.counts[index], index))
+
+    def block(self, mask):
+        """
+        Снятие позиций, проходящих через новые запрещенные клетки
+
+        Args:
+            mask (int): Маска клеток, ставших запрещенными
+        """
+        for x, y in mask_cells(mask, self.size):
+            cell = y * self.size + x
+            for ship_size, valid in self.valid.items():
+                count = self.remaining[ship_size]
+                cover = self.cover[ship_size]
+                placements = self.table.placements(ship_size)
+                for number in self.table.covering(ship_size)[cell]:
+                    if number not in valid:
+                        continue
+                    valid.discard(number)
+                    for px, py in placements[number].cells:
+                        index = py * self.size + px
+                        cover[index] -= 1
+                        if count:
+                            self._change(index, -count)
+
+    def remove_ship(self, ship_size):
+        """
+        Учет потопленного корабля: его позиции больше не считаются
+
+        Args:
+            ship_size (int): Размер корабля
+        """
+        if self.remaining.get(ship_size, 0) <= 0:
+            return
+        self.remaining[ship_size] -= 1
+        for index, value in enumerate(self.cover[ship_size]):
+            if value:
+                self._change(index, -value)
+
+    def best(self, candidates):
+        """
+        Клетка с наибольшим счетчиком среди кандидатов
+
+        Args:
+            candidates (int): Маска рассматриваемых клеток
+
+        Returns:
+            int: Номер клетки или None, если ни одна позиция не покрывает кандидатов
+        """
+        heap = self.heap
+        while heap:
+            value, index = heap[0]
+            if -value != self.counts[index] or not candidates >> index & 1:
+                heapq.heappop(heap)
+                continue
+            return index if value < 0 else None
+        return None
+
+
+class DensityAI:
+    """ИИ, стреляющий в клетку, покрытую наибольшим числом позиций кораблей"""
+
+    def __init__(self, board, incremental=False, cache=None, rng=random):
+        """
+        Инициализация ИИ
+
+        Из поля противника берутся только размер и правила, расположение
+        кораблей ИИ не видит.
+
+        Args:
+            board (Board): Игровое поле противника или правила партии (Rules)
+            incremental (bool): Вести счетчики режима охоты по разнице
+                (PlacementCounts) вместо полного пересчета на каждом ходе
+            cache (DecisionCache): Общий кэш лучших клеток по состояниям (необязательно)
+            rng: Источник случайных чисел (модуль random или random.Random)
+        """
+        self.rules = getattr(board, "rules", board)
+        self.size = self.rules.size
+        self.shots = set()
+        self.miss_mask = 0
+        self.hit_mask = 0
+        self.sunk_mask = 0
+        self.blocked_mask = 0
+        self.remaining = dict(self.rules.fleet)
+        self.incremental = incremental
+        self.rng = rng
+        self.counts = PlacementCounts(self.size, self.remaining) if incremental else None
+        self.cache = cache
+
+    def get_next_shot(self):
+        """Получить координаты следующего выстрела"""
+        full = board_masks(self.size)[0]
+        unknown = full & ~(self.miss_mask | self.hit_mask | self.sunk_mask | self.blocked_mask)
+
+        if self.counts is not None and not self.hit_mask:
+            index = self.counts.best(unknown)
+            if index is not None:
+                return (index % self.size, index // self.size)
+
+        best = self.best_cells(unknown)
+        if not best:
+            best = unknown or full & ~(self.miss_mask | self.hit_mask | self.sunk_mask)
+        return self.rng.choice(mask_cells(best, self.size))
+
+    def best_cells(self, unknown):
+        """
+        Маска неизвестных клеток с наибольшим числом позиций
+
+        При наличии кэша маска ищется по состоянию, а случайный выбор
+        среди равных клеток остается за вызывающим.
+
+        Args:
+            unknown (int): Маска неизвестных клеток
+
+        Returns:
+            int: Маска лучших клеток (0, если ни одна позиция их не покрывает)
+        """
+        if self.cache is None:
+            return counter_argmax(self.count_placements(), unknown)
+
+        key = ("density", self.rules.key()) + self.cache_key()
+        best = self.cache.get(key)
+        if best is None:
+            best = counter_argmax(self.count_placements(), unknown)
+            self.cache.put(key, best)
+        return best
+
+    def count_placements(self):
+        """
+        Число допустимых позиций оставшихся кораблей, покрывающих каждую клетку
+
+        Если есть подбитые, но не потопленные корабли, учитываются только
+        позиции, проходящие через попадания.
+
+        Returns:
+            list: Побитовый счетчик (см. masks.counter_add)
+        """
+        if self.hit_mask:
+            planes = self._count(self.hit_mask)
+            if planes:
+                return planes
+        return self._count(0)
+
+    def _count(self, hits):
+        """Подсчет позиций; при hits != 0 только позиций, задевающих попадания"""
+        return count_positions(self.size, self.remaining, self.blocked_mask, hits)
+
+    def heatmap(self):
+        """Таблица числа позиций по клеткам (grid[y][x]) для отладки и отрисовки"""
+        return counter_values(self.count_placements(), self.size)
+
+    def register_shot(self, x, y, result, sunk_cells=None):
+        """
+        Зарегистрировать результат выстрела
+
+        Args:
+            x (int): X координата
+            y (int): Y координата
+            result (str): Результат выстрела ("miss", "hit", "destroyed")
+            sunk_cells (list): Клетки потопленного корабля, если известны
+        """
+        self.shots.add((x, y))
+        bit = 1 << (y * self.size + x)
+
+        if result == "miss":
+            self.miss_mask |= bit
+            self.blocked_mask |= bit
+            if self.counts is not None:
+                self.counts.block(bit)
+            return
+
+        self.hit_mask |= bit
+        if result != "destroyed":
+            return
+
+        if sunk_cells is not None:
+            ship = 0
+            for sx, sy in sunk_cells:
+                ship |= 1 << (sy * self.size + sx)
+        else:
+            ship = self.find_sunk_ship(x, y)
+
+        self.hit_mask &= ~ship
+        self.sunk_mask |= ship
+        blocked = ship if self.rules.allow_touching else halo_mask(ship, self.size)
+        new_blocked = blocked & ~self.blocked_mask
+        self.blocked_mask |= blocked
+
+        ship_size = bin(ship).count("1")
+        if self.remaining.get(ship_size, 0) > 0:
+            self.remaining[ship_size] -= 1
+
+        if self.counts is not None:
+            self.counts.block(new_blocked)
+            self.counts.remove_ship(ship_size)
+
+    def find_sunk_ship(self, x, y):
+        """
+        Маска потопленного корабля, восстановленная по попаданиям
+
+        Корабль - прямой отрезок подряд идущих попаданий через клетку
+        выстрела. Из горизонтального и вертикального отрезков выбирается
+        самый длинный, длина которого есть среди оставшихся кораблей.
+
+        Returns:
+            int: Маска клеток корабля
+        """
+        runs = []
+        for dx, dy in ((1, 0), (0, 1)):
+            cells = 1 << (y * self.size + x)
+            length = 1
+            for sign in (1, -1):
+                nx, ny = x + sign * dx, y + sign * dy
+                while 0 <= nx < self.size and 0 <= ny < self.size:
+                    bit = 1 << (ny * self.size + nx)
+                    if not self.hit_mask & bit:
+                        break
+                    cells |= bit
+                    length += 1
+                    nx += sign * dx
+                    ny += sign * dy
+            runs.append((self.remaining.get(length, 0) > 0, length, cells))
+        return max(runs)[2]
+
+    def get_state(self):
+        """Компактное состояние ИИ для отката хода"""
+        return (self.miss_mask, self.hit_mask, self.sunk_mask, self.blocked_mask,
+                tuple(sorted(self.remaining.items())))
+
+    def cache_key(self):
+        """
+        Часть ключа кэша, задающая наблюдение
+
+        Только маски и остаток флота: наследники, дополняющие get_state
+        своим состоянием, делят записи кэша с DensityAI.
+        """
+        return DensityAI.get_state(self)
+
+    def set_state(self, state):
+        """Восстановление состояния, полученного get_state"""
+        self.miss_mask, self.hit_mask, self.sunk_mask, self.blocked_mask, remaining = state
+        self.remaining = dict(remaining)
+        self.shots = set(mask_cells(self.miss_mask | self.hit_mask | self.sunk_mask, self.size))
+
+        # Счетчики не откатываются по разнице, а строятся заново
+        if self.incremental:
+            self.counts = PlacementCounts(self.size, self.remaining, self.blocked_mask)
@@ -2,34 +2,60 @@
 Основная игровая логика
 """
 
+import random
+
 from .board import Board
 from .cells import Ship
+from .journal import Journal
+from .placement import PlacementError
+from .replay import MAX_REPLAY_SIZE
+from .rng import spawn
+from .rules import DEFAULT_RULES
+from .strategies import DEFAULT_STRATEGY, create_ai, get_strategy
 
 
 class GameLogic:
     """Класс для управления игровой логикой"""
 
-    def __init__(self):
-        """Инициализация игры"""
-        self.player_board = Board()
-        self.computer_board = Board()
+    def __init__(self, board_class=Board, rules=None, strategy=DEFAULT_STRATEGY, rng=random,
+                 replay=None):
+        """
+        Инициализация игры
+
+        Args:
+            board_class (type): Реализация игрового поля (Board или BitBoard)
+            rules (Rules): Правила игры (по умолчанию поле 10x10 и стандартный флот)
+            strategy (str): Имя стратегии ИИ компьютера (см. strategies.STRATEGIES)
+            rng: Источник случайных чисел партии (модуль random или random.Random);
+                 поля и ИИ получают из него собственные независимые источники
+            replay (ReplayWriter): Журнал, в который записываются партии (необязательно)
+        """
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.strategy = get_strategy(strategy).name
+        self.board_class = board_class
+        player_rng, computer_rng, self.ai_rng = spawn(rng, 3)
+        self.player_board = board_class(rules=self.rules, rng=player_rng)
+        self.computer_board = board_class(rules=self.rules, rng=computer_rng)
         self.placement_mode = True
         self.player_turn = True
         self.game_over = False
         self.computer_shots = []
         self.computer_ai = None
+        self.ai_state = None
+        self.replay = replay
 
         # Корабли для размещения
         self.ships_to_place = [
-            {"size": 4, "count": 1, "placed": 0, "name": "4-палубный (1 шт)"},
-            {"size": 3, "count": 2, "placed": 0, "name": "3-палубный (2 шт)"},
-            {"size": 2, "count": 3, "placed": 0, "name": "2-палубный (3 шт)"},
-            {"size": 1, "count": 4, "placed": 0, "name": "1-палубный (4 шт)"}
+            {"size": size, "count": count, "placed": 0, "name": f"{size}-палубный ({count} шт)"}
+            for size, count in self.rules.fleet
         ]
 
         self.current_ship_size = None
         self.current_ship_horizontal = True
 
+        # Журнал действий для отмены и повтора
+        self.journal = Journal()
+
     def select_ship(self, size):
         """Выбор корабля для размещения"""
         for ship_info in self.ships_to_place:
@@ -50,16 +76,49 @@ class GameLogic:
             return f"Корабль повёрнут: {orient}"
         return "Сначала выберите корабль!"
 
+    def clamp_origin(self, x, y):
+        """Сдвиг начала текущего корабля, чтобы он не выходил за поле"""
+        size = self.rules.size
+        if self.current_ship_horizontal and x + self.current_ship_size > size:
+            x = size - self.current_ship_size
+        elif not self.current_ship_horizontal and y + self.current_ship_size > size:
+            y = size - self.current_ship_size
+        return x, y
+
+    def preview_ship(self, x, y):
+        """
+        Клетки, которые займет текущий корабль при установке в (x, y)
+
+        Поле не копируется и не изменяется.
+
+        Returns:
+            tuple: Клетки корабля или None, если его нельзя поставить
+        """
+        if not self.current_ship_size or not self.placement_mode:
+            return None
+
+        x, y = self.clamp_origin(x, y)
+        placement, can_place = self.player_board.preview_ship(
+            self.current_ship_size, x, y, self.current_ship_horizontal)
+        if not can_place:
+            return None
+
+        # Проверка лимита кораблей такого типа по счетчикам
+        for ship_info in self.ships_to_place:
+            if ship_info["size"] == self.current_ship_size:
+                if ship_info["placed"] >= ship_info["count"]:
+                    return None
+                break
+
+        return placement.cells
+
     def place_ship(self, x, y):
         """Размещение корабля на поле игрока"""
         if not self.current_ship_size or not self.placement_mode:
             return False, "Не выбран корабль или не режим размещения"
 
         # Проверка границ
-        if self.current_ship_horizontal and x + self.current_ship_size > 10:
-            x = 10 - self.current_ship_size
-        elif not self.current_ship_horizontal and y + self.current_ship_size > 10:
-            y = 10 - self.current_ship_size
+        x, y = self.clamp_origin(x, y)
 
         if x < 0 or y < 0:
             return False, "Нельзя разместить за границами поля!"
@@ -84,16 +143,14 @@ class GameLogic:
 
         # Размещение корабля
         if self.player_board.place_ship(ship):
-            # Обновление счетчиков
-            for ship_info in self.ships_to_place:
-                if ship_info["size"] == self.current_ship_size:
-                    ship_info["placed"] += 1
-                    break
+            self.count_ship(ship.size, 1)
+            self.journal.record(("place", ship))
 
             placed_total = sum(s["placed"] for s in self.ships_to_place)
 
-            if placed_total < 10:
-                return True, f"Корабль размещен! Размещено: {placed_total}/10"
+            total = self.rules.total_ships
+            if placed_total < total:
+                return True, f"Корабль размещен! Размещено: {placed_total}/{total}"
             else:
                 return True, "Все корабли размещены! Нажмите 'НАЧАТЬ БИТВУ'"
         else:
@@ -101,65 +158,98 @@ class GameLogic:
 
     def remove_ship(self, x, y):
         """Удаление корабля по координатам"""
-        for ship in self.player_board.ships[:]:
-            if (x, y) in ship.cells:
-                self.player_board.remove_ship(ship)
+        ship = self.player_board.get_ship_at(x, y)
+        if ship is None:
+            return False, "Корабль не найден"
 
-                # Обновление счетчиков
-                for ship_info in self.ships_to_place:
-                    if ship_info["size"] == ship.size:
-                        ship_info["placed"] -= 1
-                        break
+        self.player_board.remove_ship(ship)
+        self.count_ship(ship.size, -1)
+        self.journal.record(("remove", ship))
 
-                placed_total = sum(s["placed"] for s in self.ships_to_place)
-                return True, f"Корабль удален. Размещено: {placed_total}/10"
+        placed_total = sum(s["placed"] for s in self.ships_to_place)
+        return True, f"Корабль удален. Размещено: {placed_total}/{self.rules.total_ships}"
 
-        return False, "Корабль не найден"
+    def count_ship(self, size, delta):
+        """Изменение счетчика размещенных кораблей заданного размера"""
+        for ship_info in self.ships_to_place:
+            if ship_info["size"] == size:
+                ship_info["placed"] += delta
+                break
+
+    def remove_all_ships(self):
+        """
+        Удаление всех кораблей игрока с поля
+
+        Returns:
+            list: Действия удаления для журнала
+        """
+        actions = []
+        for ship in self.player_board.ships[:]:
+            self.player_board.remove_ship(ship)
+            self.count_ship(ship.size, -1)
+            actions.append(("remove", ship))
+        return actions
 
     def auto_place_all_ships(self):
         """Автоматическая расстановка всех кораблей"""
-        self.player_board = Board()
+        actions = self.remove_all_ships()
 
-        # Сброс счетчиков
-        for ship_info in self.ships_to_place:
-            ship_info["placed"] = 0
+        try:
+            placed = self.player_board.auto_place_ships()
+        except PlacementError as error:
+            self.revert_action(("batch", actions))
+            return False, str(error)
 
-        if self.player_board.auto_place_ships():
+        if placed:
             # Обновление счетчиков
             for ship in self.player_board.ships:
-                for ship_info in self.ships_to_place:
-                    if ship_info["size"] == ship.size:
-                        ship_info["placed"] += 1
-                        break
+                self.count_ship(ship.size, 1)
+                actions.append(("place", ship))
+            self.journal.record(("batch", actions))
             return True, "Все корабли автоматически размещены!"
         else:
+            self.revert_action(("batch", actions))
             return False, "Не удалось разместить корабли!"
 
     def clear_all_ships(self):
         """Очистка всех кораблей"""
-        self.player_board = Board()
-
-        for ship_info in self.ships_to_place:
-            ship_info["placed"] = 0
+        actions = self.remove_all_ships()
+        if actions:
+            self.journal.record(("batch", actions))
 
         return True, "Поле очищено. Выберите корабли."
 
     def start_battle(self):
         """Начало битвы"""
         placed_count = sum(s["placed"] for s in self.ships_to_place)
-        if placed_count < 10:
-            return False, "Разместите все 10 кораблей!"
-
-        if not self.computer_board.auto_place_ships():
+        if placed_count < self.rules.total_ships:
+            return False, f"Разместите все {self.rules.total_ships} кораблей!"
+
+        try:
+            placed = self.computer_board.auto_place_ships()
+        except PlacementError as error:
+            return False, str(error)
+        if not placed:
             return False, "Не удалось расставить корабли компьютера!"
 
         self.placement_mode = False
         self.player_turn = True
         self.game_over = False
-
-        # Импорт здесь чтобы избежать циклических зависимостей
-        from .board import SmartAI
-        self.computer_ai = SmartAI(self.player_board)
+        self.journal.clear()
+
+        self.computer_ai = create_ai(self.strategy, self.player_board, rng=self.ai_rng)
+        # Состояние ИИ после последнего хода: оно же состояние до следующего,
+        # поэтому за ход снимается только одно состояние
+        self.ai_state = self.computer_ai.get_state()
+        if self.replay is not None:
+            if self.rules.size <= MAX_REPLAY_SIZE:
+                # Игрок стреляет первым, поэтому его флот - сторона 0
+                self.replay.begin_game(self.rules,
+                                       (self.player_board.ships, self.computer_board.ships))
+            else:
+                # Номер клетки в журнале занимает байт: партия на большом
+                # поле не записывается, но игра идет как обычно
+                self.replay.end_game()
 
         return True, "Битва началась!"
 
@@ -168,11 +258,15 @@ class GameLogic:
         if not self.player_turn or self.game_over:
             return None, "Не ваш ход или игра окончена"
 
+        before = (self.player_turn, self.game_over)
         result = self.computer_board.shoot(x, y)
 
         if result == "already_shot":
             return None, "Вы уже стреляли в эту клетку!"
 
+        self.journal.record(("shoot", x, y, before))
+        self.record_shot(x, y)
+
         if result == "miss":
             self.player_turn = False
             return "miss", "Промах! Ход компьютера..."
@@ -188,13 +282,22 @@ class GameLogic:
         if self.player_turn or self.game_over:
             return None, "Ход игрока или игра окончена"
 
+        before = (self.player_turn, self.game_over)
+        ai_before = self.ai_state
+
         # Получаем следующий выстрел от ИИ
         x, y = self.computer_ai.get_next_shot()
 
         result = self.player_board.shoot(x, y)
 
-        # Регистрируем выстрел в ИИ
-        self.computer_ai.register_shot(x, y, result)
+        # ИИ получает только результат и, при потоплении, клетки корабля
+        sunk_cells = None
+        if result == "destroyed":
+            sunk_cells = self.player_board.get_ship_at(x, y).cells
+        self.computer_ai.register_shot(x, y, result, sunk_cells)
+        self.ai_state = self.computer_ai.get_state()
+        self.journal.record(("ai_shot", x, y, before, ai_before, self.ai_state))
+        self.record_shot(x, y)
 
         if result == "miss":
             self.player_turn = True
@@ -203,6 +306,79 @@ class GameLogic:
             hit_text = "Попадание" if result == "hit" else "Корабль уничтожен"
             return (x, y, result, f"Компьютер стрелял в ({x},{y}) - {hit_text}!\nКомпьютер стреляет ещё...")
 
+    def record_shot(self, x, y):
+        """Запись выстрела в журнал партий, если он ведется"""
+        if self.replay is not None and self.replay.in_game:
+            self.replay.shot(x, y)
+
+    def undo(self):
+        """Отмена последнего действия"""
+        action = self.journal.undo()
+        if action is None:
+            return False, "Нечего отменять"
+        self.revert_action(action)
+        return True, "Действие отменено"
+
+    def redo(self):
+        """Повтор отмененного действия"""
+        action = self.journal.redo()
+        if action is None:
+            return False, "Нечего повторять"
+        self.apply_action(action)
+        return True, "Действие повторено"
+
+    def apply_action(self, action):
+        """Применение действия из журнала"""
+        kind = action[0]
+        if kind == "place":
+            self.player_board.place_ship(action[1])
+            self.count_ship(action[1].size, 1)
+        elif kind == "remove":
+            self.player_board.remove_ship(action[1])
+            self.count_ship(action[1].size, -1)
+        elif kind == "batch":
+            for item in action[1]:
+                self.apply_action(item)
+        elif kind == "shoot":
+            _, x, y, _ = action
+            if self.computer_board.shoot(x, y) == "miss":
+                self.player_turn = False
+            self.record_shot(x, y)
+        elif kind == "ai_shot":
+            _, x, y, _, _, ai_after = action
+            if self.player_board.shoot(x, y) == "miss":
+                self.player_turn = True
+            self.computer_ai.set_state(ai_after)
+            self.ai_state = ai_after
+            self.record_shot(x, y)
+
+    def revert_action(self, action):
+        """Отмена действия по обратной разнице, без снимков поля"""
+        kind = action[0]
+        if kind == "place":
+            self.player_board.remove_ship(action[1])
+            self.count_ship(action[1].size, -1)
+        elif kind == "remove":
+            self.player_board.place_ship(action[1])
+            self.count_ship(action[1].size, 1)
+        elif kind == "batch":
+            for item in reversed(action[1]):
+                self.revert_action(item)
+        elif kind == "shoot":
+            _, x, y, before = action
+            self.computer_board.unshoot(x, y)
+            self.player_turn, self.game_over = before
+            if self.replay is not None:
+                self.replay.undo_shot()
+        elif kind == "ai_shot":
+            _, x, y, before, ai_before, _ = action
+            self.player_board.unshoot(x, y)
+            self.computer_ai.set_state(ai_before)
+            self.ai_state = ai_before
+            self.player_turn, self.game_over = before
+            if self.replay is not None:
+                self.replay.undo_shot()
+
     def check_game_over(self):
         """Проверка окончания игры"""
         player_ships_alive = any(not ship.is_destroyed() for ship in self.player_board.ships)
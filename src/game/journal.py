@@ -0,0 +1,73 @@
+"""
+Журнал действий для отмены и повтора
+"""
+
+
+class Journal:
+    """
+    Журнал действий игры
+
+    Записи - кортежи, первый элемент которых задает вид действия:
+        ("place", ship) - корабль поставлен игроком
+        ("remove", ship) - корабль убран с поля игрока
+        ("batch", actions) - несколько действий как одно целое
+        ("shoot", x, y, before) - выстрел игрока, before - (player_turn, game_over)
+        ("ai_shot", x, y, before, ai_before, ai_after) - выстрел компьютера
+            с состояниями ИИ до и после выстрела
+
+    Журнал только дописывается; отмена сдвигает позицию назад, а новое
+    действие после отмены отбрасывает отмененный хвост.
+    """
+
+    def __init__(self):
+        """Инициализация пустого журнала"""
+        self.entries = []
+        self.position = 0
+
+    def record(self, action):
+        """
+        Запись нового действия
+
+        Args:
+            action (tuple): Действие
+        """
+        del self.entries[self.position:]
+        self.entries.append(action)
+        self.position += 1
+
+    def can_undo(self):
+        """Есть ли действие для отмены"""
+        return self.position > 0
+
+    def can_redo(self):
+        """Есть ли отмененное действие для повтора"""
+        return self.position < len(self.entries)
+
+    def undo(self):
+        """
+        Шаг назад по журналу
+
+        Returns:
+            tuple: Действие, которое нужно отменить, или None
+        """
+        if not self.can_undo():
+            return None
+        self.position -= 1
+        return self.entries[self.position]
+
+    def redo(self):
+        """
+        Шаг вперед по журналу
+
+        Returns:
+            tuple: Действие, которое нужно повторить, или None
+        """
+        if not self.can_redo():
+            return None
+        self.position += 1
+        return self.entries[self.position - 1]
+
+    def clear(self):
+        """Очистка журнала"""
+        self.entries = []
+        self.position = 0
@@ -0,0 +1,157 @@
+"""
+Операции с битовыми масками клеток поля
+
+Клетка (x, y) поля размера N соответствует биту с номером y * N + x.
+"""
+
+
+_BOARD_MASKS = {}
+_NEIGHBOUR_MASKS = {}
+
+
+def board_masks(size):
+    """
+    Служебные маски для поля заданного размера
+
+    Args:
+        size (int): Размер поля
+
+    Returns:
+        tuple: (все клетки, все кроме левого столбца, все кроме правого столбца)
+    """
+    masks = _BOARD_MASKS.get(size)
+    if masks is None:
+        full = (1 << (size * size)) - 1
+        left_column = 0
+        for y in range(size):
+            left_column |= 1 << (y * size)
+        right_column = left_column << (size - 1)
+        masks = (full, full & ~left_column, full & ~right_column)
+        _BOARD_MASKS[size] = masks
+    return masks
+
+
+def cell_bit(x, y, size):
+    """Бит клетки (x, y)"""
+    return 1 << (y * size + x)
+
+
+def halo_mask(mask, size):
+    """
+    Маска клеток вместе с их соседями (окрестность 3x3)
+
+    Args:
+        mask (int): Исходная маска
+        size (int): Размер поля
+
+    Returns:
+        int: Маска клеток и всех соседних с ними клеток
+    """
+    full, not_left, not_right = board_masks(size)
+    row = mask | ((mask << 1) & not_left) | ((mask >> 1) & not_right)
+    return (row | (row << size) | (row >> size)) & full
+
+
+def neighbour_masks(size):
+    """
+    Маски соседей для каждой клетки поля
+
+    Args:
+        size (int): Размер поля
+
+    Returns:
+        tuple: (соседи по стороне, все 8 соседей) - списки масок по номеру клетки
+    """
+    masks = _NEIGHBOUR_MASKS.get(size)
+    if masks is None:
+        full, not_left, not_right = board_masks(size)
+        sides = []
+        ring = []
+        for index in range(size * size):
+            bit = 1 << index
+            row = ((bit << 1) & not_left) | ((bit >> 1) & not_right)
+            sides.append((row | (bit << size) | (bit >> size)) & full)
+            ring.append(halo_mask(bit, size) & ~bit)
+        masks = (sides, ring)
+        _NEIGHBOUR_MASKS[size] = masks
+    return masks
+
+
+def popcount(mask):
+    """Количество установленных битов"""
+    return bin(mask).count("1")
+
+
+def mask_cells(mask, size):
+    """Список координат установленных битов маски"""
+    cells = []
+    while mask:
+        low = mask & -mask
+        index = low.bit_length() - 1
+        cells.append((index % size, index // size))
+        mask ^= low
+    return cells
+
+
+def counter_add(planes, mask, weight=1):
+    """
+    Прибавление маски к побитовому счетчику
+
+    Счетчик хранит по числу на каждую клетку в виде списка битовых
+    плоскостей: planes[i] - маска клеток, у которых установлен i-й бит
+    значения. Прибавление выполняется сразу для всех клеток маски.
+
+    Args:
+        planes (list): Плоскости счетчика (изменяются на месте)
+        mask (int): Клетки, к которым прибавляется weight
+        weight (int): Прибавляемое значение
+    """
+    level = 0
+    while weight:
+        if weight & 1:
+            carry = mask
+            index = level
+            while carry:
+                while index >= len(planes):
+                    planes.append(0)
+                overflow = planes[index] & carry
+                planes[index] ^= carry
+                carry = overflow
+                index += 1
+        weight >>= 1
+        level += 1
+
+
+def counter_argmax(planes, candidates):
+    """
+    Клетки с максимальным значением счетчика среди кандидатов
+
+    Args:
+        planes (list): Плоскости счетчика
+        candidates (int): Маска рассматриваемых клеток
+
+    Returns:
+        int: Маска клеток-кандидатов с наибольшим значением
+    """
+    for plane in reversed(planes):
+        if candidates & plane:
+            candidates &= plane
+    return candidates
+
+
+def counter_values(planes, size):
+    """
+    Значения счетчика по клеткам
+
+    Args:
+        planes (list): Плоскости счетчика
+        size (int): Размер поля
+
+    Returns:
+        list: Таблица size x size со значениями (grid[y][x])
+    """
+    values = [[0] * size for _ in range(size)]
+    for level, plane in enumerate(planes):
+        for x, y in mask_cells(plane, size):
+            values[y][x] += 1 << level
+    return values
@@ -0,0 +1,301 @@
+"""
+Измерение времени горячих путей игры
+
+Пока измерение выключено, код игры не меняется и ничего не стоит.
+Metrics.enable() подменяет выбранные методы классов обертками,
+которые засекают время каждого вызова, а disable() возвращает
+исходные методы. Измеряется выбор хода всех зарегистрированных
+стратегий ИИ, а у выстрелов игрока и компьютера еще и считаются
+результаты (промах, попадание, потопление).
+
+Длительности не хранятся по отдельности: каждая операция копит
+гистограмму с логарифмическими корзинами (Histogram), поэтому память
+не растет с длиной игры, а перцентили получаются с точностью до
+ширины корзины (около 12%). Собранные данные можно запросить по
+операции (число вызовов, среднее, p50/p95/p99) и выгрузить в JSON или CSV.
+
+Пример:
+    from game.metrics import METRICS
+    METRICS.enable()
+    ...  # игра или симуляция
+    METRICS.disable()
+    METRICS.to_json("metrics.json")
+"""
+
+import csv
+import functools
+import importlib
+import json
+import math
+import sys
+import time
+
+# Измеряемые методы: (модуль, класс, метод). Модули интерфейса
+# подключаются, только если уже импортированы, чтобы не тянуть tkinter
+DEFAULT_TARGETS = [
+    ("game.game_logic", "GameLogic", "player_shoot"),
+    ("game.game_logic", "GameLogic", "computer_shoot"),
+    ("game.game_logic", "GameLogic", "check_game_over"),
+    ("game.ui", "SeaBattleStable", "draw_board_fixed"),
+    ("game.ui", "SeaBattleStable", "draw_preview"),
+]
+UI_MODULES = ("game.ui",)
+
+# Методы, у которых считаются результаты, и номер результата выстрела
+# в возвращаемом кортеже (None, если выстрела не было)
+COUNTED_METHODS = {"GameLogic.player_shoot": 0, "GameLogic.computer_shoot": 2}
+
+# Метод выбора хода, измеряемый у всех стратегий из strategies.STRATEGIES
+STRATEGY_METHOD = "get_next_shot"
+
+# Корзины гистограммы: от HISTOGRAM_MIN секунд, BUCKETS_PER_DECADE на порядок
+HISTOGRAM_MIN = 1e-7
+BUCKETS_PER_DECADE = 20
+HISTOGRAM_BUCKETS = 9 * BUCKETS_PER_DECADE
+
+
+class Histogram:
+    """Гистограмма длительностей с логарифмическими корзинами фиксированного числа"""
+
+    def __init__(self):
+        """Инициализация пустой гистограммы"""
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, seconds):
+        """
+        Учет одной длительности
+
+        Args:
+            seconds (float): Длительность в секундах
+        """
+        if seconds > HISTOGRAM_MIN:
+            index = int(math.log10(seconds / HISTOGRAM_MIN) * BUCKETS_PER_DECADE)
+            index = min(index, HISTOGRAM_BUCKETS - 1)
+        else:
+            index = 0
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q):
+        """
+        Перцентиль по методу ближайшего ранга с точностью до корзины
+
+        Args:
+            q (float): Уровень от 0 до 100
+
+        Returns:
+            float: Середина корзины (в логарифмической шкале), в пределах
+                   наименьшего и наибольшего значения; None без данных
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * q / 100))
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                break
+        value = HISTOGRAM_MIN * 10 ** ((index + 0.5) / BUCKETS_PER_DECADE)
+        return min(max(value, self.min), self.max)
+
+
+class Metrics:
+    """Таймеры и счетчики операций"""
+
+    def __init__(self):
+        """Инициализация пустого набора измерений"""
+        self.timings = {}
+        self.counters = {}
+        self.patched = []
+
+    @property
+    def enabled(self):
+        """Включено ли измерение методов"""
+        return bool(self.patched)
+
+    def record(self, name, seconds):
+        """
+        Запись длительности одного вызова
+
+        Args:
+            name (str): Имя операции
+            seconds (float): Длительность в секундах
+        """
+        histogram = self.timings.get(name)
+        if histogram is None:
+            histogram = self.timings[name] = Histogram()
+        histogram.add(seconds)
+
+    def count(self, name, value=1):
+        """
+        Увеличение счетчика
+
+        Args:
+            name (str): Имя счетчика
+            value (int): Приращение
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def timed(self, name, method, result_index=None):
+        """
+        Обертка метода, записывающая длительность каждого вызова
+
+        Args:
+            name (str): Имя операции
+            method (callable): Исходный метод
+            result_index (int): Номер результата выстрела в возвращаемом
+                                кортеже (см. COUNTED_METHODS); None - не считать
+        """
+        record = self.record
+        count = self.count
+        clock = time.perf_counter
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                value = method(*args, **kwargs)
+            finally:
+                record(name, clock() - start)
+            if (result_index is not None and isinstance(value, tuple)
+                    and len(value) > result_index and value[result_index] is not None):
+                count(f"{name}.{value[result_index]}")
+            return value
+        return wrapper
+
+    def timed_outer(self, name, method, depth):
+        """
+        Обертка, измеряющая только внешний вызов группы методов
+
+        Стратегии вызывают друг друга (super() или вложенный ИИ), и
+        вложенный вызов уже входит во время внешнего, поэтому не пишется.
+
+        Args:
+            name (str): Имя операции
+            method (callable): Исходный метод
+            depth (list): Общий для группы счетчик вложенности из одного элемента
+        """
+        timed = self.timed(name, method)
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if depth[0]:
+                return method(*args, **kwargs)
+            depth[0] += 1
+            try:
+                return timed(*args, **kwargs)
+            finally:
+                depth[0] -= 1
+        return wrapper
+
+    def patch(self, cls, method_name, wrapper):
+        """Подмена метода класса с запоминанием исходного"""
+        self.patched.append((cls, method_name, cls.__dict__[method_name]))
+        setattr(cls, method_name, wrapper)
+
+    def enable(self, targets=None):
+        """
+        Включение измерения методов
+
+        Args:
+            targets (list): Тройки (модуль, класс, метод); по умолчанию DEFAULT_TARGETS
+        """
+        if self.enabled:
+            return
+        for module_name, class_name, method_name in targets or DEFAULT_TARGETS:
+            if module_name in UI_MODULES and module_name not in sys.modules:
+                continue
+            cls = getattr(importlib.import_module(module_name), class_name)
+            name = f"{class_name}.{method_name}"
+            self.patch(cls, method_name,
+                       self.timed(name, cls.__dict__[method_name], COUNTED_METHODS.get(name)))
+
+        # Выбор хода каждой стратегии; наследники без своего метода
+        # учитываются под именем класса, где метод определен
+        strategies = importlib.import_module("game.strategies").STRATEGIES
+        depth = [0]
+        classes = []
+        for strategy in strategies.values():
+            for cls in getattr(strategy.factory, "__mro__", ()):
+                if STRATEGY_METHOD in cls.__dict__ and cls not in classes:
+                    classes.append(cls)
+        for cls in classes:
+            self.patch(cls, STRATEGY_METHOD,
+                       self.timed_outer(f"{cls.__name__}.{STRATEGY_METHOD}",
+                                        cls.__dict__[STRATEGY_METHOD], depth))
+
+    def disable(self):
+        """Возврат исходных методов; собранные данные сохраняются"""
+        for cls, method_name, original in reversed(self.patched):
+            setattr(cls, method_name, original)
+        self.patched = []
+
+    def reset(self):
+        """Удаление собранных данных"""
+        self.timings = {}
+        self.counters = {}
+
+    def summary(self):
+        """
+        Сводка по операциям
+
+        Returns:
+            dict: Имя операции -> число вызовов, суммарное и среднее время,
+                  p50, p95, p99 и максимум (в секундах)
+        """
+        result = {}
+        for name, histogram in self.timings.items():
+            result[name] = {
+                "count": histogram.count,
+                "total": histogram.total,
+                "mean": histogram.total / histogram.count,
+                "p50": histogram.percentile(50),
+                "p95": histogram.percentile(95),
+                "p99": histogram.percentile(99),
+                "max": histogram.max,
+            }
+        return result
+
+    def to_json(self, path=None):
+        """
+        Выгрузка сводки и счетчиков в JSON
+
+        Args:
+            path (str): Путь к файлу; если не указан, возвращается строка
+
+        Returns:
+            str: JSON, если path не указан
+        """
+        text = json.dumps({"timings": self.summary(), "counters": self.counters}, indent=2)
+        if path is None:
+            return text
+        with open(path, "w") as f:
+            f.write(text)
+        return None
+
+    def to_csv(self, path):
+        """
+        Выгрузка сводки в CSV: строка на операцию, времена в микросекундах
+
+        Args:
+            path (str): Путь к файлу
+        """
+        columns = ["count", "total", "mean", "p50", "p95", "p99", "max"]
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["operation"] + columns)
+            for name, stats in sorted(self.summary().items()):
+                row = [stats["count"]] + [round(stats[c] * 1e6, 3) for c in columns[1:]]
+                writer.writerow([name] + row)
+            for name, value in sorted(self.counters.items()):
+                writer.writerow([name, value] + [""] * (len(columns) - 1))
+
+
+METRICS = Metrics()
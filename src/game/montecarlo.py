@@ -0,0 +1,201 @@
+"""
+ИИ на основе случайных выборок флотов (метод Монте-Карло)
+
+Вместо точного подсчета позиций отдельных кораблей генерируются
+случайные полные расстановки оставшегося флота, согласованные со всем,
+что известно о поле: промахами, попаданиями, потопленными кораблями и
+зонами вокруг них. По принятым расстановкам строится карта вероятности
+попадания, и выстрел делается в самую вероятную неизвестную клетку.
+Выборки можно распределить по процессам concurrent.futures.
+"""
+
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from .density import DensityAI
+from .masks import board_masks, counter_add, counter_argmax, mask_cells
+from .placement import PlacementError, generate_fleet, get_placement_table
+
+
+# Предел шагов генератора на одну выборку: тупиковые выборки отбрасываются
+SAMPLE_MAX_STEPS = 200
+
+
+def sample_fleet(size, sizes, blocked, hits, allow_touching, rng):
+    """
+    Одна случайная расстановка оставшихся кораблей, согласованная с наблюдениями
+
+    Сначала корабли ставятся через еще не покрытые попадания, затем
+    остальные корабли расставляются генератором с откатом.
+
+    Args:
+        size (int): Размер поля
+        sizes (list): Размеры оставшихся кораблей
+        blocked (int): Маска клеток, где кораблей быть не может
+        hits (int): Маска попаданий в еще не потопленные корабли
+        allow_touching (bool): Разрешено ли кораблям касаться друг друга
+        rng (random.Random): Источник случайных чисел
+
+    Returns:
+        int: Маска клеток всех кораблей или None, если выборка отброшена
+    """
+    table = get_placement_table(size)
+    sizes = list(sizes)
+    fleet = 0
+    uncovered = hits
+
+    while uncovered:
+        x, y = rng.choice(mask_cells(uncovered, size))
+        cell = y * size + x
+        options = []
+        for ship_size in set(sizes):
+            placements = table.placements(ship_size)
+            for number in table.covering(ship_size)[cell]:
+                placement = placements[number]
+                if ship_size == 1 and not placement.horizontal:
+                    continue
+                if not placement.mask & blocked:
+                    options.append(placement)
+        if not options:
+            return None
+
+        placement = rng.choice(options)
+        # Целиком подбитый корабль был бы уже потоплен
+        if not placement.mask & ~hits:
+            return None
+
+        sizes.remove(placement.size)
+        fleet |= placement.mask
+        blocked |= placement.mask if allow_touching else placement.halo
+        uncovered &= ~placement.mask
+
+    if sizes:
+        try:
+            ships = generate_fleet(size, list(Counter(sizes).items()), blocked, rng,
+                                   allow_touching, max_steps=SAMPLE_MAX_STEPS, restarts=1)
+        except PlacementError:
+            return None
+        if ships is None:
+            return None
+        for ship in ships:
+            fleet |= table.get_for_ship(ship).mask
+    return fleet
+
+
+def sample_heat(size, sizes, blocked, hits, allow_touching, samples, seed):
+    """
+    Карта частоты кораблей по клеткам для серии выборок
+
+    Функция верхнего уровня, чтобы ее можно было выполнять в пуле процессов.
+
+    Args:
+        size (int): Размер поля
+        sizes (list): Размеры оставшихся кораблей
+        blocked (int): Маска клеток, где кораблей быть не может
+        hits (int): Маска попаданий в еще не потопленные корабли
+        allow_touching (bool): Разрешено ли кораблям касаться друг друга
+        samples (int): Число выборок
+        seed (int): Зерно генератора случайных чисел
+
+    Returns:
+        tuple: (побитовый счетчик по клеткам, число принятых выборок)
+    """
+    rng = random.Random(seed)
+    planes = []
+    accepted = 0
+    for _ in range(samples):
+        fleet = sample_fleet(size, sizes, blocked, hits, allow_touching, rng)
+        if fleet is not None:
+            counter_add(planes, fleet)
+            accepted += 1
+    return planes, accepted
+
+
+class MonteCarloAI(DensityAI):
+    """ИИ, оценивающий вероятность попадания по случайным согласованным флотам"""
+
+    def __init__(self, board, samples=2000, workers=None, cache=None, rng=random):
+        """
+        Инициализация ИИ
+
+        Args:
+            board (Board): Игровое поле противника (берутся только размер и правила)
+            samples (int): Число выборок на ход
+            workers (int): Число процессов; None или 1 - выборки в текущем процессе
+            cache (DecisionCache): Общий кэш лучших клеток по состояниям (необязательно);
+                в одинаковом состоянии оценка по выборкам не пересчитывается
+            rng: Источник случайных чисел (модуль random или random.Random)
+        """
+        super().__init__(board, cache=cache, rng=rng)
+        self.samples = samples
+        self.workers = workers
+        self.executor = None
+        self.last_accepted = 0
+
+    def remaining_sizes(self):
+        """Размеры оставшихся кораблей"""
+        sizes = []
+        for ship_size, count in self.remaining.items():
+            sizes.extend([ship_size] * count)
+        return sizes
+
+    def sample(self, samples):
+        """
+        Выборки флотов, при необходимости в пуле процессов
+
+        Args:
+            samples (int): Общее число выборок
+
+        Returns:
+            tuple: (побитовый счетчик по клеткам, число принятых выборок)
+        """
+        args = (self.size, self.remaining_sizes(), self.blocked_mask, self.hit_mask,
+                self.rules.allow_touching)
+
+        if not self.workers or self.workers <= 1:
+            return sample_heat(*args, samples, self.rng.getrandbits(64))
+
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+
+        chunk, extra = divmod(samples, self.workers)
+        futures = [self.executor.submit(sample_heat, *args, chunk + (i < extra),
+                                        self.rng.getrandbits(64))
+                   for i in range(self.workers)]
+
+        planes = []
+        accepted = 0
+        for future in futures:
+            part, count = future.result()
+            for level, plane in enumerate(part):
+                counter_add(planes, plane, 1 << level)
+            accepted += count
+        return planes, accepted
+
+    def get_next_shot(self):
+        """Получить координаты следующего выстрела"""
+        full = board_masks(self.size)[0]
+        unknown = full & ~(self.miss_mask | self.hit_mask | self.sunk_mask | self.blocked_mask)
+
+        key = None
+        best = None
+        if self.cache is not None:
+            key = ("montecarlo", self.rules.key(), self.samples) + self.cache_key()
+            best = self.cache.get(key)
+
+        if best is None:
+            planes, self.last_accepted = self.sample(self.samples)
+            best = counter_argmax(planes, unknown) if self.last_accepted else 0
+            if key is not None and best:
+                self.cache.put(key, best)
+        if not best:
+            # Ни одна выборка не подошла: точный подсчет позиций
+            return super().get_next_shot()
+        return self.rng.choice(mask_cells(best, self.size))
+
+    def close(self):
+        """Остановка пула процессов"""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
@@ -0,0 +1,187 @@
+"""
+Наблюдение стреляющей стороны за полем противника
+
+ИИ видит только результаты своих выстрелов и сообщения о потопленных
+кораблях, но не само поле. Наблюдение хранится битовыми масками и
+сериализуется в несколько десятков байт, поэтому ИИ можно вести
+короткими сообщениями в другом процессе и кэшировать решения по ключу.
+"""
+
+from .cells import HIT, MISS, Cell
+from .masks import board_masks
+
+
+class Observation:
+    """Известные результаты выстрелов по полю противника"""
+
+    def __init__(self, size=10):
+        """
+        Инициализация пустого наблюдения
+
+        Args:
+            size (int): Размер поля
+        """
+        self.size = size
+        self.miss_mask = 0
+        self.hit_mask = 0
+        self.sunk_mask = 0
+        self.sunk = []
+
+    @property
+    def shot_mask(self):
+        """Маска всех клеток, по которым уже стреляли"""
+        return self.miss_mask | self.hit_mask | self.sunk_mask
+
+    def cell(self, x, y):
+        """
+        Известное состояние клетки
+
+        Returns:
+            Cell: MISS, HIT, DESTROYED или EMPTY для неизвестной клетки
+        """
+        bit = 1 << (y * self.size + x)
+        if self.miss_mask & bit:
+            return Cell.MISS
+        if self.hit_mask & bit:
+            return Cell.HIT
+        if self.sunk_mask & bit:
+            return Cell.DESTROYED
+        return Cell.EMPTY
+
+    def record(self, x, y, result, sunk_cells=None):
+        """
+        Учет результата выстрела
+
+        Args:
+            x (int): X координата
+            y (int): Y координата
+            result (str): Результат выстрела ("miss", "hit", "destroyed")
+            sunk_cells (list): Клетки потопленного корабля; если не указаны,
+                корабль восстанавливается по связной группе попаданий
+
+        Returns:
+            int: Маска потопленного корабля или 0
+        """
+        bit = 1 << (y * self.size + x)
+        if result == "miss":
+            self.miss_mask |= bit
+            return 0
+        if result not in ("hit", "destroyed"):
+            return 0
+
+        self.hit_mask |= bit
+        if result == "hit":
+            return 0
+
+        if sunk_cells is not None:
+            ship = 0
+            for sx, sy in sunk_cells:
+                ship |= 1 << (sy * self.size + sx)
+        else:
+            ship = self.connected_hits(bit)
+
+        self.hit_mask &= ~ship
+        self.sunk_mask |= ship
+        self.sunk.append(ship)
+        return ship
+
+    def connected_hits(self, mask):
+        """Группа попаданий, связанная с маской по сторонам клеток"""
+        size = self.size
+        _, not_left, not_right = board_masks(size)
+        group = mask & self.hit_mask
+        while True:
+            grown = group | group << size | group >> size
+            grown |= (group << 1) & not_left | (group >> 1) & not_right
+            grown &= self.hit_mask
+            if grown == group:
+                return group
+            group = grown
+
+    def sunk_sizes(self):
+        """Размеры потопленных кораблей в порядке потопления"""
+        return [bin(ship).count("1") for ship in self.sunk]
+
+    def key(self):
+        """Кортеж, однозначно задающий наблюдение (для кэшей и сравнения)"""
+        return (self.size, self.miss_mask, self.hit_mask, tuple(sorted(self.sunk)))
+
+    def copy(self):
+        """Независимая копия наблюдения"""
+        other = Observation(self.size)
+        other.miss_mask = self.miss_mask
+        other.hit_mask = self.hit_mask
+        other.sunk_mask = self.sunk_mask
+        other.sunk = list(self.sunk)
+        return other
+
+    def to_bytes(self):
+        """
+        Компактная сериализация
+
+        Формат: размер поля, число потопленных кораблей, затем маски
+        промахов, попаданий и каждого потопленного корабля фиксированной
+        длины в порядке little-endian.
+
+        Returns:
+            bytes: Сериализованное наблюдение
+        """
+        length = (self.size * self.size + 7) // 8
+        parts = [bytes((self.size, len(self.sunk)))]
+        for mask in [self.miss_mask, self.hit_mask] + self.sunk:
+            parts.append(mask.to_bytes(length, "little"))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Восстановление наблюдения, сериализованного to_bytes
+
+        Args:
+            data (bytes): Сериализованное наблюдение
+
+        Returns:
+            Observation: Наблюдение
+        """
+        size, count = data[0], data[1]
+        length = (size * size + 7) // 8
+        if len(data) != 2 + length * (2 + count):
+            raise ValueError("Неверная длина сериализованного наблюдения")
+
+        masks = [int.from_bytes(data[2 + i * length:2 + (i + 1) * length], "little")
+                 for i in range(2 + count)]
+        observation = cls(size)
+        observation.miss_mask, observation.hit_mask = masks[0], masks[1]
+        observation.sunk = masks[2:]
+        for ship in observation.sunk:
+            observation.sunk_mask |= ship
+        return observation
+
+    @classmethod
+    def from_board(cls, board):
+        """
+        Наблюдение, соответствующее уже сделанным выстрелам по полю
+
+        Args:
+            board (Board): Поле, по которому стреляли
+
+        Returns:
+            Observation: Наблюдение без сведений о нетронутых кораблях
+        """
+        observation = cls(board.size)
+        for y in range(board.size):
+            for x in range(board.size):
+                state = board.grid[y][x]
+                if state == MISS:
+                    observation.miss_mask |= 1 << (y * board.size + x)
+                elif state == HIT:
+                    observation.hit_mask |= 1 << (y * board.size + x)
+
+        for ship in board.ships:
+            if ship.is_destroyed():
+                mask = 0
+                for x, y in ship.cells:
+                    mask |= 1 << (y * board.size + x)
+                observation.sunk.append(mask)
+                observation.sunk_mask |= mask
+        return observation
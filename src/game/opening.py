@@ -0,0 +1,156 @@
+"""
+Дебютная книга: заранее вычисленные первые выстрелы ИИ
+
+Пока ИИ не попал ни разу, его наблюдение состоит только из промахов
+по его же предыдущим выстрелам, и детерминированная стратегия
+выбирает одну и ту же последовательность клеток в каждой партии.
+Эта последовательность вычисляется заранее для каждого размера поля и
+хранится в компактном двоичном файле рядом с модулем. ИИ берет выстрелы
+из книги до первого попадания, а дальше продолжает своей логикой.
+
+Формат файла: сигнатура OPENINGS_MAGIC, число книг (uint16), затем для
+каждой книги длина имени (uint8), имя стратегии в ASCII, размер поля
+(uint8), число выстрелов (uint16) и номера клеток (uint16, y * N + x).
+Все числа в порядке little-endian.
+
+Книгу нужно пересобрать после изменения эвристики стратегии:
+python -m game.opening
+"""
+
+import os
+import struct
+
+from .rules import Rules
+
+OPENINGS_MAGIC = b"SBOB1"
+OPENINGS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "openings.bin")
+
+# Размеры полей, для которых книга поставляется с игрой
+OPENING_SIZES = range(5, 16)
+
+_OPENINGS = None
+
+
+def save_openings(openings, path=OPENINGS_PATH):
+    """
+    Запись книг в файл
+
+    Args:
+        openings (dict): (имя стратегии, размер поля) -> кортеж номеров клеток
+        path (str): Путь к файлу
+    """
+    parts = [OPENINGS_MAGIC, struct.pack("<H", len(openings))]
+    for (name, size), shots in sorted(openings.items()):
+        encoded = name.encode("ascii")
+        parts.append(struct.pack("<B", len(encoded)))
+        parts.append(encoded)
+        parts.append(struct.pack("<BH", size, len(shots)))
+        parts.append(struct.pack(f"<{len(shots)}H", *shots))
+
+    with open(path, "wb") as f:
+        f.write(b"".join(parts))
+
+
+def load_openings(path=OPENINGS_PATH):
+    """
+    Чтение книг из файла
+
+    Args:
+        path (str): Путь к файлу
+
+    Returns:
+        dict: (имя стратегии, размер поля) -> кортеж номеров клеток
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(OPENINGS_MAGIC):
+        raise ValueError(f"Файл {path} не является дебютной книгой")
+
+    offset = len(OPENINGS_MAGIC)
+    (count,) = struct.unpack_from("<H", data, offset)
+    offset += 2
+
+    openings = {}
+    for _ in range(count):
+        (length,) = struct.unpack_from("<B", data, offset)
+        offset += 1
+        name = data[offset:offset + length].decode("ascii")
+        offset += length
+        size, total = struct.unpack_from("<BH", data, offset)
+        offset += 3
+        openings[(name, size)] = struct.unpack_from(f"<{total}H", data, offset)
+        offset += 2 * total
+    return openings
+
+
+def get_opening(name, size):
+    """
+    Книга стратегии для поля заданного размера
+
+    Файл читается один раз при первом обращении. Если файла нет,
+    ИИ просто работает без книги.
+
+    Args:
+        name (str): Имя стратегии
+        size (int): Размер поля
+
+    Returns:
+        tuple: Номера клеток первых выстрелов или None
+    """
+    global _OPENINGS
+    if _OPENINGS is None:
+        try:
+            _OPENINGS = load_openings()
+        except (OSError, ValueError, struct.error):
+            _OPENINGS = {}
+    return _OPENINGS.get((name, size))
+
+
+def build_opening(make_ai, size, length=None):
+    """
+    Последовательность выстрелов стратегии, пока все выстрелы - промахи
+
+    Пока все выстрелы - промахи, флот на выбор клетки не влияет, поэтому
+    ИИ получает правила с одним однопалубным кораблем: они допустимы на
+    поле любого размера, и книга строится и для полей, на которых
+    стандартный флот не помещается.
+
+    Args:
+        make_ai (callable): Создает ИИ по правилам Rules, без книги
+        size (int): Размер поля
+        length (int): Число выстрелов (по умолчанию все клетки поля)
+
+    Returns:
+        tuple: Номера клеток выстрелов
+    """
+    ai = make_ai(Rules(size, [(1, 1)]))
+    shots = []
+    for _ in range(size * size if length is None else length):
+        x, y = ai.get_next_shot()
+        ai.register_shot(x, y, "miss")
+        shots.append(y * size + x)
+    return tuple(shots)
+
+
+def build_openings():
+    """
+    Книги, поставляемые с игрой
+
+    Returns:
+        dict: (имя стратегии, размер поля) -> кортеж номеров клеток
+    """
+    from .board import SmartAI
+
+    return {("smart", size): build_opening(lambda rules: SmartAI(rules, opening=False), size)
+            for size in OPENING_SIZES}
+
+
+def main():
+    """Пересборка книги, поставляемой с игрой"""
+    openings = build_openings()
+    save_openings(openings)
+    print(f"Записано книг: {len(openings)} ({OPENINGS_PATH})")
+
+
+if __name__ == "__main__":
+    main()
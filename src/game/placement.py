@@ -0,0 +1,403 @@
+"""
+Таблица допустимых позиций кораблей и генератор случайной расстановки
+
+Для каждого размера поля строится (лениво, по размерам кораблей)
+таблица всех позиций корабля с маской его клеток и маской запретной
+зоны вокруг него. Проверка размещения, подсчет вероятностей ИИ и
+случайная расстановка флота используют одну и ту же таблицу.
+
+Генератор расстановки выбирает корабль равновероятно из множества
+допустимых на текущий момент позиций. Множество хранится как битовая
+маска свободных якорей (левая/верхняя клетка корабля) для каждой
+ориентации и пересчитывается сдвигами после каждого корабля. Если
+очередной корабль поставить некуда, генератор откатывается назад, а
+слишком долгий поиск начинается заново (см. generate_fleet).
+"""
+
+import os
+import pickle
+import random
+from collections import namedtuple
+
+from .cells import Ship
+from .masks import board_masks
+from .rules import STANDARD_FLEET
+
+# Число попыток прямого выбора якоря перед построением списка позиций
+_DIRECT_TRIES = 8
+
+# Бюджет генератора расстановки: шагов на попытку и число попыток
+FLEET_MAX_STEPS = 2000
+FLEET_RESTARTS = 25
+
+# Признак попытки, не уложившейся в предел шагов
+_OUT_OF_STEPS = object()
+
+_TABLES = {}
+
+
+Placement = namedtuple("Placement", ["size", "x", "y", "horizontal", "cells",
+                                     "mask", "halo", "halo_cells"])
+Placement.__doc__ = """Позиция корабля: клетки, маска клеток и маска запретной зоны"""
+
+
+class PlacementTable:
+    """Все позиции кораблей на поле заданного размера"""
+
+    def __init__(self, size):
+        """
+        Инициализация таблицы
+
+        Args:
+            size (int): Размер поля
+        """
+        self.size = size
+        self._placements = {}
+        self._by_anchor = {}
+        self._anchors = {}
+        self._covering = {}
+
+    def _build(self, ship_size):
+        """
+        Построение позиций кораблей одного размера
+
+        Запретная зона корабля - прямоугольник из его клеток и соседей,
+        обрезанный краями поля, поэтому ее клетки и маска строятся по
+        границам прямоугольника, без обхода всего поля.
+        """
+        size = self.size
+        placements = []
+        by_anchor = [None] * (2 * size * size)
+        horizontal_anchors = 0
+        vertical_anchors = 0
+        line = (1 << ship_size) - 1
+        column = 0
+        for i in range(ship_size):
+            column |= 1 << (i * size)
+
+        for y in range(size):
+            for x in range(size):
+                index = y * size + x
+                for horizontal in (True, False):
+                    if horizontal and x + ship_size > size:
+                        continue
+                    if not horizontal and y + ship_size > size:
+                        continue
+
+                    if horizontal:
+                        cells = tuple((x + i, y) for i in range(ship_size))
+                        mask = line << index
+                        right, bottom = x + ship_size, y + 1
+                        horizontal_anchors |= 1 << index
+                    else:
+                        cells = tuple((x, y + i) for i in range(ship_size))
+                        mask = column << index
+                        right, bottom = x + 1, y + ship_size
+                        vertical_anchors |= 1 << index
+
+                    left, top = max(x - 1, 0), max(y - 1, 0)
+                    right, bottom = min(right, size - 1), min(bottom, size - 1)
+                    halo_cells = tuple((cx, cy) for cy in range(top, bottom + 1)
+                                       for cx in range(left, right + 1))
+                    run = (1 << (right - left + 1)) - 1
+                    halo = 0
+                    for row in range(bottom - top + 1):
+                        halo |= run << (row * size)
+                    halo <<= top * size + left
+
+                    placement = Placement(ship_size, x, y, horizontal, cells,
+                                          mask, halo, halo_cells)
+                    placements.append(placement)
+                    by_anchor[2 * index + (0 if horizontal else 1)] = placement
+
+        self._placements[ship_size] = placements
+        self._by_anchor[ship_size] = by_anchor
+        self._anchors[ship_size] = (horizontal_anchors, vertical_anchors)
+
+    def placements(self, ship_size):
+        """
+        Все позиции корабля заданного размера
+
+        Args:
+            ship_size (int): Размер корабля
+
+        Returns:
+            list: Список Placement
+        """
+        if ship_size not in self._placements:
+            self._build(ship_size)
+        return self._placements[ship_size]
+
+    def covering(self, ship_size):
+        """
+        Позиции, покрывающие каждую клетку
+
+        Args:
+            ship_size (int): Размер корабля
+
+        Returns:
+            list: Для каждого номера клетки - кортеж номеров позиций в placements(ship_size)
+        """
+        covering = self._covering.get(ship_size)
+        if covering is None:
+            cells = [[] for _ in range(self.size * self.size)]
+            for number, placement in enumerate(self.placements(ship_size)):
+                for x, y in placement.cells:
+                    cells[y * self.size + x].append(number)
+            covering = [tuple(numbers) for numbers in cells]
+            self._covering[ship_size] = covering
+        return covering
+
+    def get(self, ship_size, x, y, horizontal):
+        """
+        Позиция корабля по координатам начала
+
+        Args:
+            ship_size (int): Размер корабля
+            x (int): X координата начала
+            y (int): Y координата начала
+            horizontal (bool): True если горизонтальный
+
+        Returns:
+            Placement: Позиция или None, если корабль выходит за поле
+        """
+        if not (0 <= x < self.size and 0 <= y < self.size):
+            return None
+        if ship_size not in self._by_anchor:
+            self._build(ship_size)
+        return self._by_anchor[ship_size][2 * (y * self.size + x) + (0 if horizontal else 1)]
+
+    def get_for_ship(self, ship):
+        """Позиция, занимаемая кораблем Ship"""
+        return self.get(ship.size, ship.x, ship.y, ship.horizontal)
+
+    def anchors(self, ship_size):
+        """
+        Маски якорей, из которых корабль помещается в поле
+
+        Args:
+            ship_size (int): Размер корабля
+
+        Returns:
+            tuple: (якоря горизонтального корабля, якоря вертикального корабля)
+        """
+        if ship_size not in self._anchors:
+            self._build(ship_size)
+        return self._anchors[ship_size]
+
+    def save(self, path):
+        """
+        Сохранение построенных позиций на диск
+
+        Args:
+            path (str): Путь к файлу кэша
+        """
+        with open(path, "wb") as f:
+            pickle.dump((self.size, self._placements, self._anchors), f)
+
+    def load(self, path):
+        """
+        Загрузка позиций, сохраненных методом save
+
+        Args:
+            path (str): Путь к файлу кэша
+
+        Returns:
+            bool: True если кэш подходит к размеру поля и загружен
+        """
+        with open(path, "rb") as f:
+            size, placements, anchors = pickle.load(f)
+        if size != self.size:
+            return False
+
+        for ship_size, items in placements.items():
+            by_anchor = [None] * (2 * size * size)
+            for placement in items:
+                index = placement.y * size + placement.x
+                by_anchor[2 * index + (0 if placement.horizontal else 1)] = placement
+            self._placements[ship_size] = items
+            self._by_anchor[ship_size] = by_anchor
+        self._anchors.update(anchors)
+        return True
+
+
+def get_placement_table(size=10, cache_dir=None):
+    """
+    Общая таблица позиций для поля заданного размера
+
+    Таблица создается один раз на процесс. Если указан cache_dir,
+    при первом обращении она загружается из файла, а при отсутствии
+    файла строится для всех размеров стандартного флота и сохраняется.
+
+    Args:
+        size (int): Размер поля
+        cache_dir (str): Каталог для кэша на диске (необязательно)
+
+    Returns:
+        PlacementTable: Таблица позиций
+    """
+    table = _TABLES.get(size)
+    if table is not None:
+        return table
+
+    table = PlacementTable(size)
+    if cache_dir is not None:
+        path = os.path.join(cache_dir, f"placements_{size}.pickle")
+        if not (os.path.exists(path) and table.load(path)):
+            for ship_size, _ in STANDARD_FLEET:
+                if ship_size <= size:
+                    table.placements(ship_size)
+            os.makedirs(cache_dir, exist_ok=True)
+            table.save(path)
+
+    _TABLES[size] = table
+    return table
+
+
+def free_anchors(size, ship_size, blocked):
+    """
+    Якоря, из которых корабль можно поставить, не задев занятые клетки
+
+    Args:
+        size (int): Размер поля
+        ship_size (int): Размер корабля
+        blocked (int): Маска клеток, запрещенных для размещения
+
+    Returns:
+        tuple: (маска горизонтальных якорей, маска вертикальных якорей)
+    """
+    free = board_masks(size)[0] & ~blocked
+    horizontal, vertical = get_placement_table(size).anchors(ship_size)
+    for i in range(ship_size):
+        horizontal &= free >> i
+        vertical &= free >> (i * size)
+    return horizontal, vertical
+
+
+def _bit_indexes(mask):
+    """Номера установленных битов маски"""
+    return [i for i, bit in enumerate(reversed(bin(mask)[2:])) if bit == "1"]
+
+
+def _pick_anchor(size, horizontal, vertical, rng):
+    """
+    Равновероятный выбор якоря из двух масок
+
+    Сначала несколько раз пробуется случайная клетка (это дешево, пока
+    свободных позиций много), затем выбор идет по явному списку позиций.
+
+    Returns:
+        tuple: (номер клетки якоря, горизонтальность)
+    """
+    cells = size * size
+    for _ in range(_DIRECT_TRIES):
+        index = rng.randrange(2 * cells)
+        if index < cells:
+            if horizontal >> index & 1:
+                return index, True
+        elif vertical >> (index - cells) & 1:
+            return index - cells, False
+
+    candidates = [(index, True) for index in _bit_indexes(horizontal)]
+    candidates.extend((index, False) for index in _bit_indexes(vertical))
+    return candidates[rng.randrange(len(candidates))]
+
+
+class PlacementError(RuntimeError):
+    """Расстановка флота не найдена за отведенное число шагов"""
+
+
+def generate_fleet(size=10, fleet=None, blocked=0, rng=random, allow_touching=False,
+                   max_steps=FLEET_MAX_STEPS, restarts=FLEET_RESTARTS):
+    """
+    Случайная расстановка флота с откатом и перезапусками
+
+    Корабли ставятся от больших к меньшим, каждый выбирается
+    равновероятно среди допустимых позиций. При тупике генератор
+    возвращается к предыдущему кораблю и пробует другую позицию.
+    Попытка ограничена max_steps шагами; если она не уложилась, поиск
+    начинается заново с другими случайными позициями. Поэтому время
+    генерации ограничено max_steps * restarts шагами при любом флоте;
+    если ни одна попытка не уложилась, выбрасывается PlacementError.
+
+    Args:
+        size (int): Размер поля
+        fleet (list): Пары (размер корабля, количество), по умолчанию стандартный флот
+        blocked (int): Маска клеток, уже запрещенных для размещения
+        rng: Источник случайных чисел (модуль random или random.Random)
+        allow_touching (bool): Разрешено ли кораблям касаться друг друга
+        max_steps (int): Предел числа шагов одной попытки
+        restarts (int): Число попыток
+
+    Returns:
+        list: Список кораблей Ship или None, если поиск доказал,
+              что расстановки нет
+    """
+    if fleet is None:
+        fleet = STANDARD_FLEET
+
+    table = get_placement_table(size)
+    sizes = []
+    for ship_size, count in sorted(fleet, reverse=True):
+        sizes.extend([ship_size] * count)
+
+    for _ in range(restarts):
+        chosen = _search_fleet(table, sizes, blocked, rng, allow_touching, max_steps)
+        if chosen is None:
+            return None
+        if chosen is not _OUT_OF_STEPS:
+            return [Ship(p.size, p.x, p.y, p.horizontal) for p in chosen]
+
+    raise PlacementError(f"Не удалось расставить флот на поле {size}x{size}: "
+                         f"{restarts} попыток по {max_steps} шагов не дали расстановки")
+
+
+def _search_fleet(table, sizes, blocked, rng, allow_touching, max_steps):
+    """
+    Одна попытка поиска расстановки с откатом
+
+    Returns:
+        list: Позиции кораблей, None если расстановки нет,
+              или _OUT_OF_STEPS, если шаги закончились
+    """
+    size = table.size
+    # Для каждого уровня: непроверенные якоря и маска до установки корабля
+    stack = []
+    chosen = []
+    steps = 0
+    while len(chosen) < len(sizes):
+        steps += 1
+        if steps > max_steps:
+            return _OUT_OF_STEPS
+
+        level = len(chosen)
+        ship_size = sizes[level]
+
+        if len(stack) == level:
+            horizontal, vertical = free_anchors(size, ship_size, blocked)
+            if ship_size == 1:
+                vertical = 0
+            stack.append([horizontal, vertical, blocked])
+
+        horizontal, vertical, blocked = stack[level]
+        if not (horizontal or vertical):
+            # Тупик: возвращаемся к предыдущему кораблю
+            stack.pop()
+            if not chosen:
+                return None
+            chosen.pop()
+            continue
+
+        index, is_horizontal = _pick_anchor(size, horizontal, vertical, rng)
+
+        # Выбранная позиция больше не рассматривается при откате
+        if is_horizontal:
+            stack[level][0] &= ~(1 << index)
+        else:
+            stack[level][1] &= ~(1 << index)
+
+        placement = table.get(ship_size, index % size, index // size, is_horizontal)
+        chosen.append(placement)
+        blocked |= placement.mask if allow_touching else placement.halo
+
+    return chosen
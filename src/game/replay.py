@@ -0,0 +1,509 @@
+"""
+Запись партий в компактный двоичный журнал и чтение через mmap
+
+Партия хранится как расстановки обоих флотов и последовательность
+выстрелов, по одному байту на выстрел (номер клетки y * N + x).
+Кто стрелял и каков результат, не записывается: это однозначно
+восстанавливается по флотам, так как после промаха ход переходит к
+сопернику. Сторона 0 стреляет первой (в GameLogic - игрок).
+
+Формат файла: сигнатура REPLAY_MAGIC, затем партии подряд. Партия:
+    заголовок: размер поля, число кораблей во флоте, флаги (по байту);
+    флоты сторон 0 и 1: на корабль два байта - номер клетки начала и
+        размер * 2 + признак горизонтального расположения;
+    выстрелы: по байту на выстрел;
+    END_OF_GAME - конец партии.
+Ни одно из значений, кроме END_OF_GAME, не бывает равно 0xFF, поэтому
+партия, оборванная закрытием программы, узнается по последнему байту.
+
+Файл только дописывается, и писатель ведет запись по ходу партии:
+отмена выстрела в игре отрезает последний байт. Читатель отображает
+файл в память и по индексу смещений партий дает доступ к любой партии
+и любому выстрелу без чтения остального файла.
+
+Для просмотра партии ReplayCursor хранит снимки состояния (стреляющая
+сторона и маски обстрелянных клеток обоих полей) через каждые
+SNAPSHOT_INTERVAL ходов, так что переход к любому ходу доигрывает не
+больше SNAPSHOT_INTERVAL - 1 выстрелов. Снимки строятся за один проход
+при открытии партии и в файл не пишутся, чтобы выстрелы оставались
+записями фиксированной длины.
+"""
+
+import mmap
+import os
+import struct
+
+from .cells import Cell, Ship
+from .observation import Observation
+from .placement import get_placement_table
+
+REPLAY_MAGIC = b"SBRP1"
+END_OF_GAME = 0xFF
+GAME_HEADER = struct.Struct("<BBB")
+FLAG_TOUCHING = 1
+
+# Номер клетки занимает байт, поэтому поле не больше 15x15
+MAX_REPLAY_SIZE = 15
+
+# Число ходов между снимками состояния при просмотре партии
+SNAPSHOT_INTERVAL = 16
+
+
+def encode_header(rules, fleets):
+    """
+    Заголовок партии и расстановки флотов
+
+    Args:
+        rules (Rules): Правила партии
+        fleets (tuple): Корабли стороны 0 и стороны 1
+
+    Returns:
+        bytes: Начало записи партии
+    """
+    size = rules.size
+    if size > MAX_REPLAY_SIZE:
+        raise ValueError(f"Запись партий поддерживает поле до {MAX_REPLAY_SIZE}x{MAX_REPLAY_SIZE}")
+    if len(fleets[0]) != len(fleets[1]):
+        raise ValueError("Флоты сторон различаются числом кораблей")
+
+    flags = FLAG_TOUCHING if rules.allow_touching else 0
+    parts = [GAME_HEADER.pack(size, len(fleets[0]), flags)]
+    for fleet in fleets:
+        for ship in fleet:
+            parts.append(bytes((ship.y * size + ship.x, ship.size * 2 + int(ship.horizontal))))
+    return b"".join(parts)
+
+
+def encode_game(rules, fleets, shots):
+    """
+    Запись законченной партии целиком
+
+    Args:
+        rules (Rules): Правила партии
+        fleets (tuple): Корабли стороны 0 и стороны 1
+        shots (list): Номера клеток выстрелов обеих сторон по порядку
+
+    Returns:
+        bytes: Запись партии для ReplayWriter.write_game
+    """
+    return encode_header(rules, fleets) + bytes(shots) + bytes((END_OF_GAME,))
+
+
+class ReplayWriter:
+    """Дописывание партий в файл журнала"""
+
+    def __init__(self, path):
+        """
+        Открытие файла журнала для дописывания
+
+        Если файл обрывается на незаконченной партии, она закрывается.
+
+        Args:
+            path (str): Путь к файлу; создается, если не существует
+        """
+        self.path = path
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self.file = open(path, "r+b")
+            if self.file.read(len(REPLAY_MAGIC)) != REPLAY_MAGIC:
+                self.file.close()
+                raise ValueError(f"Файл {path} не является журналом партий")
+            self.file.seek(-1, os.SEEK_END)
+            last = self.file.read(1)[0]
+            if self.file.tell() > len(REPLAY_MAGIC) and last != END_OF_GAME:
+                self.file.write(bytes((END_OF_GAME,)))
+        else:
+            self.file = open(path, "w+b")
+            self.file.write(REPLAY_MAGIC)
+
+        self.size = None
+        self.moves = 0
+
+    @property
+    def in_game(self):
+        """Идет ли запись партии"""
+        return self.size is not None
+
+    def begin_game(self, rules, fleets):
+        """
+        Начало записи новой партии; предыдущая партия закрывается
+
+        Args:
+            rules (Rules): Правила партии
+            fleets (tuple): Корабли стороны 0 (стреляет первой) и стороны 1
+        """
+        self.end_game()
+        self.file.write(encode_header(rules, fleets))
+        self.size = rules.size
+        self.moves = 0
+
+    def shot(self, x, y):
+        """Запись выстрела любой из сторон"""
+        self.file.write(bytes((y * self.size + x,)))
+        self.moves += 1
+
+    def undo_shot(self):
+        """Удаление последнего выстрела текущей партии"""
+        if not self.moves:
+            return
+        self.file.seek(-1, os.SEEK_END)
+        self.file.truncate()
+        self.moves -= 1
+
+    def end_game(self):
+        """Завершение записи текущей партии"""
+        if self.in_game:
+            self.file.write(bytes((END_OF_GAME,)))
+            self.size = None
+            self.moves = 0
+
+    def write_game(self, record):
+        """
+        Дописывание готовой записи партии
+
+        Args:
+            record (bytes): Запись из encode_game
+        """
+        self.end_game()
+        self.file.write(record)
+
+    def flush(self):
+        """Сброс буфера записи на диск"""
+        self.file.flush()
+
+    def close(self):
+        """Завершение текущей партии и закрытие файла"""
+        self.end_game()
+        self.file.close()
+
+
+class ReplayGame:
+    """Партия из журнала: флоты и доступ к выстрелам по номеру"""
+
+    def __init__(self, data, offset, end=None):
+        """
+        Разбор заголовка и флотов партии
+
+        Args:
+            data (mmap.mmap): Содержимое файла журнала
+            offset (int): Смещение начала партии
+            end (int): Смещение конца выстрелов из индекса (если не задано, ищется)
+        """
+        self.data = data
+        self.offset = offset
+        self.size, count, flags = GAME_HEADER.unpack_from(data, offset)
+        self.allow_touching = bool(flags & FLAG_TOUCHING)
+
+        position = offset + GAME_HEADER.size
+        fleets = []
+        for _ in range(2):
+            fleet = []
+            for _ in range(count):
+                cell, kind = data[position], data[position + 1]
+                fleet.append(Ship(kind // 2, cell % self.size, cell // self.size, bool(kind & 1)))
+                position += 2
+            fleets.append(tuple(fleet))
+        self.fleets = tuple(fleets)
+
+        self.shots_offset = position
+        if end is None:
+            end = data.find(bytes((END_OF_GAME,)), position)
+            if end < 0:
+                end = len(data)
+        self.finished = end < len(data)
+        self.move_count = end - position
+
+    def shot(self, move):
+        """
+        Клетка выстрела с заданным номером
+
+        Args:
+            move (int): Номер выстрела в партии, с 0
+
+        Returns:
+            tuple: Координаты (x, y)
+        """
+        if not 0 <= move < self.move_count:
+            raise IndexError(f"В партии нет выстрела {move}")
+        cell = self.data[self.shots_offset + move]
+        return cell % self.size, cell // self.size
+
+    def shots(self):
+        """Номера клеток всех выстрелов по порядку"""
+        return self.data[self.shots_offset:self.shots_offset + self.move_count]
+
+    def ship_owners(self):
+        """
+        Маски кораблей по клеткам для каждой стороны
+
+        Returns:
+            list: Для стороны 0 и 1 - словарь номер клетки -> маска корабля
+        """
+        table = get_placement_table(self.size)
+        owners = []
+        for fleet in self.fleets:
+            owner = {}
+            for ship in fleet:
+                mask = table.get_for_ship(ship).mask
+                for x, y in ship.cells:
+                    owner[y * self.size + x] = mask
+            owners.append(owner)
+        return owners
+
+    def moves(self):
+        """
+        Ход партии с восстановленными стрелявшей стороной и результатами
+
+        Returns:
+            list: Кортежи (сторона, x, y, результат "miss", "hit" или "destroyed")
+        """
+        owners = self.ship_owners()
+        hits = [0, 0]
+        side = 0
+        moves = []
+        for cell in self.shots():
+            target = 1 - side
+            ship = owners[target].get(cell)
+            if ship is None:
+                result = "miss"
+            else:
+                hits[target] |= 1 << cell
+                result = "hit" if ship & ~hits[target] else "destroyed"
+            moves.append((side, cell % self.size, cell // self.size, result))
+            if result == "miss":
+                side = target
+        return moves
+
+    def cursor(self, interval=SNAPSHOT_INTERVAL):
+        """Просмотр партии с переходом к любому ходу (ReplayCursor)"""
+        return ReplayCursor(self, interval)
+
+
+class ReplayCursor:
+    """
+    Позиция в партии из журнала с быстрым переходом к любому ходу
+
+    Состояние - сторона, которая стреляет следующей, и для каждой
+    стороны маска клеток ее поля, по которым стрелял соперник.
+    Попадания, промахи и потопленные корабли получаются из этих масок
+    и известных флотов, поэтому снимок состояния - три целых числа.
+    """
+
+    def __init__(self, game, interval=SNAPSHOT_INTERVAL):
+        """
+        Построение снимков состояния партии
+
+        Args:
+            game (ReplayGame): Партия из журнала
+            interval (int): Число ходов между снимками K
+        """
+        self.game = game
+        self.size = game.size
+        self.interval = interval
+        self.cells = game.shots()
+
+        table = get_placement_table(self.size)
+        self.ship_masks = [[table.get_for_ship(ship).mask for ship in fleet]
+                           for fleet in game.fleets]
+        self.fleet_masks = []
+        for masks in self.ship_masks:
+            fleet = 0
+            for mask in masks:
+                fleet |= mask
+            self.fleet_masks.append(fleet)
+
+        self.snapshots = []
+        self.restore((0, 0, 0), 0)
+        for move in range(len(self.cells) + 1):
+            if move % interval == 0:
+                self.snapshots.append((self.side, self.shot_masks[0], self.shot_masks[1]))
+            if move < len(self.cells):
+                self.apply(self.cells[move])
+        self.restore(self.snapshots[0], 0)
+
+    @property
+    def move_count(self):
+        """Число ходов в партии"""
+        return len(self.cells)
+
+    def restore(self, snapshot, move):
+        """Восстановление состояния из снимка, сделанного перед ходом move"""
+        self.side, first, second = snapshot
+        self.shot_masks = [first, second]
+        self.move = move
+
+    def apply(self, cell):
+        """Выстрел текущей стороны в клетку с номером cell"""
+        target = 1 - self.side
+        bit = 1 << cell
+        self.shot_masks[target] |= bit
+        if not self.fleet_masks[target] & bit:
+            self.side = target
+        self.move += 1
+
+    def seek(self, move):
+        """
+        Переход к состоянию после move ходов
+
+        Вперед в пределах того же промежутка между снимками позиция
+        доигрывается от текущей, в остальных случаях - от ближайшего
+        предыдущего снимка.
+
+        Args:
+            move (int): Число сделанных ходов (обрезается до 0..move_count)
+        """
+        move = max(0, min(move, len(self.cells)))
+        block = move // self.interval
+        if move < self.move or block > self.move // self.interval:
+            self.restore(self.snapshots[block], block * self.interval)
+        while self.move < move:
+            self.apply(self.cells[self.move])
+
+    def step(self, delta=1):
+        """Сдвиг на delta ходов вперед или назад"""
+        self.seek(self.move + delta)
+
+    def sunk_masks(self, side):
+        """Маски потопленных кораблей на поле стороны"""
+        shot = self.shot_masks[side]
+        return [mask for mask in self.ship_masks[side] if not mask & ~shot]
+
+    def observation(self, side):
+        """
+        Наблюдение соперника за полем стороны в текущей позиции
+
+        Returns:
+            Observation: Промахи, попадания и потопленные корабли
+        """
+        shot = self.shot_masks[side]
+        observation = Observation(self.size)
+        observation.miss_mask = shot & ~self.fleet_masks[side]
+        observation.sunk = self.sunk_masks(side)
+        for mask in observation.sunk:
+            observation.sunk_mask |= mask
+        observation.hit_mask = shot & self.fleet_masks[side] & ~observation.sunk_mask
+        return observation
+
+    def grid(self, side):
+        """
+        Поле стороны в текущей позиции для отображения
+
+        Returns:
+            list: Строки клеток Cell, включая нетронутые корабли (SHIP)
+        """
+        observation = self.observation(side)
+        fleet = self.fleet_masks[side]
+        grid = []
+        for y in range(self.size):
+            row = []
+            for x in range(self.size):
+                state = observation.cell(x, y)
+                if state == Cell.EMPTY and fleet >> (y * self.size + x) & 1:
+                    state = Cell.SHIP
+                row.append(state)
+            grid.append(row)
+        return grid
+
+    def winner(self):
+        """Сторона, потопившая весь флот соперника, или None"""
+        for side in (0, 1):
+            if not self.fleet_masks[1 - side] & ~self.shot_masks[1 - side]:
+                return side
+        return None
+
+
+class ReplayReader:
+    """Чтение журнала партий через отображение файла в память"""
+
+    def __init__(self, path):
+        """
+        Открытие журнала и построение индекса партий
+
+        Args:
+            path (str): Путь к файлу журнала
+        """
+        self.path = path
+        self.file = open(path, "rb")
+        # Пустой файл (журнал, в который еще ничего не записано) mmap
+        # отобразить не может; в нем просто нет партий
+        if os.fstat(self.file.fileno()).st_size == 0:
+            self.data = b""
+            self.offsets, self.ends = [], []
+            return
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.data[:len(REPLAY_MAGIC)] != REPLAY_MAGIC:
+            self.close()
+            raise ValueError(f"Файл {path} не является журналом партий")
+        self.offsets, self.ends = self.build_index()
+
+    def build_index(self):
+        """
+        Смещения начала партий и конца их выстрелов
+
+        Конец партии ищется по байту END_OF_GAME (поиск выполняется
+        внутри mmap), поэтому выстрелы при индексации не разбираются.
+        У оборванной последней партии выстрелы идут до конца файла.
+
+        Returns:
+            tuple: (смещения начала партий, смещения конца выстрелов)
+        """
+        data = self.data
+        marker = bytes((END_OF_GAME,))
+        offsets = []
+        ends = []
+        offset = len(REPLAY_MAGIC)
+        while offset < len(data):
+            offsets.append(offset)
+            end = data.find(marker, offset + GAME_HEADER.size + 4 * data[offset + 1])
+            if end < 0:
+                ends.append(len(data))
+                break
+            ends.append(end)
+            offset = end + 1
+        return offsets, ends
+
+    @property
+    def game_count(self):
+        """Число партий в журнале"""
+        return len(self.offsets)
+
+    def game(self, index):
+        """
+        Партия по номеру
+
+        Args:
+            index (int): Номер партии в журнале, с 0
+
+        Returns:
+            ReplayGame: Партия
+        """
+        return ReplayGame(self.data, self.offsets[index], self.ends[index])
+
+    def games(self):
+        """Все партии журнала по порядку"""
+        for offset, end in zip(self.offsets, self.ends):
+            yield ReplayGame(self.data, offset, end)
+
+    def shot(self, game, move):
+        """
+        Клетка выстрела по номерам партии и выстрела
+
+        Флоты партии не разбираются: начало выстрелов вычисляется по
+        заголовку, а конец берется из индекса.
+
+        Returns:
+            tuple: Координаты (x, y)
+        """
+        data = self.data
+        offset = self.offsets[game]
+        size = data[offset]
+        start = offset + GAME_HEADER.size + 4 * data[offset + 1]
+        if not 0 <= move < self.ends[game] - start:
+            raise IndexError(f"В партии {game} нет выстрела {move}")
+        cell = data[start + move]
+        return cell % size, cell // size
+
+    def close(self):
+        """Закрытие отображения и файла"""
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
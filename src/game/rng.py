@@ -0,0 +1,25 @@
+"""
+Независимые источники случайных чисел
+
+Поля, ИИ и логика игры принимают свой источник (rng) вместо модуля
+random с общим состоянием. Источник партии порождает дочерние
+источники для каждого участника, поэтому партия с заданным зерном
+воспроизводится одинаково при любом порядке и числе процессов, а
+участники не влияют на случайные решения друг друга.
+"""
+
+import random
+
+
+def spawn(rng=random, count=1):
+    """
+    Дочерние источники, независимые от родителя и друг от друга
+
+    Args:
+        rng: Родительский источник (модуль random или random.Random)
+        count (int): Число дочерних источников
+
+    Returns:
+        list: Источники random.Random с зернами из родителя
+    """
+    return [random.Random(rng.getrandbits(64)) for _ in range(count)]
@@ -0,0 +1,72 @@
+"""
+Правила игры: размер поля и состав флота
+"""
+
+
+STANDARD_FLEET = [(4, 1), (3, 2), (2, 3), (1, 4)]
+
+
+class Rules:
+    """Класс для описания правил партии"""
+
+    def __init__(self, size=10, fleet=None, allow_touching=False):
+        """
+        Инициализация правил
+
+        Args:
+            size (int): Размер поля (по умолчанию 10)
+            fleet (list): Пары (размер корабля, количество), по умолчанию стандартный флот
+            allow_touching (bool): Разрешено ли кораблям касаться друг друга
+        """
+        self.size = size
+        self.fleet = sorted(fleet if fleet is not None else STANDARD_FLEET, reverse=True)
+        self.allow_touching = allow_touching
+
+        for ship_size, count in self.fleet:
+            if not 1 <= ship_size <= size or count < 0:
+                raise ValueError(f"Недопустимый корабль {ship_size}x{count} для поля {size}x{size}")
+
+        # Корабль вместе с полосой соседних клеток справа и снизу занимает
+        # (s + 1) * 2 клетки поля (size + 1) x (size + 1), и у некасающихся
+        # кораблей эти области не пересекаются - иначе флот не поместится
+        if allow_touching:
+            area, limit = sum(s * c for s, c in self.fleet), size * size
+            need = f"нужно {area} клеток"
+        else:
+            area, limit = sum((s + 1) * 2 * c for s, c in self.fleet), (size + 1) ** 2
+            need = f"нужно {area} клеток с учетом зон вокруг кораблей"
+        if area > limit:
+            raise ValueError(f"Флот не помещается на поле {size}x{size}: {need}, есть {limit}")
+
+    @property
+    def total_ships(self):
+        """Общее количество кораблей во флоте"""
+        return sum(count for _, count in self.fleet)
+
+    def ship_sizes(self):
+        """Размеры всех кораблей флота от больших к меньшим"""
+        sizes = []
+        for ship_size, count in self.fleet:
+            sizes.extend([ship_size] * count)
+        return sizes
+
+    def describe(self):
+        """
+        Описание правил для игрока
+
+        Returns:
+            list: Строки с размером поля, составом флота и правилом касания
+        """
+        fleet = ", ".join(f"{ship_size}-палубный x{count}" for ship_size, count in self.fleet)
+        touching = "могут" if self.allow_touching else "не должны"
+        return [
+            f"Поле {self.size}x{self.size}, флот из {self.total_ships} кораблей: {fleet}",
+            f"Корабли {touching} касаться друг друга",
+        ]
+
+    def key(self):
+        """Кортеж, однозначно задающий правила"""
+        return (self.size, tuple(self.fleet), self.allow_touching)
+
+
+DEFAULT_RULES = Rules()
@@ -0,0 +1,254 @@
+"""
+Консольная симуляция партий ИИ против ИИ без интерфейса
+
+Модуль не импортирует tkinter: партии играются напрямую на полях Board
+со скоростью машины, а серия партий распределяется по пулу процессов.
+Зерно каждой партии выводится из общего зерна серии, а поля и ИИ партии
+получают собственные источники случайных чисел (game.rng), поэтому
+результат не зависит от числа процессов и глобального состояния random.
+
+С параметром --replay партии записываются в журнал (game.replay) в
+порядке зерен, независимо от числа процессов. Каждая партия пишется в
+журнал сразу по готовности ее блока, поэтому память не растет с числом
+партий.
+
+Запуск:
+    python -m game.simulation --first smart --second density --games 1000 --workers 4
+"""
+
+import argparse
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .bitboard import BOARD_CLASSES
+from .board import Board
+from .replay import ReplayWriter, encode_game
+from .rng import spawn
+from .rules import DEFAULT_RULES
+from .strategies import STRATEGIES, create_ai
+
+# Число партий в задании для процесса пула
+GAMES_PER_TASK = 50
+
+
+def play_game(first, second, rules=None, board_class=Board, rng=random, records=None):
+    """
+    Одна партия двух стратегий
+
+    Первой стреляет стратегия first; как и в игре, после попадания
+    стрелявший стреляет еще раз.
+
+    Args:
+        first (str): Имя стратегии первого игрока
+        second (str): Имя стратегии второго игрока
+        rules (Rules): Правила партии (по умолчанию стандартные)
+        board_class (type): Реализация поля (Board или BitBoard)
+        rng: Источник случайных чисел партии (модуль random или random.Random)
+        records (list): Если задан, в него добавляется запись партии (replay.encode_game)
+
+    Returns:
+        tuple: (номер победителя 0 или 1, выстрелы первого, выстрелы второго)
+    """
+    rules = rules if rules is not None else DEFAULT_RULES
+    rngs = spawn(rng, 4)
+    boards = [board_class(rules=rules, rng=rngs[0]), board_class(rules=rules, rng=rngs[1])]
+    for board in boards:
+        if not board.auto_place_ships():
+            raise RuntimeError("Не удалось расставить флот")
+
+    # Каждый ИИ стреляет по полю соперника
+    ais = [create_ai(first, boards[1], rng=rngs[2]), create_ai(second, boards[0], rng=rngs[3])]
+    shots = [0, 0]
+    sunk = [0, 0]
+    cells = []
+    total = rules.total_ships
+    side = 0
+    limit = 2 * rules.size * rules.size
+
+    while shots[side] < limit:
+        target = boards[1 - side]
+        x, y = ais[side].get_next_shot()
+        result = target.shoot(x, y)
+        shots[side] += 1
+        cells.append(y * rules.size + x)
+
+        sunk_cells = None
+        if result == "destroyed":
+            sunk_cells = target.get_ship_at(x, y).cells
+            sunk[side] += 1
+        ais[side].register_shot(x, y, result, sunk_cells)
+
+        if sunk[side] == total:
+            if records is not None:
+                records.append(encode_game(rules, (boards[0].ships, boards[1].ships), cells))
+            return side, shots[0], shots[1]
+        if result == "miss":
+            side = 1 - side
+
+    raise RuntimeError(f"Стратегия {(first, second)[side]} не закончила партию")
+
+
+def play_games(first, second, seeds, rules=None, record=False, board_class=Board):
+    """
+    Серия партий с заданными зернами (выполняется в процессе пула)
+
+    Args:
+        first (str): Имя стратегии первого игрока
+        second (str): Имя стратегии второго игрока
+        seeds (list): Зерно для каждой партии
+        rules (Rules): Правила партии
+        record (bool): Возвращать ли записи партий для журнала
+        board_class (type): Реализация поля (Board или BitBoard)
+
+    Returns:
+        tuple: (результаты play_game по партиям, записи партий или пустой список)
+    """
+    records = [] if record else None
+    results = [play_game(first, second, rules, board_class, random.Random(seed), records)
+               for seed in seeds]
+    return results, records or []
+
+
+def summarize(results, elapsed):
+    """
+    Сводка по результатам партий
+
+    Args:
+        results (list): Результаты play_game
+        elapsed (float): Время серии в секундах
+
+    Returns:
+        dict: Победы, средние и крайние числа выстрелов до победы, скорость
+    """
+    wins = [0, 0]
+    to_win = [[], []]
+    for winner, first_shots, second_shots in results:
+        wins[winner] += 1
+        to_win[winner].append(first_shots if winner == 0 else second_shots)
+
+    summary = {
+        "games": len(results),
+        "wins": wins,
+        "elapsed": elapsed,
+        "games_per_sec": len(results) / elapsed if elapsed else 0.0,
+    }
+    for side, name in ((0, "first"), (1, "second")):
+        shots = to_win[side]
+        summary[f"{name}_shots_to_win"] = {
+            "mean": sum(shots) / len(shots) if shots else None,
+            "min": min(shots, default=None),
+            "max": max(shots, default=None),
+        }
+    return summary
+
+
+def iter_games(first, second, seeds, rules=None, record=False, board_class=Board,
+               workers=None):
+    """
+    Партии серии по порядку зерен
+
+    В пуле зерна делятся на блоки по GAMES_PER_TASK подряд идущих партий.
+    Одновременно выполняется не больше двух блоков на процесс, а готовые
+    блоки отдаются по порядку, поэтому в памяти держатся только они.
+
+    Args:
+        first (str): Имя стратегии первого игрока
+        second (str): Имя стратегии второго игрока
+        seeds (list): Зерно для каждой партии
+        rules (Rules): Правила партии
+        record (bool): Возвращать ли записи партий для журнала
+        board_class (type): Реализация поля (Board или BitBoard)
+        workers (int): Число процессов; None или 1 - в текущем процессе
+
+    Yields:
+        tuple: (результат play_game, запись партии или None)
+    """
+    if not workers or workers <= 1:
+        for seed in seeds:
+            records = [] if record else None
+            result = play_game(first, second, rules, board_class, random.Random(seed), records)
+            yield result, records[0] if record else None
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for start in range(0, len(seeds), GAMES_PER_TASK):
+            pending.append(executor.submit(play_games, first, second,
+                                           seeds[start:start + GAMES_PER_TASK],
+                                           rules, record, board_class))
+            if len(pending) < 2 * workers:
+                continue
+            results, records = pending.popleft().result()
+            for number, result in enumerate(results):
+                yield result, records[number] if record else None
+        while pending:
+            results, records = pending.popleft().result()
+            for number, result in enumerate(results):
+                yield result, records[number] if record else None
+
+
+def simulate(first="smart", second="smart", games=1000, workers=None, seed=0, rules=None,
+             replay=None, board_class=Board):
+    """
+    Серия партий, распределенная по пулу процессов
+
+    Args:
+        first (str): Имя стратегии первого игрока
+        second (str): Имя стратегии второго игрока
+        games (int): Число партий
+        workers (int): Число процессов; None или 1 - в текущем процессе
+        seed (int): Зерно серии; из него выводятся зерна партий
+        rules (Rules): Правила партии
+        replay (str): Путь к журналу, в который дописываются партии (необязательно)
+        board_class (type): Реализация поля (Board или BitBoard)
+
+    Returns:
+        dict: Сводка summarize
+    """
+    rng = random.Random(seed)
+    seeds = [rng.getrandbits(64) for _ in range(games)]
+
+    writer = ReplayWriter(replay) if replay is not None else None
+    results = []
+    start = time.perf_counter()
+    try:
+        for result, record in iter_games(first, second, seeds, rules, writer is not None,
+                                         board_class, workers):
+            results.append(result)
+            if writer is not None:
+                writer.write_game(record)
+    finally:
+        if writer is not None:
+            writer.close()
+    elapsed = time.perf_counter() - start
+    return summarize(results, elapsed)
+
+
+def main(argv=None):
+    """Запуск симуляции из командной строки"""
+    parser = argparse.ArgumentParser(description="Симуляция партий ИИ против ИИ")
+    parser.add_argument("--first", default="smart", choices=sorted(STRATEGIES))
+    parser.add_argument("--second", default="smart", choices=sorted(STRATEGIES))
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--replay", default=None, help="Путь к журналу партий")
+    parser.add_argument("--board", default="board", choices=sorted(BOARD_CLASSES),
+                        help="Реализация поля")
+    args = parser.parse_args(argv)
+
+    summary = simulate(args.first, args.second, args.games, args.workers, args.seed,
+                       replay=args.replay, board_class=BOARD_CLASSES[args.board])
+    print(f"Партий: {summary['games']} за {summary['elapsed']:.2f} с "
+          f"({summary['games_per_sec']:.1f} партий/с)")
+    for side, name in ((0, args.first), (1, args.second)):
+        shots = summary["first_shots_to_win" if side == 0 else "second_shots_to_win"]
+        mean = f"{shots['mean']:.1f}" if shots["mean"] is not None else "-"
+        print(f"{name}: побед {summary['wins'][side]}, выстрелов до победы "
+              f"в среднем {mean} (от {shots['min']} до {shots['max']})")
+
+
+if __name__ == "__main__":
+    main()
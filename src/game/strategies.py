@@ -0,0 +1,197 @@
+"""
+Реестр стратегий ИИ
+
+Каждая стратегия регистрируется под коротким именем вместе с уровнем
+сложности и ожидаемой стоимостью: временем на ход и памятью на партию
+(поле 10x10 и стандартный флот, python -m benchmarks.run --profiles).
+По этим данным можно выбрать стратегию по имени из GameLogic и
+интерфейса или подобрать самую сильную стратегию, укладывающуюся в
+бюджет сервера (choose_strategy, переменная SEABATTLE_AI_BUDGET).
+"""
+
+import random
+from collections import namedtuple
+
+from .anytime import AnytimeAI
+from .board import SmartAI
+from .density import DensityAI
+from .masks import board_masks, halo_mask, mask_cells
+from .montecarlo import MonteCarloAI
+from .observation import Observation
+
+DEFAULT_STRATEGY = "smart"
+
+STRATEGIES = {}
+
+
+Strategy = namedtuple("Strategy", ["name", "title", "tier", "cost", "memory", "factory"])
+Strategy.__doc__ = """Стратегия ИИ: уровень сложности (1 - самый слабый), время на ход
+в микросекундах, память на партию в килобайтах и функция создания ИИ"""
+
+
+class RandomAI:
+    """ИИ, стреляющий в случайную клетку, по которой еще не стреляли"""
+
+    def __init__(self, board, rng=random):
+        """
+        Инициализация ИИ
+
+        Args:
+            board (Board): Игровое поле противника или правила партии (Rules)
+            rng: Источник случайных чисел (модуль random или random.Random)
+        """
+        self.rules = getattr(board, "rules", board)
+        self.size = self.rules.size
+        self.observation = Observation(self.size)
+        self.shots = set()
+        self.rng = rng
+
+    def free_mask(self):
+        """Маска клеток, по которым еще не стреляли"""
+        return board_masks(self.size)[0] & ~self.observation.shot_mask
+
+    def get_next_shot(self):
+        """Получить координаты следующего выстрела"""
+        return self.rng.choice(mask_cells(self.free_mask(), self.size))
+
+    def register_shot(self, x, y, result, sunk_cells=None):
+        """
+        Зарегистрировать результат выстрела
+
+        Args:
+            x (int): X координата
+            y (int): Y координата
+            result (str): Результат выстрела ("miss", "hit", "destroyed")
+            sunk_cells (list): Клетки потопленного корабля, если известны
+        """
+        self.shots.add((x, y))
+        self.observation.record(x, y, result, sunk_cells)
+
+    def get_state(self):
+        """Компактное состояние ИИ для отката хода"""
+        return self.observation.to_bytes()
+
+    def set_state(self, state):
+        """Восстановление состояния, полученного get_state"""
+        self.observation = Observation.from_bytes(state)
+        self.shots = set(mask_cells(self.observation.shot_mask, self.size))
+
+
+class CheckerboardAI(RandomAI):
+    """
+    ИИ с охотой по шахматной раскраске
+
+    Пока нет подбитых кораблей, стреляет в случайную клетку одного
+    цвета (любой корабль длиннее одной клетки его задевает), затем
+    добивает корабль по соседям попаданий.
+    """
+
+    def __init__(self, board, rng=random):
+        """
+        Инициализация ИИ
+
+        Args:
+            board (Board): Игровое поле противника или правила партии (Rules)
+            rng: Источник случайных чисел (модуль random или random.Random)
+        """
+        super().__init__(board, rng)
+        self.parity_mask = 0
+        for y in range(self.size):
+            for x in range(self.size):
+                if (x + y) % 2 == 0:
+                    self.parity_mask |= 1 << (y * self.size + x)
+
+    def get_next_shot(self):
+        """Получить координаты следующего выстрела"""
+        size = self.size
+        observation = self.observation
+        free = self.free_mask()
+        if not self.rules.allow_touching:
+            free &= ~halo_mask(observation.sunk_mask, size)
+        if not free:
+            free = self.free_mask()
+
+        # Добивание: клетки рядом с попаданиями по стороне
+        if observation.hit_mask:
+            hits = observation.hit_mask
+            _, not_left, not_right = board_masks(size)
+            around = hits << size | hits >> size | (hits << 1) & not_left | (hits >> 1) & not_right
+            if around & free:
+                return self.rng.choice(mask_cells(around & free, size))
+
+        candidates = free & self.parity_mask or free
+        return self.rng.choice(mask_cells(candidates, size))
+
+
+def register_strategy(name, title, tier, cost, memory, factory):
+    """
+    Регистрация стратегии ИИ
+
+    Args:
+        name (str): Короткое имя стратегии
+        title (str): Название для интерфейса
+        tier (int): Уровень сложности (1 - самый слабый)
+        cost (int): Ожидаемое время на ход, мкс
+        memory (int): Ожидаемая память на партию, КБ
+        factory (callable): Создает ИИ по полю противника и параметрам
+    """
+    STRATEGIES[name] = Strategy(name, title, tier, cost, memory, factory)
+
+
+def get_strategy(name):
+    """
+    Стратегия по имени
+
+    Args:
+        name (str): Имя стратегии
+
+    Returns:
+        Strategy: Описание стратегии
+    """
+    strategy = STRATEGIES.get(name)
+    if strategy is None:
+        raise ValueError(f"Неизвестная стратегия ИИ: {name}")
+    return strategy
+
+
+def create_ai(name, board, **options):
+    """
+    Создание ИИ выбранной стратегии
+
+    Args:
+        name (str): Имя стратегии
+        board (Board): Игровое поле противника или правила партии (Rules)
+        **options: Дополнительные параметры конструктора ИИ
+
+    Returns:
+        ИИ с методами get_next_shot, register_shot, get_state и set_state
+    """
+    return get_strategy(name).factory(board, **options)
+
+
+def choose_strategy(max_cost=None, max_memory=None):
+    """
+    Самая сильная стратегия, укладывающаяся в бюджет
+
+    Args:
+        max_cost (int): Наибольшее допустимое время на ход, мкс
+        max_memory (int): Наибольшая допустимая память на партию, КБ
+
+    Returns:
+        Strategy: Подходящая стратегия; если ни одна не подходит - самая дешевая
+    """
+    fitting = [s for s in STRATEGIES.values()
+               if (max_cost is None or s.cost <= max_cost)
+               and (max_memory is None or s.memory <= max_memory)]
+    if not fitting:
+        return min(STRATEGIES.values(), key=lambda s: (s.cost, s.memory))
+    return max(fitting, key=lambda s: (s.tier, -s.cost))
+
+
+# Время и память - результаты python -m benchmarks.run --profiles
+register_strategy("random", "Новичок: случайные выстрелы", 1, 20, 22, RandomAI)
+register_strategy("checkerboard", "Любитель: шахматный порядок", 2, 12, 9, CheckerboardAI)
+register_strategy("smart", "Любитель: эвристика охоты", 2, 17, 22, SmartAI)
+register_strategy("density", "Опытный: плотность позиций", 3, 20, 9, DensityAI)
+register_strategy("anytime", "Мастер: выборки за 50 мс", 4, 45000, 33, AnytimeAI)
+register_strategy("montecarlo", "Мастер: 2000 выборок", 4, 108000, 15, MonteCarloAI)
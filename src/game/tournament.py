@@ -0,0 +1,331 @@
+"""
+Турнир стратегий ИИ на общем наборе флотов
+
+Все стратегии стреляют по одному и тому же заранее сгенерированному
+набору флотов, поэтому сравнение идет парами: на каждом флоте
+стратегия, потопившая его за меньшее число выстрелов, выигрывает у
+другой. По парным результатам считаются рейтинги Эло, по числу
+выстрелов - среднее, распределение и доверительные интервалы.
+
+Флоты разыгрываются раундами в пуле процессов. Начиная с MIN_ROUNDS
+раунда после каждого раунда проверяется, отделены ли все пары
+стратегий: доверительный интервал средней парной разницы не содержит
+нуля. Если да, турнир останавливается досрочно. Проверок много (по
+каждой паре после каждого раунда), поэтому уровень ALPHA делится между
+ними поправкой Бонферрони, и общая вероятность ложной остановки не
+больше ALPHA.
+
+Рейтинг Эло зависит от порядка партий, поэтому он усредняется по
+ELO_ORDERINGS случайным порядкам флотов, заданным зерном турнира.
+
+Запуск:
+    python -m game.tournament --strategies smart density checkerboard --fleets 2000 --workers 4
+"""
+
+import argparse
+import math
+import random
+from collections import Counter
+from statistics import NormalDist
+from concurrent.futures import ProcessPoolExecutor
+
+from .bitboard import BOARD_CLASSES
+from .board import Board
+from .cells import Ship
+from .placement import generate_fleet
+from .rules import DEFAULT_RULES
+from .strategies import STRATEGIES, create_ai
+
+# Квантиль нормального распределения для 95% доверительных интервалов
+Z_95 = 1.96
+ELO_START = 1500
+ELO_K = 16
+ELO_ORDERINGS = 20
+
+# Общий уровень ложной досрочной остановки и наименьшее число раундов до нее
+ALPHA = 0.05
+MIN_ROUNDS = 3
+
+
+def make_fleet_pool(count, rules=None, seed=0):
+    """
+    Набор случайных флотов для турнира
+
+    Args:
+        count (int): Число флотов
+        rules (Rules): Правила партии
+        seed (int): Зерно генератора
+
+    Returns:
+        list: Флоты - кортежи (размер, x, y, горизонтальный) для каждого корабля
+    """
+    rules = rules if rules is not None else DEFAULT_RULES
+    rng = random.Random(seed)
+    pool = []
+    for _ in range(count):
+        ships = generate_fleet(rules.size, rules.fleet, rng=rng,
+                               allow_touching=rules.allow_touching)
+        if ships is None:
+            raise RuntimeError("Не удалось расставить флот")
+        pool.append(tuple((s.size, s.x, s.y, s.horizontal) for s in ships))
+    return pool
+
+
+def play_fleet(strategy, fleet, seed, rules=None, board_class=Board):
+    """
+    Число выстрелов, за которое стратегия топит заданный флот
+
+    Стратегия, не потопившая флот за size * size выстрелов (например,
+    повторяющая клетки), вызывает RuntimeError, а не зависание процесса пула.
+
+    Args:
+        strategy (str): Имя стратегии
+        fleet (tuple): Флот из make_fleet_pool
+        seed (int): Зерно случайных решений ИИ
+        rules (Rules): Правила партии
+        board_class (type): Реализация поля (Board или BitBoard)
+
+    Returns:
+        int: Число выстрелов
+    """
+    rules = rules if rules is not None else DEFAULT_RULES
+    board = board_class(rules=rules)
+    for ship in fleet:
+        board.place_ship(Ship(*ship))
+
+    ai = create_ai(strategy, board, rng=random.Random(seed))
+    shots = 0
+    sunk = 0
+    limit = rules.size * rules.size
+    while sunk < len(fleet):
+        if shots == limit:
+            raise RuntimeError(f"Стратегия {strategy} не потопила флот за {limit} выстрелов")
+        x, y = ai.get_next_shot()
+        result = board.shoot(x, y)
+        shots += 1
+        sunk_cells = None
+        if result == "destroyed":
+            sunk_cells = board.get_ship_at(x, y).cells
+            sunk += 1
+        ai.register_shot(x, y, result, sunk_cells)
+    return shots
+
+
+def play_round(strategies, fleets, seeds, rules=None, board_class=Board):
+    """
+    Раунд турнира: все стратегии на каждом флоте (выполняется в процессе пула)
+
+    Returns:
+        list: Для каждого флота - список выстрелов по стратегиям
+    """
+    return [[play_fleet(strategy, fleet, seed, rules, board_class) for strategy in strategies]
+            for fleet, seed in zip(fleets, seeds)]
+
+
+def mean_interval(values, z=Z_95):
+    """
+    Среднее и полуширина доверительного интервала
+
+    Args:
+        values (list): Значения
+        z (float): Квантиль нормального распределения (по умолчанию для 95%)
+
+    Returns:
+        tuple: (среднее, полуширина; бесконечность при менее чем двух значениях)
+    """
+    n = len(values)
+    mean = sum(values) / n
+    if n < 2:
+        return mean, math.inf
+    variance = sum((v - mean) ** 2 for v in values) / (n - 1)
+    return mean, z * math.sqrt(variance / n)
+
+
+def update_elo(ratings, results, names):
+    """
+    Обновление рейтингов Эло по парным результатам на одном флоте
+
+    Args:
+        ratings (dict): Имя стратегии -> рейтинг (изменяется)
+        results (list): Выстрелы стратегий на флоте
+        names (list): Имена стратегий в порядке results
+    """
+    for i in range(len(names)):
+        for j in range(i + 1, len(names)):
+            a, b = names[i], names[j]
+            expected = 1 / (1 + 10 ** ((ratings[b] - ratings[a]) / 400))
+            if results[i] < results[j]:
+                score = 1.0
+            elif results[i] > results[j]:
+                score = 0.0
+            else:
+                score = 0.5
+            ratings[a] += ELO_K * (score - expected)
+            ratings[b] -= ELO_K * (score - expected)
+
+
+def elo_ratings(table, names, orderings=ELO_ORDERINGS, seed=0):
+    """
+    Рейтинги Эло, усредненные по случайным порядкам флотов
+
+    Args:
+        table (list): Выстрелы стратегий по флотам
+        names (list): Имена стратегий в порядке столбцов
+        orderings (int): Число порядков
+        seed (int): Зерно перестановок
+
+    Returns:
+        dict: Имя стратегии -> средний рейтинг
+    """
+    rng = random.Random(seed)
+    totals = dict.fromkeys(names, 0.0)
+    rows = list(table)
+    for _ in range(orderings):
+        rng.shuffle(rows)
+        ratings = {name: ELO_START for name in names}
+        for row in rows:
+            update_elo(ratings, row, names)
+        for name in names:
+            totals[name] += ratings[name]
+    return {name: total / orderings for name, total in totals.items()}
+
+
+def stop_quantile(checks, pairs, alpha=ALPHA):
+    """
+    Квантиль интервала для проверок досрочной остановки
+
+    Args:
+        checks (int): Наибольшее число проверок (раундов)
+        pairs (int): Число пар стратегий
+        alpha (float): Общий уровень ложной остановки
+
+    Returns:
+        float: Квантиль нормального распределения с поправкой Бонферрони
+    """
+    return NormalDist().inv_cdf(1 - alpha / (2 * max(1, checks) * pairs))
+
+
+def separated(table, count, z=Z_95):
+    """
+    Отделены ли все пары стратегий
+
+    Args:
+        table (list): Выстрелы стратегий по флотам
+        count (int): Число стратегий
+        z (float): Квантиль интервала парной разницы
+
+    Returns:
+        bool: True если интервал парной разницы каждой пары не содержит нуля
+    """
+    for i in range(count):
+        for j in range(i + 1, count):
+            mean, half = mean_interval([row[i] - row[j] for row in table], z)
+            if abs(mean) <= half:
+                return False
+    return True
+
+
+def run_tournament(strategies, fleets=2000, round_size=200, workers=None, seed=0,
+                   rules=None, early_stop=True, board_class=Board):
+    """
+    Турнир стратегий
+
+    Args:
+        strategies (list): Имена стратегий
+        fleets (int): Наибольшее число флотов
+        round_size (int): Число флотов в раунде
+        workers (int): Число процессов; None или 1 - в текущем процессе
+        seed (int): Зерно набора флотов и решений ИИ
+        rules (Rules): Правила партии
+        early_stop (bool): Останавливаться, когда все пары отделены
+            (не раньше MIN_ROUNDS раунда)
+        board_class (type): Реализация поля (Board или BitBoard)
+
+    Returns:
+        dict: Число сыгранных флотов, признак досрочной остановки и
+              для каждой стратегии среднее, интервал, распределение и рейтинг
+    """
+    if len(strategies) < 2:
+        raise ValueError("Для турнира нужны хотя бы две стратегии")
+    if len(set(strategies)) != len(strategies):
+        raise ValueError("Стратегии турнира не должны повторяться")
+
+    pool = make_fleet_pool(fleets, rules, seed)
+    rng = random.Random(seed + 1)
+    seeds = [rng.getrandbits(64) for _ in range(fleets)]
+
+    # Проверки идут после раундов с MIN_ROUNDS по предпоследний
+    rounds = (fleets + round_size - 1) // round_size
+    pairs = len(strategies) * (len(strategies) - 1) // 2
+    z = stop_quantile(rounds - MIN_ROUNDS, pairs)
+
+    table = []
+    stopped_early = False
+    executor = ProcessPoolExecutor(max_workers=workers) if workers and workers > 1 else None
+    try:
+        for number, start in enumerate(range(0, fleets, round_size), 1):
+            end = min(start + round_size, fleets)
+            if executor is None:
+                table.extend(play_round(strategies, pool[start:end], seeds[start:end], rules,
+                                        board_class))
+            else:
+                step = max(1, (end - start + workers - 1) // workers)
+                futures = [executor.submit(play_round, strategies, pool[i:min(i + step, end)],
+                                           seeds[i:min(i + step, end)], rules, board_class)
+                           for i in range(start, end, step)]
+                for future in futures:
+                    table.extend(future.result())
+
+            if (early_stop and number >= MIN_ROUNDS and end < fleets
+                    and separated(table, len(strategies), z)):
+                stopped_early = True
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    ratings = elo_ratings(table, strategies, seed=seed)
+
+    report = {"fleets": len(table), "stopped_early": stopped_early, "strategies": {}}
+    for index, name in enumerate(strategies):
+        shots = [row[index] for row in table]
+        mean, half = mean_interval(shots)
+        report["strategies"][name] = {
+            "mean": mean,
+            "ci95": (mean - half, mean + half),
+            "min": min(shots),
+            "max": max(shots),
+            "distribution": dict(sorted(Counter(shots).items())),
+            "elo": ratings[name],
+        }
+    return report
+
+
+def main(argv=None):
+    """Запуск турнира из командной строки"""
+    parser = argparse.ArgumentParser(description="Турнир стратегий ИИ")
+    parser.add_argument("--strategies", nargs="+", default=["smart", "density", "checkerboard"],
+                        choices=sorted(STRATEGIES))
+    parser.add_argument("--fleets", type=int, default=2000)
+    parser.add_argument("--round", type=int, default=200, dest="round_size")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-early-stop", action="store_false", dest="early_stop")
+    parser.add_argument("--board", default="board", choices=sorted(BOARD_CLASSES),
+                        help="Реализация поля")
+    args = parser.parse_args(argv)
+
+    report = run_tournament(args.strategies, args.fleets, args.round_size, args.workers,
+                            args.seed, early_stop=args.early_stop,
+                            board_class=BOARD_CLASSES[args.board])
+    note = " (досрочная остановка: все пары отделены)" if report["stopped_early"] else ""
+    print(f"Флотов сыграно: {report['fleets']}{note}")
+    ranking = sorted(report["strategies"].items(), key=lambda item: -item[1]["elo"])
+    for name, stats in ranking:
+        low, high = stats["ci95"]
+        print(f"{name:>14}: Эло {stats['elo']:7.1f}, выстрелов {stats['mean']:.2f} "
+              f"[{low:.2f}; {high:.2f}], от {stats['min']} до {stats['max']}")
+
+
+if __name__ == "__main__":
+    main()
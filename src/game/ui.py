@@ -6,13 +6,25 @@ import tkinter as tk
 from tkinter import messagebox
 from .game_logic import GameLogic
 from .cells import Cell
+from .rules import DEFAULT_RULES
+from .strategies import DEFAULT_STRATEGY, STRATEGIES
 
 
 class SeaBattleStable:
     """Основной класс для управления UI игры"""
 
-    def __init__(self):
-        """Инициализация игры"""
+    def __init__(self, rules=None, strategy=DEFAULT_STRATEGY, replay=None):
+        """
+        Инициализация игры
+
+        Args:
+            rules (Rules): Правила игры (по умолчанию поле 10x10 и стандартный флот)
+            strategy (str): Имя стратегии ИИ компьютера
+            replay (ReplayWriter): Журнал, в который записываются партии (необязательно)
+        """
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.strategy = strategy
+        self.replay = replay
         self.root = tk.Tk()
         self.root.title("Морской бой")
 
@@ -32,8 +44,12 @@ class SeaBattleStable:
             'canvas': 400
         }
 
+        # Размер клетки подбирается так, чтобы поле занимало около 320 пикселей
+        self.cell_size = max(4, 320 // self.rules.size)
+
         # Инициализация игровой логики
-        self.game_logic = GameLogic()
+        self.game_logic = GameLogic(rules=self.rules, strategy=self.strategy, replay=self.replay)
+        self.hover_key = None
 
         # Создание главного меню
         self.show_main_menu()
@@ -89,14 +105,31 @@ class SeaBattleStable:
                                 relief=tk.RAISED, bd=3)
         exit_button.pack(pady=10)
 
+        # Выбор сложности компьютера
+        strategy_frame = tk.LabelFrame(center_frame, text="СЛОЖНОСТЬ",
+                                       font=("Arial", self.font_sizes['label'], "bold"),
+                                       fg="#ECF0F1", bg="#2C3E50")
+        strategy_frame.pack(pady=10)
+
+        self.strategy_var = tk.StringVar(value=self.strategy)
+        for strategy in STRATEGIES.values():
+            option = tk.Radiobutton(strategy_frame, text=strategy.title,
+                                    variable=self.strategy_var, value=strategy.name,
+                                    command=self.select_strategy,
+                                    font=("Arial", self.font_sizes['small']),
+                                    fg="#ECF0F1", bg="#2C3E50", selectcolor="#34495E",
+                                    activebackground="#2C3E50", anchor=tk.W)
+            option.pack(fill=tk.X, padx=10)
+
         # Правила
         rules_frame = tk.Frame(bg_frame, bg="#2C3E50")
         rules_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=20)
 
+        fleet_rule, touching_rule = self.rules.describe()
         rules = [
             "Правила игры:",
-            "1. Расставьте 10 кораблей на своём поле",
-            "2. Корабли не должны касаться друг друга",
+            f"1. Расставьте корабли на своём поле. {fleet_rule}",
+            f"2. {touching_rule}",
             "3. По очереди стреляйте по полю противника",
             "4. Побеждает тот, кто первым уничтожит все корабли",
             "",
@@ -110,6 +143,11 @@ class SeaBattleStable:
                              justify=tk.CENTER)
             label.pack()
 
+    def select_strategy(self):
+        """Выбор стратегии ИИ для следующих партий"""
+        self.strategy = self.strategy_var.get()
+        self.game_logic = GameLogic(rules=self.rules, strategy=self.strategy, replay=self.replay)
+
     def start_game_setup(self):
         """Начинает расстановку кораблей"""
         for widget in self.root.winfo_children():
@@ -260,6 +298,7 @@ class SeaBattleStable:
 
         # Привязка событий
         self.player_canvas.bind("<Motion>", self.on_player_hover)
+        self.player_canvas.bind("<Leave>", self.clear_preview)
         self.player_canvas.bind("<Button-1>", self.on_player_click)
         self.player_canvas.bind("<Button-3>", self.on_player_right_click)
 
@@ -270,13 +309,17 @@ class SeaBattleStable:
         """Фиксированная отрисовка игрового поля"""
         canvas.delete("all")
 
-        # Фиксированный размер клетки
-        cell_size = 32
+        # Размер клетки зависит от размера поля
+        cell_size = self.cell_size
         offset_x = 40
         offset_y = 40
+        size = board.size
+
+        # На больших полях подписывается не каждая клетка
+        label_step = max(1, -(-20 // cell_size))
 
         # Номера столбцов
-        for x in range(10):
+        for x in range(0, size, label_step):
             x_center = offset_x + x * cell_size + cell_size // 2
             canvas.create_text(x_center, offset_y // 2,
                                text=str(x),
@@ -284,7 +327,7 @@ class SeaBattleStable:
                                fill="black")
 
         # Номера строк
-        for y in range(10):
+        for y in range(0, size, label_step):
             y_center = offset_y + y * cell_size + cell_size // 2
             canvas.create_text(offset_x // 2, y_center,
                                text=str(y),
@@ -292,8 +335,8 @@ class SeaBattleStable:
                                fill="black")
 
         # Сетка и клетки
-        for y in range(10):
-            for x in range(10):
+        for y in range(size):
+            for x in range(size):
                 x1 = offset_x + x * cell_size
                 y1 = offset_y + y * cell_size
                 x2 = x1 + cell_size
@@ -328,11 +371,9 @@ class SeaBattleStable:
                                         outline="black",
                                         width=1)
 
-                # Символ
-                if symbol:
-                    font_size = 16
-                    if symbol == "☠":
-                        font_size = 18
+                # Символ (на мелких клетках не рисуется)
+                font_size = (18 if symbol == "☠" else 16) * cell_size // 32
+                if symbol and font_size >= 6:
 
                     canvas.create_text(x1 + cell_size // 2, y1 + cell_size // 2,
                                        text=symbol,
@@ -341,7 +382,7 @@ class SeaBattleStable:
 
         # Внешняя рамка
         canvas.create_rectangle(offset_x, offset_y,
-                                offset_x + 10 * cell_size, offset_y + 10 * cell_size,
+                                offset_x + size * cell_size, offset_y + size * cell_size,
                                 outline="black", width=2)
 
     def update_ship_buttons(self):
@@ -372,64 +413,62 @@ class SeaBattleStable:
         if not self.game_logic.current_ship_size:
             return
 
-        cell_size = 32
+        cell_size = self.cell_size
         offset_x = 40
         offset_y = 40
 
         x = (event.x - offset_x) // cell_size
         y = (event.y - offset_y) // cell_size
 
-        if 0 <= x < 10 and 0 <= y < 10:
-            # Создаем временную доску для предпросмотра
-            from .board import Board
-            from .cells import Ship
-
-            temp_board = Board()
-            temp_board.grid = [row[:] for row in self.game_logic.player_board.grid]
-
-            # Корректируем координаты если корабль выходит за границы
-            current_ship_horizontal = self.game_logic.current_ship_horizontal
-            current_ship_size = self.game_logic.current_ship_size
-
-            if current_ship_horizontal and x + current_ship_size > 10:
-                x = 10 - current_ship_size
-            elif not current_ship_horizontal and y + current_ship_size > 10:
-                y = 10 - current_ship_size
-
-            if x >= 0 and y >= 0:
-                temp_ship = Ship(current_ship_size, x, y, current_ship_horizontal)
-
-                # Проверяем можно ли разместить
-                can_place = temp_board.can_place_ship(temp_ship)
+        if 0 <= x < self.rules.size and 0 <= y < self.rules.size:
+            # Пока курсор в той же клетке, предпросмотр уже нарисован
+            hover_key = (x, y, self.game_logic.current_ship_size,
+                         self.game_logic.current_ship_horizontal)
+            if hover_key == self.hover_key and self.player_canvas.find_withtag("preview"):
+                return
+            self.hover_key = hover_key
+
+            # Перерисовывается только слой предпросмотра, а не все поле
+            self.player_canvas.delete("preview")
+            cells = self.game_logic.preview_ship(x, y)
+            if cells:
+                self.draw_preview(self.player_canvas, cells)
+        else:
+            self.clear_preview()
 
-                # Проверяем лимит кораблей такого типа
-                if can_place:
-                    ships_to_place = self.game_logic.get_ships_to_place()
-                    for ship_info in ships_to_place:
-                        if ship_info["size"] == current_ship_size:
-                            count_placed = 0
-                            for placed_ship in self.game_logic.player_board.ships:
-                                if placed_ship.size == current_ship_size:
-                                    count_placed += 1
-                            if count_placed >= ship_info["count"]:
-                                can_place = False
-                            break
+    def clear_preview(self, event=None):
+        """Удаление предпросмотра, когда курсор покидает поле"""
+        self.player_canvas.delete("preview")
+        self.hover_key = None
 
-                if can_place:
-                    temp_board.place_ship(temp_ship, ignore_ships=True)
+    def draw_preview(self, canvas, cells):
+        """Отрисовка корабля-предпросмотра поверх поля"""
+        cell_size = self.cell_size
+        offset_x = 40
+        offset_y = 40
 
-                self.draw_board_fixed(self.player_canvas, temp_board, hide_ships=False)
+        for x, y in cells:
+            x1 = offset_x + x * cell_size
+            y1 = offset_y + y * cell_size
+            canvas.create_rectangle(x1, y1, x1 + cell_size, y1 + cell_size,
+                                    fill="#3498DB", outline="black", width=1,
+                                    tags="preview")
+            font_size = 16 * cell_size // 32
+            if font_size >= 6:
+                canvas.create_text(x1 + cell_size // 2, y1 + cell_size // 2,
+                                   text="■", font=("Arial", font_size), fill="white",
+                                   tags="preview")
 
     def on_player_click(self, event):
         """Размещение корабля"""
-        cell_size = 32
+        cell_size = self.cell_size
         offset_x = 40
         offset_y = 40
 
         x = (event.x - offset_x) // cell_size
         y = (event.y - offset_y) // cell_size
 
-        if 0 <= x < 10 and 0 <= y < 10:
+        if 0 <= x < self.rules.size and 0 <= y < self.rules.size:
             success, message = self.game_logic.place_ship(x, y)
             self.status_label.config(text=message)
 
@@ -438,19 +477,19 @@ class SeaBattleStable:
                 self.draw_board_fixed(self.player_canvas, self.game_logic.player_board, hide_ships=False)
 
                 placed_total = self.game_logic.get_placed_total()
-                if placed_total >= 10:
+                if placed_total >= self.rules.total_ships:
                     self.start_game_btn.config(state=tk.NORMAL, bg="#27AE60")
 
     def on_player_right_click(self, event):
         """Удаление корабля"""
-        cell_size = 32
+        cell_size = self.cell_size
         offset_x = 40
         offset_y = 40
 
         x = (event.x - offset_x) // cell_size
         y = (event.y - offset_y) // cell_size
 
-        if 0 <= x < 10 and 0 <= y < 10:
+        if 0 <= x < self.rules.size and 0 <= y < self.rules.size:
             success, message = self.game_logic.remove_ship(x, y)
             if success:
                 self.status_label.config(text=message)
@@ -608,14 +647,14 @@ class SeaBattleStable:
         if not self.game_logic.player_turn or self.game_logic.game_over:
             return
 
-        cell_size = 32
+        cell_size = self.cell_size
         offset_x = 40
         offset_y = 40
 
         x = (event.x - offset_x) // cell_size
         y = (event.y - offset_y) // cell_size
 
-        if 0 <= x < 10 and 0 <= y < 10:
+        if 0 <= x < self.rules.size and 0 <= y < self.rules.size:
             self.player_shoot(x, y)
 
     def player_shoot(self, x, y):
@@ -698,7 +737,9 @@ class SeaBattleStable:
                                 fg="#ECF0F1", bg="#2C3E50")
         result_label.pack(pady=30)
 
-        stats_text = f"Уничтожено кораблей:\nВы: {game_over_info['player_score']}/10\nКомпьютер: {game_over_info['computer_score']}/10"
+        total = self.rules.total_ships
+        stats_text = (f"Уничтожено кораблей:\nВы: {game_over_info['player_score']}/{total}\n"
+                      f"Компьютер: {game_over_info['computer_score']}/{total}")
 
         stats_label = tk.Label(result_window, text=stats_text,
                                font=("Arial", 14),
@@ -753,7 +794,7 @@ class SeaBattleStable:
                 widget.destroy()
 
         # Переинициализируем игровую логику
-        self.game_logic = GameLogic()
+        self.game_logic = GameLogic(rules=self.rules, strategy=self.strategy, replay=self.replay)
         self.show_main_menu()
 
     def run(self):
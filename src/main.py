@@ -1,19 +1,52 @@
 #!/usr/bin/env python3
 """
 Точка входа в игру "Морской бой"
+
+Если задана переменная окружения SEABATTLE_METRICS, во время игры
+измеряется время горячих путей, а при выходе сводка записывается в
+указанный файл (CSV при расширении .csv, иначе JSON).
+
+Если задана переменная окружения SEABATTLE_REPLAY, сыгранные партии
+дописываются в указанный журнал (game.replay).
+
+Если задана переменная окружения SEABATTLE_AI_BUDGET (время на ход в
+микросекундах), ИИ по умолчанию - самая сильная стратегия, которая
+укладывается в этот бюджет (game.strategies.choose_strategy).
 """
 
+import os
+
+from game.metrics import METRICS
+from game.replay import ReplayWriter
+from game.strategies import DEFAULT_STRATEGY, choose_strategy
 from game.ui import SeaBattleStable
 
 
 def main():
     """Основная функция запуска игры"""
+    metrics_path = os.environ.get("SEABATTLE_METRICS")
+    if metrics_path:
+        METRICS.enable()
+    replay_path = os.environ.get("SEABATTLE_REPLAY")
+    replay = ReplayWriter(replay_path) if replay_path else None
+    budget = os.environ.get("SEABATTLE_AI_BUDGET")
+    strategy = choose_strategy(max_cost=int(budget)).name if budget else DEFAULT_STRATEGY
+
     try:
-        game = SeaBattleStable()
+        game = SeaBattleStable(strategy=strategy, replay=replay)
         game.run()
     except Exception as e:
         print(f"Ошибка: {e}")
         input("Нажмите Enter для выхода...")
+    finally:
+        if replay is not None:
+            replay.close()
+        if metrics_path:
+            METRICS.disable()
+            if metrics_path.endswith(".csv"):
+                METRICS.to_csv(metrics_path)
+            else:
+                METRICS.to_json(metrics_path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,63 @@
+"""
+Тесты ИИ с ограничением времени на ход
+"""
+
+import random
+
+import game.anytime as anytime
+from game.anytime import AnytimeAI
+from game.board import Board
+
+
+class FakeClock:
+    """Часы, которые идут только тогда, когда тест их сдвигает"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def perf_counter(self):
+        return self.now
+
+
+def play(ai, board, moves):
+    """Несколько ходов ИИ по полю; возвращает время каждого хода по часам ИИ"""
+    times = []
+    for _ in range(moves):
+        x, y = ai.get_next_shot()
+        times.append(ai.last_stats["elapsed"])
+        result = board.shoot(x, y)
+        sunk = board.get_ship_at(x, y).cells if result == "destroyed" else None
+        ai.register_shot(x, y, result, sunk)
+    return times
+
+
+def test_samples_stop_before_deadline_when_chunks_run_slow(monkeypatch):
+    clock = FakeClock()
+    chunks = []
+    real_sample_heat = anytime.sample_heat
+
+    def slow_sample_heat(*args):
+        # Выборка стоит 0.1 мс, но каждая пятая порция втрое медленнее
+        # оценки по прошлым порциям
+        chunks.append(args[-2])
+        clock.now += args[-2] * (0.0003 if len(chunks) % 5 == 0 else 0.0001)
+        return real_sample_heat(*args)
+
+    monkeypatch.setattr(anytime, "time", clock)
+    monkeypatch.setattr(anytime, "sample_heat", slow_sample_heat)
+
+    board = Board(rng=random.Random(2))
+    board.auto_place_ships()
+    ai = AnytimeAI(board, budget=0.05, rng=random.Random(3))
+    times = play(ai, board, 40)
+    assert max(times) <= 0.05
+    assert ai.last_stats["source"] == "montecarlo"
+
+
+def test_decisions_fit_budget_on_real_clock():
+    board = Board(rng=random.Random(4))
+    board.auto_place_ships()
+    ai = AnytimeAI(board, budget=0.03, rng=random.Random(5))
+    times = play(ai, board, 10)
+    # На настоящих часах процесс могут вытеснить, поэтому граница с запасом
+    assert max(times) <= 0.03 * 2
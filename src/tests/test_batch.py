@@ -0,0 +1,47 @@
+"""
+Тесты пакетной симуляции
+"""
+
+import random
+
+import pytest
+
+from game.batch import BatchGames, run_batch
+from game.rules import Rules
+
+
+def test_batch_sinks_every_fleet():
+    rules = Rules()
+    counts = run_batch(300, rules=rules, seed=1)
+    assert len(counts) == 300
+    cells = sum(rules.ship_sizes())
+    assert all(cells <= count <= rules.size * rules.size for count in counts)
+    # Среднее у отдельных партий CheckerboardAI - около 61 выстрела
+    assert 57 < sum(counts) / len(counts) < 65
+
+
+def test_batch_is_reproducible():
+    assert run_batch(50, seed=2) == run_batch(50, seed=2)
+
+
+def test_batch_with_touching_ships():
+    rules = Rules(8, [(3, 1), (2, 2), (1, 3)], allow_touching=True)
+    counts = run_batch(100, rules=rules, seed=3)
+    assert all(sum(rules.ship_sizes()) <= count <= 64 for count in counts)
+
+
+def test_pick_blocks_is_uniform():
+    games = BatchGames(4000, rng=random.Random(4))
+    candidates = 0b1011001
+    picked = games.split(games.pick_blocks(games.replicate(candidates)))
+    counts = {}
+    for mask in picked:
+        assert mask & candidates == mask and bin(mask).count("1") == 1
+        counts[mask] = counts.get(mask, 0) + 1
+    assert len(counts) == 4
+    assert all(850 < count < 1150 for count in counts.values())
+
+
+def test_density_has_no_batch_form():
+    with pytest.raises(ValueError):
+        BatchGames(1, strategy="density")
@@ -0,0 +1,27 @@
+"""
+Тесты сравнения бенчмарков с эталоном
+"""
+
+import json
+
+from benchmarks.run import compare, main, mann_whitney
+
+
+def test_compare_verdicts():
+    base = [1.0 + i * 0.01 for i in range(15)]
+    assert compare(base, None) == {"verdict": "new"}
+    assert compare(base, base)["verdict"] == "same"
+    assert compare([v * 1.5 for v in base], base)["verdict"] == "slower"
+    assert compare([v * 0.5 for v in base], base)["verdict"] == "faster"
+    # Сдвиг меньше порога не считается изменением даже при малом p
+    assert compare([v * 1.01 for v in base], base, threshold=0.05)["verdict"] == "same"
+    assert mann_whitney([1.0] * 5, [1.0] * 5) == 1.0
+
+
+def test_baseline_is_saved_where_requested(tmp_path):
+    path = tmp_path / "baseline.json"
+    arguments = ["--only", "board_shoot", "--repeat", "3", "--baseline", str(path)]
+    assert main(arguments + ["--save-baseline"]) == 0
+    assert list(json.loads(path.read_text())) == ["board_shoot"]
+    # Повторный запуск на той же машине с большим порогом не находит замедления
+    assert main(arguments + ["--threshold", "10"]) == 0
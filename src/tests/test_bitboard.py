@@ -0,0 +1,80 @@
+"""
+Тесты совпадения BitBoard с Board
+"""
+
+import random
+
+from game.bitboard import BitBoard
+from game.board import Board
+from game.masks import halo_mask
+from game.rules import Rules
+
+
+def ships_of(board):
+    """Корабли поля как кортежи"""
+    return sorted((ship.size, ship.x, ship.y, ship.horizontal) for ship in board.ships)
+
+
+def test_same_fleet_from_same_seed():
+    for seed in range(5):
+        board = Board(rng=random.Random(seed))
+        bitboard = BitBoard(rng=random.Random(seed))
+        assert board.auto_place_ships() and bitboard.auto_place_ships()
+        assert ships_of(board) == ships_of(bitboard)
+        assert board.grid == bitboard.grid
+
+
+def test_shoot_and_unshoot_match_board():
+    for rules in (Rules(), Rules(8, [(3, 1), (2, 2)], allow_touching=True)):
+        rng = random.Random(5)
+        board = Board(rules=rules, rng=random.Random(6))
+        bitboard = BitBoard(rules=rules, rng=random.Random(6))
+        board.auto_place_ships()
+        bitboard.auto_place_ships()
+
+        cells = [(x, y) for y in range(rules.size) for x in range(rules.size)]
+        rng.shuffle(cells)
+        cells += cells[:10]
+        grids = [[list(row) for row in board.grid]]
+        for x, y in cells:
+            assert board.shoot(x, y) == bitboard.shoot(x, y)
+            assert board.grid == bitboard.grid
+            grids.append([list(row) for row in board.grid])
+
+        shot = [cell for index, cell in enumerate(cells) if cell not in cells[:index]]
+        for x, y in reversed(shot):
+            assert board.unshoot(x, y) and bitboard.unshoot(x, y)
+            assert board.grid == bitboard.grid
+        assert board.grid == grids[0]
+        assert bitboard.shots == set()
+
+
+def test_placement_checks_match_board():
+    board = Board(rng=random.Random(7))
+    bitboard = BitBoard(rng=random.Random(7))
+    board.auto_place_ships()
+    bitboard.auto_place_ships()
+    for size in (1, 2, 3, 4):
+        for y in range(10):
+            for x in range(10):
+                for horizontal in (True, False):
+                    assert (board.preview_ship(size, x, y, horizontal)[1]
+                            == bitboard.preview_ship(size, x, y, horizontal)[1])
+
+
+def test_remove_ship_keeps_forbidden_zone_of_other_ships():
+    rng = random.Random(8)
+    for seed in range(20):
+        board = Board(rng=random.Random(seed))
+        bitboard = BitBoard(rng=random.Random(seed))
+        board.auto_place_ships()
+        bitboard.auto_place_ships()
+        removed = rng.sample(list(bitboard.ships), 4)
+        for ship in removed:
+            board.remove_ship(board.get_ship_at(ship.x, ship.y))
+            bitboard.remove_ship(ship)
+            assert bitboard.forbidden_mask == halo_mask(bitboard.ship_mask, bitboard.size)
+            assert board.grid == bitboard.grid
+        for ship in removed:
+            assert bitboard.place_ship(ship)
+        assert bitboard.forbidden_mask == halo_mask(bitboard.ship_mask, bitboard.size)
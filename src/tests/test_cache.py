@@ -0,0 +1,57 @@
+"""
+Тесты кэша решений ИИ
+"""
+
+import random
+
+import pytest
+
+from game.board import Board
+from game.cache import DecisionCache
+from game.density import DensityAI
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = DecisionCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats() == {"hits": 3, "misses": 1, "size": 2, "capacity": 2,
+                             "hit_rate": 0.75}
+    with pytest.raises(ValueError):
+        DecisionCache(0)
+
+
+def test_save_and_load_keep_current_entries_newest(tmp_path):
+    path = str(tmp_path / "cache" / "decisions.pkl")
+    saved = DecisionCache(3)
+    for key in "abcd":
+        saved.put(key, key.upper())
+    saved.save(path)
+
+    cache = DecisionCache(3)
+    assert cache.load(str(tmp_path / "missing.pkl")) == 0
+    cache.put("x", "X")
+    assert cache.load(path) == 3
+    assert list(cache.entries) == ["c", "d", "x"]
+
+
+def test_cached_decisions_do_not_change_the_game():
+    games = []
+    cache = DecisionCache()
+    for shared in (None, cache, cache):
+        board = Board(rng=random.Random(1))
+        board.auto_place_ships()
+        ai = DensityAI(board, cache=shared, rng=random.Random(2))
+        shots = []
+        while not all(ship.is_destroyed() for ship in board.ships):
+            x, y = ai.get_next_shot()
+            ai.register_shot(x, y, board.shoot(x, y))
+            shots.append((x, y))
+        games.append(shots)
+    assert games[0] == games[1] == games[2]
+    # Повтор той же партии целиком идет по записям кэша
+    assert cache.hits >= len(games[2])
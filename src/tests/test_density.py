@@ -0,0 +1,91 @@
+"""
+Тесты подсчета позиций кораблей и ИИ плотности
+"""
+
+import random
+
+import pytest
+
+from game.board import Board
+from game.density import DensityAI, PlacementCounts, count_positions
+from game.masks import counter_values
+from game.placement import get_placement_table
+from game.rules import Rules
+
+
+def brute_counts(size, remaining, blocked, hits=0):
+    """Число позиций по клеткам простым перебором таблицы позиций"""
+    table = get_placement_table(size)
+    counts = [0] * (size * size)
+    for ship_size, count in remaining.items():
+        for placement in table.placements(ship_size):
+            if ship_size == 1 and not placement.horizontal:
+                continue
+            if placement.mask & blocked or hits and not placement.mask & hits:
+                continue
+            for x, y in placement.cells:
+                counts[y * size + x] += count
+    return counts
+
+
+def flat(grid):
+    """Таблица grid[y][x] одним списком по номерам клеток"""
+    return [value for row in grid for value in row]
+
+
+def random_mask(rng, size, share):
+    """Случайная маска клеток с долей share"""
+    return sum(1 << index for index in range(size * size) if rng.random() < share)
+
+
+@pytest.mark.parametrize("size", [5, 8, 10])
+def test_count_positions_matches_brute_force(size):
+    rng = random.Random(size)
+    remaining = {4: 1, 3: 2, 2: 1, 1: 3}
+    for _ in range(10):
+        blocked = random_mask(rng, size, 0.2)
+        hits = random_mask(rng, size, 0.05) & ~blocked
+        for hit_filter in (0, hits):
+            planes = count_positions(size, remaining, blocked, hit_filter)
+            assert flat(counter_values(planes, size)) == brute_counts(
+                size, remaining, blocked, hit_filter)
+
+
+def test_placement_counts_follow_blocks_and_sunk_ships():
+    size = 10
+    rng = random.Random(1)
+    remaining = {4: 1, 3: 2, 2: 3, 1: 4}
+    counts = PlacementCounts(size, remaining)
+    blocked = 0
+    for step in range(30):
+        new = random_mask(rng, size, 0.03) & ~blocked
+        counts.block(new)
+        blocked |= new
+        if step % 10 == 9:
+            ship_size = rng.choice([s for s, n in counts.remaining.items() if n])
+            counts.remove_ship(ship_size)
+        assert counts.counts == brute_counts(size, counts.remaining, blocked)
+        assert counts.counts == PlacementCounts(size, counts.remaining, blocked).counts
+
+        unknown = (1 << size * size) - 1 & ~blocked
+        best = counts.best(unknown)
+        if best is not None:
+            assert counts.counts[best] == max(counts.counts[index] for index in range(size * size)
+                                              if unknown >> index & 1)
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_density_ai_sinks_fleet(incremental):
+    rules = Rules(8, [(3, 1), (2, 2), (1, 2)])
+    board = Board(rules=rules, rng=random.Random(2))
+    board.auto_place_ships()
+    ai = DensityAI(board, incremental=incremental, rng=random.Random(3))
+    shots = 0
+    while not all(ship.is_destroyed() for ship in board.ships):
+        x, y = ai.get_next_shot()
+        assert (x, y) not in ai.shots
+        result = board.shoot(x, y)
+        ai.register_shot(x, y, result)
+        shots += 1
+    assert shots < rules.size * rules.size
+    assert ai.remaining == {3: 0, 2: 0, 1: 0}
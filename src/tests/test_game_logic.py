@@ -0,0 +1,87 @@
+"""
+Тесты отмены и повтора действий GameLogic
+"""
+
+import random
+
+import pytest
+
+from game.bitboard import BitBoard
+from game.board import Board, SmartAI
+from game.game_logic import GameLogic
+
+
+def snapshot(logic):
+    """Состояние партии, которое должно восстанавливаться отменой"""
+    state = [logic.player_turn, logic.game_over]
+    for board in (logic.player_board, logic.computer_board):
+        state.append([list(row) for row in board.grid])
+        state.append(set(board.shots))
+        state.append([(ship.x, ship.y, ship.size, ship.hits) for ship in board.ships])
+    state.append(logic.computer_ai.get_state())
+    return state
+
+
+def play(logic, rng):
+    """Доиграть партию, стреляя игроком в случайные клетки"""
+    cells = [(x, y) for y in range(10) for x in range(10)]
+    rng.shuffle(cells)
+    states = [snapshot(logic)]
+    while not logic.game_over:
+        if logic.player_turn:
+            logic.player_shoot(*cells.pop())
+        else:
+            logic.computer_shoot()
+        logic.check_game_over()
+        states.append(snapshot(logic))
+    return states
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+@pytest.mark.parametrize("strategy", ["smart", "density", "checkerboard"])
+def test_undo_redo_round_trip(board_class, strategy):
+    logic = GameLogic(board_class=board_class, strategy=strategy, rng=random.Random(1))
+    logic.auto_place_all_ships()
+    logic.start_battle()
+    states = play(logic, random.Random(2))
+
+    for state in reversed(states[:-1]):
+        assert logic.undo()[0]
+        assert snapshot(logic) == state
+    assert not logic.undo()[0]
+
+    for state in states[1:]:
+        assert logic.redo()[0]
+        # Как и после хода, окончание партии проверяет вызывающий
+        logic.check_game_over()
+        assert snapshot(logic) == state
+    assert not logic.redo()[0]
+
+
+def test_undo_restores_smart_ai_priorities():
+    logic = GameLogic(rng=random.Random(3))
+    logic.auto_place_all_ships()
+    logic.start_battle()
+    play(logic, random.Random(4))
+
+    ai = logic.computer_ai
+    for _ in range(40):
+        logic.undo()
+        if ai.priority is not None:
+            fresh = SmartAI(ai.rules)
+            fresh.set_state(ai.get_state())
+            fresh.build_priorities()
+            assert ai.priority == fresh.priority
+            assert ai.get_next_shot() == fresh.get_next_shot()
+
+
+def test_placement_undo():
+    logic = GameLogic(rng=random.Random(5))
+    logic.select_ship(4)
+    assert logic.place_ship(0, 0)[0]
+    assert logic.get_placed_total() == 1
+    assert logic.undo()[0]
+    assert logic.get_placed_total() == 0
+    assert not logic.player_board.ships
+    assert logic.redo()[0]
+    assert logic.get_placed_total() == 1
@@ -0,0 +1,69 @@
+"""
+Тесты измерения времени и счетчиков результатов
+"""
+
+import random
+
+from game.game_logic import GameLogic
+from game.metrics import Histogram, Metrics
+
+
+def test_histogram_percentiles_stay_within_range():
+    histogram = Histogram()
+    assert histogram.percentile(50) is None
+    for value in range(1, 101):
+        histogram.add(value * 1e-4)
+    assert histogram.count == 100
+    assert 1e-4 <= histogram.percentile(0) <= histogram.percentile(50)
+    assert histogram.percentile(50) <= histogram.percentile(99) <= 1e-2
+    # Точность - одна корзина: 10^(1/20), около 12%
+    assert abs(histogram.percentile(50) / 5e-3 - 1) < 0.13
+
+
+def test_enable_and_disable_restore_methods():
+    original = GameLogic.__dict__["player_shoot"]
+    metrics = Metrics()
+    metrics.enable()
+    try:
+        assert metrics.enabled
+        assert GameLogic.__dict__["player_shoot"] is not original
+    finally:
+        metrics.disable()
+    assert not metrics.enabled
+    assert GameLogic.__dict__["player_shoot"] is original
+
+
+def test_shot_results_are_counted():
+    metrics = Metrics()
+    metrics.enable()
+    try:
+        logic = GameLogic(rng=random.Random(1))
+        logic.auto_place_all_ships()
+        logic.start_battle()
+        rng = random.Random(2)
+        results = []
+        while not logic.game_over:
+            if logic.player_turn:
+                result = logic.player_shoot(rng.randrange(10), rng.randrange(10))[0]
+            else:
+                result = logic.computer_shoot()[2]
+            if result is not None:
+                results.append(result)
+            logic.check_game_over()
+    finally:
+        metrics.disable()
+
+    counted = {name: value for name, value in metrics.counters.items()
+               if name.startswith("GameLogic.")}
+    assert sum(counted.values()) == len(results)
+    assert set(name.rsplit(".", 1)[1] for name in counted) <= {"miss", "hit", "destroyed"}
+
+
+def test_results_ignored_for_non_tuple_values():
+    metrics = Metrics()
+    values = [None, "miss", (), ("hit",), (None, "текст"), ("miss", "текст")]
+    wrapper = metrics.timed("shoot", lambda: values.pop(0), result_index=0)
+    for _ in range(6):
+        wrapper()
+    assert metrics.counters == {"shoot.hit": 1, "shoot.miss": 1}
+    assert metrics.timings["shoot"].count == 6
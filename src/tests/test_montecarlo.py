@@ -0,0 +1,66 @@
+"""
+Тесты выборок флотов и ИИ Монте-Карло
+"""
+
+import random
+
+from game.board import Board
+from game.montecarlo import MonteCarloAI, sample_fleet, sample_heat
+from game.rules import Rules
+
+
+def play_until_sunk(ai, board):
+    """Партия ИИ против поля; возвращает число выстрелов"""
+    shots = 0
+    while not all(ship.is_destroyed() for ship in board.ships):
+        x, y = ai.get_next_shot()
+        assert (x, y) not in ai.shots
+        ai.register_shot(x, y, board.shoot(x, y))
+        shots += 1
+    return shots
+
+
+def test_sampled_fleets_agree_with_observations():
+    rng = random.Random(1)
+    size = 10
+    sizes = [4, 3, 3, 2, 2, 1]
+    # Промахи в первой строке и попадание в (5, 5)
+    blocked = (1 << size) - 1
+    hits = 1 << (5 * size + 5)
+    accepted = 0
+    for _ in range(200):
+        fleet = sample_fleet(size, sizes, blocked, hits, False, rng)
+        if fleet is None:
+            continue
+        accepted += 1
+        assert bin(fleet).count("1") == sum(sizes)
+        assert fleet & hits == hits
+        assert not fleet & blocked
+    assert accepted > 100
+
+
+def test_sample_heat_depends_only_on_seed():
+    args = (10, [4, 3, 2, 1], 0, 0, False, 50)
+    assert sample_heat(*args, 7) == sample_heat(*args, 7)
+    planes, accepted = sample_heat(*args, 8)
+    assert accepted == 50 and planes
+
+
+def test_montecarlo_ai_sinks_fleet():
+    board = Board(rules=Rules(8, [(3, 1), (2, 2), (1, 2)]), rng=random.Random(3))
+    board.auto_place_ships()
+    ai = MonteCarloAI(board, samples=50, rng=random.Random(4))
+    assert play_until_sunk(ai, board) < 64
+    assert ai.remaining == {3: 0, 2: 0, 1: 0}
+
+
+def test_pool_sampling_keeps_sample_count():
+    board = Board(rng=random.Random(5))
+    ai = MonteCarloAI(board, samples=41, workers=2, rng=random.Random(6))
+    try:
+        planes, accepted = ai.sample(41)
+    finally:
+        ai.close()
+    assert accepted == 41
+    assert ai.executor is None
+    assert sum(bin(plane).count("1") << level for level, plane in enumerate(planes)) == 41 * 20
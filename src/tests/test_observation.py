@@ -0,0 +1,63 @@
+"""
+Тесты наблюдения за полем противника
+"""
+
+import random
+
+import pytest
+
+from game.board import Board
+from game.cells import Cell
+from game.observation import Observation
+
+
+def shoot_randomly(board, observation, rng, shots):
+    """Случайные выстрелы по полю с учетом результатов в наблюдении"""
+    cells = [(x, y) for y in range(board.size) for x in range(board.size)]
+    rng.shuffle(cells)
+    for x, y in cells[:shots]:
+        observation.record(x, y, board.shoot(x, y))
+
+
+def test_record_matches_board_without_sunk_cells():
+    for seed in range(5):
+        board = Board(rng=random.Random(seed))
+        board.auto_place_ships()
+        observation = Observation(board.size)
+        shoot_randomly(board, observation, random.Random(seed + 10), 70)
+        # Корабли восстановлены по связным попаданиям так же, как на поле
+        assert observation.key() == Observation.from_board(board).key()
+        assert sorted(observation.sunk_sizes()) == sorted(
+            ship.size for ship in board.ships if ship.is_destroyed())
+
+
+def test_cell_states():
+    observation = Observation(5)
+    observation.record(0, 0, "miss")
+    observation.record(1, 1, "hit")
+    observation.record(3, 3, "hit")
+    assert observation.record(3, 4, "destroyed") == 1 << 18 | 1 << 23
+    assert observation.cell(0, 0) == Cell.MISS
+    assert observation.cell(1, 1) == Cell.HIT
+    assert observation.cell(3, 3) == Cell.DESTROYED
+    assert observation.cell(2, 2) == Cell.EMPTY
+    assert observation.sunk_sizes() == [2]
+
+
+def test_bytes_round_trip():
+    board = Board(rng=random.Random(1))
+    board.auto_place_ships()
+    observation = Observation(board.size)
+    shoot_randomly(board, observation, random.Random(2), 60)
+
+    data = observation.to_bytes()
+    assert len(data) == 2 + 13 * (2 + len(observation.sunk))
+    restored = Observation.from_bytes(data)
+    assert restored.key() == observation.key()
+    assert restored.sunk_mask == observation.sunk_mask
+
+    copy = observation.copy()
+    copy.record(0, 0, "miss")
+    assert observation.to_bytes() == data
+    with pytest.raises(ValueError):
+        Observation.from_bytes(data[:-1])
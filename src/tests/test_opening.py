@@ -0,0 +1,33 @@
+"""
+Тесты дебютной книги
+"""
+
+import pytest
+
+from game.board import Board, SmartAI
+from game.opening import OPENING_SIZES, build_openings, load_openings, save_openings
+from game.rules import Rules
+
+
+def test_rebuilt_book_matches_shipped_file():
+    openings = build_openings()
+    assert sorted(size for _, size in openings) == list(OPENING_SIZES)
+    assert openings == load_openings()
+
+
+def test_book_round_trip(tmp_path):
+    path = tmp_path / "openings.bin"
+    openings = {("smart", 5): (0, 24, 12), ("smart", 7): ()}
+    save_openings(openings, path)
+    assert load_openings(path) == openings
+
+
+def test_small_board_needs_smaller_fleet():
+    with pytest.raises(ValueError, match="Board\\(rules=Rules"):
+        Board(size=5)
+    board = Board(rules=Rules(5, [(2, 1), (1, 2)]))
+    assert board.auto_place_ships()
+    # На маленьком поле ИИ стреляет по книге
+    ai = SmartAI(board)
+    assert ai.opening is not None
+    assert ai.get_next_shot() == (ai.opening[0] % 5, ai.opening[0] // 5)
@@ -0,0 +1,77 @@
+"""
+Тесты генератора расстановки и проверки правил
+"""
+
+import random
+
+import pytest
+
+from game.masks import halo_mask
+from game.placement import PlacementError, generate_fleet, get_placement_table
+from game.rules import Rules
+
+
+def fleet_masks(ships, size):
+    """Маски кораблей расстановки"""
+    table = get_placement_table(size)
+    return [table.get_for_ship(ship).mask for ship in ships]
+
+
+@pytest.mark.parametrize("rules", [
+    Rules(),
+    Rules(7),
+    Rules(12),
+    Rules(8, [(3, 1), (2, 3), (1, 2)], allow_touching=True),
+])
+def test_generate_fleet_is_valid(rules):
+    rng = random.Random(1)
+    for _ in range(20):
+        ships = generate_fleet(rules.size, rules.fleet, rng=rng,
+                               allow_touching=rules.allow_touching)
+        assert sorted(ship.size for ship in ships) == sorted(rules.ship_sizes())
+
+        masks = fleet_masks(ships, rules.size)
+        occupied = 0
+        for mask in masks:
+            # Корабль целиком на поле и не пересекается с другими
+            assert mask
+            assert not occupied & mask
+            if not rules.allow_touching:
+                assert not halo_mask(occupied, rules.size) & mask
+            occupied |= mask
+
+
+def test_generate_fleet_respects_blocked_cells():
+    blocked = (1 << 50) - 1
+    ships = generate_fleet(10, [(2, 2), (1, 3)], blocked=blocked, rng=random.Random(2))
+    for mask in fleet_masks(ships, 10):
+        assert not mask & blocked
+
+
+def test_generate_fleet_reports_impossible_fleet():
+    assert generate_fleet(3, [(3, 3)], rng=random.Random(3)) is None
+
+
+def test_generate_fleet_raises_when_budget_runs_out():
+    with pytest.raises(PlacementError):
+        generate_fleet(7, rng=random.Random(4), max_steps=1, restarts=2)
+
+
+def test_rules_reject_fleet_that_cannot_fit():
+    with pytest.raises(ValueError):
+        Rules(6, [(4, 3), (3, 3)])
+    assert Rules(6, [(3, 2), (2, 2), (1, 2)]).total_ships == 6
+    with pytest.raises(ValueError):
+        Rules(4, [(4, 5)], allow_touching=True)
+    assert Rules(4, [(4, 4)], allow_touching=True).total_ships == 4
+
+
+@pytest.mark.parametrize("size", [1, 4, 10, 13])
+def test_placement_table_halo_matches_mask(size):
+    table = get_placement_table(size)
+    for ship_size in range(1, min(size, 4) + 1):
+        for placement in table.placements(ship_size):
+            assert placement.halo == halo_mask(placement.mask, size)
+            cells = {(index % size, index // size) for index in range(size * size)
+                     if placement.halo >> index & 1}
+            assert set(placement.halo_cells) == cells
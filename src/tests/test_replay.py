@@ -0,0 +1,163 @@
+"""
+Тесты журнала партий: запись, чтение и переход к ходу
+"""
+
+import random
+
+import pytest
+
+from game.board import Board
+from game.cells import Ship
+from game.game_logic import GameLogic
+from game.replay import MAX_REPLAY_SIZE, ReplayReader, ReplayWriter
+from game.rules import Rules
+from game.simulation import play_game
+
+
+def replay_grids(game, moves):
+    """Поля и сторона хода после moves ходов, разыгранные движком"""
+    boards = [Board(size=game.size), Board(size=game.size)]
+    for side in (0, 1):
+        for ship in game.fleets[side]:
+            boards[side].place_ship(Ship(ship.size, ship.x, ship.y, ship.horizontal))
+    side = 0
+    for cell in game.shots()[:moves]:
+        if boards[1 - side].shoot(cell % game.size, cell // game.size) == "miss":
+            side = 1 - side
+    return [[list(row) for row in board.grid] for board in boards], side
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "games.sbr")
+    results = []
+    writer = ReplayWriter(path)
+    for seed in range(5):
+        records = []
+        results.append(play_game("smart", "checkerboard", rng=random.Random(seed),
+                                 records=records))
+        writer.write_game(records[0])
+    writer.close()
+
+    reader = ReplayReader(path)
+    try:
+        assert reader.game_count == 5
+        for game, (winner, first_shots, second_shots) in zip(reader.games(), results):
+            moves = game.moves()
+            assert game.finished
+            assert moves[-1][0] == winner
+            assert sum(1 for move in moves if move[0] == 0) == first_shots
+            assert sum(1 for move in moves if move[0] == 1) == second_shots
+            assert reader.shot(0, 3) == reader.game(0).shot(3)
+    finally:
+        reader.close()
+
+
+def test_live_game_with_undo(tmp_path):
+    path = str(tmp_path / "live.sbr")
+    writer = ReplayWriter(path)
+    logic = GameLogic(rng=random.Random(1), replay=writer)
+    logic.auto_place_all_ships()
+    logic.start_battle()
+
+    rng = random.Random(2)
+    log = []
+    while not logic.game_over:
+        if logic.player_turn:
+            x, y = rng.randrange(10), rng.randrange(10)
+            result, _ = logic.player_shoot(x, y)
+            if result is None:
+                continue
+            log.append((0, x, y, result))
+        else:
+            x, y, result, _ = logic.computer_shoot()
+            log.append((1, x, y, result))
+        if rng.random() < 0.1:
+            logic.undo()
+            log.pop()
+        logic.check_game_over()
+    writer.close()
+
+    reader = ReplayReader(path)
+    try:
+        game = reader.game(0)
+        assert game.finished
+        assert game.moves() == log
+    finally:
+        reader.close()
+
+
+def test_cursor_seek_matches_engine(tmp_path):
+    path = str(tmp_path / "seek.sbr")
+    records = []
+    play_game("smart", "density", rng=random.Random(3), records=records)
+    writer = ReplayWriter(path)
+    writer.write_game(records[0])
+    writer.close()
+
+    reader = ReplayReader(path)
+    try:
+        game = reader.game(0)
+        rng = random.Random(4)
+        for interval in (1, 5, 16, 1000):
+            cursor = game.cursor(interval)
+            for _ in range(20):
+                if rng.random() < 0.6:
+                    cursor.seek(rng.randrange(-3, game.move_count + 3))
+                else:
+                    cursor.step(rng.randrange(-20, 20))
+                grids, side = replay_grids(game, cursor.move)
+                assert [cursor.grid(0), cursor.grid(1)] == grids
+                assert cursor.side == side
+            cursor.seek(game.move_count)
+            assert cursor.winner() == game.moves()[-1][0]
+    finally:
+        reader.close()
+
+
+def test_reader_shot_bounds_and_unfinished_game(tmp_path):
+    path = str(tmp_path / "bounds.sbr")
+    records = []
+    for seed in range(2):
+        play_game("smart", "smart", rng=random.Random(seed), records=records)
+    writer = ReplayWriter(path)
+    writer.write_game(records[0])
+    writer.write_game(records[1][:-1])
+    writer.file.close()
+
+    reader = ReplayReader(path)
+    try:
+        assert reader.game_count == 2
+        first, second = reader.game(0), reader.game(1)
+        assert first.finished and not second.finished
+        for index, game in enumerate((first, second)):
+            last = game.move_count - 1
+            assert reader.shot(index, last) == game.shot(last)
+            for move in (-1, game.move_count):
+                with pytest.raises(IndexError):
+                    reader.shot(index, move)
+    finally:
+        reader.close()
+
+
+def test_reader_opens_empty_file(tmp_path):
+    path = tmp_path / "empty.sbr"
+    path.write_bytes(b"")
+    reader = ReplayReader(str(path))
+    assert reader.game_count == 0
+    assert list(reader.games()) == []
+    reader.close()
+
+
+def test_large_board_game_is_not_recorded(tmp_path):
+    path = str(tmp_path / "large.sbr")
+    writer = ReplayWriter(path)
+    logic = GameLogic(rules=Rules(MAX_REPLAY_SIZE + 5), rng=random.Random(5), replay=writer)
+    logic.auto_place_all_ships()
+    assert logic.start_battle()[0]
+    assert logic.player_shoot(0, 0)[0] is not None
+    logic.undo()
+    writer.close()
+
+    reader = ReplayReader(path)
+    assert reader.game_count == 0
+    reader.close()
@@ -0,0 +1,33 @@
+"""
+Тесты воспроизводимости симуляции
+"""
+
+from game import simulation
+from game.simulation import simulate
+
+
+def test_results_do_not_depend_on_worker_count(tmp_path):
+    single = tmp_path / "single.sbr"
+    pooled = tmp_path / "pooled.sbr"
+    first = simulate("smart", "density", games=12, workers=1, seed=5, replay=str(single))
+    second = simulate("smart", "density", games=12, workers=2, seed=5, replay=str(pooled))
+
+    for key in ("games", "wins", "first_shots_to_win", "second_shots_to_win"):
+        assert first[key] == second[key]
+    assert single.read_bytes() == pooled.read_bytes()
+
+
+def test_seed_changes_results():
+    first = simulate("smart", "checkerboard", games=10, seed=1)
+    second = simulate("smart", "checkerboard", games=10, seed=2)
+    assert first["first_shots_to_win"] != second["first_shots_to_win"]
+
+
+def test_pool_streams_blocks_in_seed_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(simulation, "GAMES_PER_TASK", 3)
+    single = tmp_path / "single.sbr"
+    pooled = tmp_path / "pooled.sbr"
+    first = simulate("smart", "checkerboard", games=20, workers=1, seed=6, replay=str(single))
+    second = simulate("smart", "checkerboard", games=20, workers=2, seed=6, replay=str(pooled))
+    assert first["wins"] == second["wins"]
+    assert single.read_bytes() == pooled.read_bytes()
@@ -0,0 +1,56 @@
+"""
+Тесты реестра стратегий ИИ
+"""
+
+import random
+
+import pytest
+
+from game.board import Board
+from game.rules import Rules
+from game.strategies import STRATEGIES, choose_strategy, create_ai, get_strategy
+
+# Параметры, сокращающие время дорогих стратегий в тестах
+FAST_OPTIONS = {"anytime": {"budget": 0.005}, "montecarlo": {"samples": 20}}
+
+
+def test_choose_strategy_respects_budget():
+    assert choose_strategy().tier == max(s.tier for s in STRATEGIES.values())
+    for max_cost in (20, 1000, 50000, 200000):
+        strategy = choose_strategy(max_cost=max_cost)
+        assert strategy.cost <= max_cost
+        assert not [s for s in STRATEGIES.values()
+                    if s.cost <= max_cost and s.tier > strategy.tier]
+    assert choose_strategy(max_cost=15, max_memory=10).name == "checkerboard"
+    cheapest = min(s.cost for s in STRATEGIES.values())
+    assert choose_strategy(max_cost=0).cost == cheapest
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        get_strategy("nobody")
+
+
+@pytest.mark.parametrize("name", sorted(STRATEGIES))
+def test_every_strategy_sinks_fleet_and_restores_state(name):
+    rules = Rules(8, [(3, 1), (2, 2), (1, 2)])
+    board = Board(rules=rules, rng=random.Random(1))
+    board.auto_place_ships()
+    ai = create_ai(name, board, rng=random.Random(2), **FAST_OPTIONS.get(name, {}))
+
+    shots = set()
+    states = []
+    while not all(ship.is_destroyed() for ship in board.ships):
+        states.append(ai.get_state())
+        x, y = ai.get_next_shot()
+        assert (x, y) not in shots
+        shots.add((x, y))
+        result = board.shoot(x, y)
+        sunk = board.get_ship_at(x, y).cells if result == "destroyed" else None
+        ai.register_shot(x, y, result, sunk)
+    assert len(shots) <= rules.size * rules.size
+
+    # Откат к любому состоянию возвращает то же состояние
+    state = states[len(states) // 2]
+    ai.set_state(state)
+    assert ai.get_state() == state
@@ -0,0 +1,56 @@
+"""
+Тесты турнира стратегий
+"""
+
+import pytest
+
+from game import strategies
+from game.strategies import RandomAI
+from game.tournament import (Z_95, make_fleet_pool, mean_interval, play_fleet,
+                             run_tournament, separated, stop_quantile)
+
+
+class StuckAI(RandomAI):
+    """Сломанная стратегия: всегда стреляет в одну клетку"""
+
+    def get_next_shot(self):
+        return (0, 0)
+
+
+def test_play_fleet_caps_shots(monkeypatch):
+    monkeypatch.setitem(strategies.STRATEGIES, "stuck",
+                        strategies.Strategy("stuck", "", 1, 1, 1, StuckAI))
+    fleet = make_fleet_pool(1, seed=1)[0]
+    with pytest.raises(RuntimeError):
+        play_fleet("stuck", fleet, seed=2)
+    assert play_fleet("random", fleet, seed=2) <= 100
+
+
+@pytest.mark.parametrize("names", [["smart"], ["smart", "smart"], ["smart", "smart", "density"]])
+def test_tournament_rejects_missing_or_repeated_strategies(names):
+    with pytest.raises(ValueError):
+        run_tournament(names, fleets=2, round_size=2)
+
+
+def test_stop_quantile_grows_with_checks():
+    assert stop_quantile(1, 1) == pytest.approx(Z_95, abs=1e-3)
+    assert stop_quantile(10, 3) > stop_quantile(1, 3) > stop_quantile(1, 1)
+
+
+def test_mean_interval_and_separation():
+    assert mean_interval([5]) == (5, float("inf"))
+    mean, half = mean_interval([1, 2, 3, 4])
+    assert mean == 2.5 and 0 < half < 2
+    assert separated([[10, 50], [12, 48], [11, 52]], 2)
+    assert not separated([[10, 11], [11, 10], [10, 10]], 2)
+
+
+def test_tournament_ranks_smart_above_random():
+    report = run_tournament(["random", "smart"], fleets=40, round_size=10, seed=3)
+    assert report["fleets"] <= 40
+    smart, random_ai = report["strategies"]["smart"], report["strategies"]["random"]
+    assert smart["mean"] < random_ai["mean"]
+    assert smart["elo"] > random_ai["elo"]
+    assert smart["ci95"][0] <= smart["mean"] <= smart["ci95"][1]
+    assert sum(smart["distribution"].values()) == report["fleets"]
+    assert report == run_tournament(["random", "smart"], fleets=40, round_size=10, seed=3)